@@ -0,0 +1,136 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .constants import ROLE_TO_GROUP
+from .models import Profile
+
+TOKEN_STATE_CACHE_KEY = "accounts:token-state:{}"
+
+
+def token_state_query(user_id):
+    # Profile by its unique user_id, joined to auth_user by primary key.
+    return Profile.objects.filter(user_id=user_id).values_list("token_version", "user__is_active")
+
+
+def get_token_state(user_id):
+    """
+    (token version, is_active) of `user_id`, or None if the user no longer exists. One
+    indexed query, cached like roles are; accounts.signals forgets it when the user or
+    the token version changes.
+    """
+    timeout = getattr(settings, "ROLE_CACHE_TIMEOUT", 0)
+    key = TOKEN_STATE_CACHE_KEY.format(user_id)
+    if timeout:
+        state = cache.get(key)
+        if state is not None:
+            return state
+
+    state = token_state_query(user_id).first()
+    if timeout and state is not None:
+        cache.set(key, state, timeout)
+    return state
+
+
+async def aget_token_state(user_id):
+    """Async get_token_state()."""
+    timeout = getattr(settings, "ROLE_CACHE_TIMEOUT", 0)
+    key = TOKEN_STATE_CACHE_KEY.format(user_id)
+    if timeout:
+        state = await cache.aget(key)
+        if state is not None:
+            return state
+
+    state = await token_state_query(user_id).afirst()
+    if timeout and state is not None:
+        await cache.aset(key, state, timeout)
+    return state
+
+
+def invalidate_token_state(user_id) -> None:
+    if getattr(settings, "ROLE_CACHE_TIMEOUT", 0):
+        cache.delete(TOKEN_STATE_CACHE_KEY.format(user_id))
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Stateless user built from RoleTokenObtainPairSerializer claims. The role is
+    pre-resolved so accounts.permissions helpers never query groups for it.
+    """
+
+    def __init__(self, token):
+        super().__init__(token)
+        group = ROLE_TO_GROUP.get(token.get("role"))
+        self._role_groups = frozenset([group]) if group else frozenset()
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authorizes from the token's role claims instead of loading the User row. The only
+    lookup is the (cacheable) token state: the token version, which Profile.save() bumps
+    on role changes to revoke outstanding tokens, and is_active, honoured like simplejwt's
+    CHECK_USER_IS_ACTIVE. Tokens issued before claims existed fall back to the regular
+    user lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self.has_role_claims(validated_token):
+            return super().get_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        return self.check_state(validated_token, get_token_state(user_id))
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views. Decoding the token needs no I/O and the
+        version lookup goes through the async cache and ORM; tokens without role claims
+        fall back to the regular user lookup, run via sync_to_async().
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if not self.has_role_claims(validated_token):
+            return await sync_to_async(super().get_user)(validated_token)
+        user_id = self.get_user_id(validated_token)
+        return self.check_state(validated_token, await aget_token_state(user_id))
+
+    @staticmethod
+    def has_role_claims(validated_token) -> bool:
+        return "role" in validated_token and "ver" in validated_token
+
+    @staticmethod
+    def get_user_id(validated_token) -> int:
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+    @staticmethod
+    def check_state(validated_token, state):
+        if state is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        version, is_active = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if version != validated_token["ver"]:
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return RoleTokenUser(validated_token)
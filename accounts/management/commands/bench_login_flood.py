@@ -0,0 +1,139 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from accounts import throttling
+from tasks.benchmarking import temporary_database
+
+User = get_user_model()
+
+USERNAME = "flood-target"
+PASSWORD = "pass123"
+
+# scenario -> what each attempt sends: (client IP, username, password) for attempt n.
+SCENARIOS = {
+    # Credential stuffing from one address: a new username and password every time.
+    "stuffing": lambda n: ("203.0.113.7", f"victim-{n}", f"guess-{n}"),
+    # Password spraying on one account from rotating addresses.
+    "spraying": lambda n: (f"198.51.{n // 250 % 250}.{n % 250 + 1}", USERNAME, f"guess-{n}"),
+    # A broken client logging in again and again with valid credentials.
+    "relogin": lambda n: ("192.0.2.10", USERNAME, PASSWORD),
+}
+ENDPOINTS = {"api": "/api/token/", "panel": "/panel/login/"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Flood the login endpoints with a fixed rate of attempts, with the login throttles "
+        "(accounts.throttling) off and on, and report the CPU the process burned, the "
+        "password hashes it ran and the responses. Runs the views in-process on a "
+        "throwaway database; prints JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+        parser.add_argument("--endpoint", choices=list(ENDPOINTS), default="api")
+        parser.add_argument("--rate", type=float, default=20, help="Offered login attempts per second")
+        parser.add_argument("--duration", type=float, default=20, help="Seconds of flood per run")
+        parser.add_argument("--workers", type=int, default=8, help="Server threads handling the attempts")
+        parser.add_argument("--throttles", choices=["off", "on", "both"], default="both")
+
+    def handle(self, *args, **options):
+        if options["rate"] <= 0 or options["duration"] <= 0 or options["workers"] < 1:
+            raise CommandError("--rate, --duration and --workers must be positive.")
+
+        modes = ["off", "on"] if options["throttles"] == "both" else [options["throttles"]]
+        results = []
+        # Every rejected attempt would log a "Too Many Requests" warning.
+        request_logger = logging.getLogger("django.request")
+        log_level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        setup_test_environment()
+        try:
+            with temporary_database():
+                User.objects.create_user(USERNAME, password=PASSWORD)
+                for scenario in options["scenarios"]:
+                    for mode in modes:
+                        throttle_settings = {} if mode == "on" else {"LOGIN_THROTTLE_RATES": {}}
+                        with override_settings(**throttle_settings):
+                            result = self.run(scenario, options)
+                        result["throttles"] = mode
+                        results.append(result)
+                        self.stderr.write(
+                            f"{scenario:<9} throttles {mode:<3}  cpu {result['cpu_percent']:>6.1f}%  "
+                            f"{result['hashes_per_s']:>6.2f} hashes/s  {result['statuses']}  "
+                            f"{result['dropped']} dropped  p50 {result['p50_ms']}ms"
+                        )
+        finally:
+            teardown_test_environment()
+            request_logger.setLevel(log_level)
+
+        self.stdout.write(json.dumps({"results": results}, indent=2))
+
+    def run(self, scenario, options):
+        throttling.clear()
+        throttling.reset_counters()
+        attempt = SCENARIOS[scenario]
+        path = ENDPOINTS[options["endpoint"]]
+        clients = threading.local()
+        statuses, latencies = [], []
+
+        def send(n):
+            if not hasattr(clients, "client"):
+                clients.client = Client()
+            ip, username, password = attempt(n)
+            started = time.perf_counter()
+            response = clients.client.post(path, {"username": username, "password": password}, REMOTE_ADDR=ip)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses.append(response.status_code)
+
+        # Open loop: attempts arrive on schedule however slowly they are served, and
+        # those still queued at the end are dropped, as a flood would time out.
+        pool = ThreadPoolExecutor(max_workers=options["workers"])
+        futures = []
+        interval = 1 / options["rate"]
+        cpu_started, started = time.process_time(), time.perf_counter()
+        for n in itertools.count():
+            due = started + n * interval
+            if due - started >= options["duration"]:
+                break
+            time.sleep(max(0, due - time.perf_counter()))
+            futures.append(pool.submit(send, n))
+        pool.shutdown(wait=True, cancel_futures=True)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+
+        for future in futures:
+            if not future.cancelled() and future.exception():
+                raise future.exception()
+
+        latencies.sort()
+        hashes = sum(1 for code in statuses if code != 429)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 2) if latencies else None
+
+        return {
+            "scenario": scenario,
+            "endpoint": path,
+            "offered": len(futures),
+            "served": len(statuses),
+            "dropped": sum(1 for future in futures if future.cancelled()),
+            "statuses": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+            "hashes": hashes,
+            "hashes_per_s": round(hashes / elapsed, 2),
+            "seconds": round(elapsed, 2),
+            "cpu_seconds": round(cpu, 2),
+            "cpu_percent": round(100 * cpu / elapsed, 1),
+            "p50_ms": percentile(50),
+            "p99_ms": percentile(99),
+            "counters": throttling.counters(),
+        }
@@ -1,16 +1,80 @@
-from django.core.management.base import BaseCommand
+import contextlib
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
 
 from accounts.constants import ROLE_SUPERADMIN, ROLE_ADMIN, ROLE_USER
+from accounts.services import bulk_create_users
+from tasks import caching, stats
 from tasks.models import Task
 
 User = get_user_model()
 
+DEFAULT_STATUS_MIX = "PENDING=40,IN_PROGRESS=25,COMPLETED=35"
+
+
+def parse_status_mix(value):
+    """'PENDING=40,IN_PROGRESS=25,COMPLETED=35' -> ([statuses], [weights])"""
+    statuses, weights = [], []
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().upper()
+        if name not in Task.Status.values:
+            raise CommandError(f"Unknown status in --status-mix: {name!r}")
+        try:
+            weights.append(float(weight))
+        except ValueError:
+            raise CommandError(f"Bad weight in --status-mix: {part!r}")
+        statuses.append(name)
+    if sum(weights) <= 0:
+        raise CommandError("--status-mix weights must add up to more than 0")
+    return statuses, weights
+
+
+@contextlib.contextmanager
+def explicit_task_timestamps():
+    """
+    Let bulk_create() keep the generated created_at/updated_at instead of stamping
+    every row with now().
+    """
+    created_at = Task._meta.get_field("created_at")
+    updated_at = Task._meta.get_field("updated_at")
+    created_at.auto_now_add = updated_at.auto_now = False
+    try:
+        yield
+    finally:
+        created_at.auto_now_add = updated_at.auto_now = True
+
 
 class Command(BaseCommand):
-    help = "Seed sample users, admins, and tasks"
+    help = (
+        "Seed sample users, admins, and tasks. With --admins/--users/--tasks-per-user, "
+        "also generate a deterministic synthetic dataset of any size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=0, help="Synthetic admins to create")
+        parser.add_argument("--users", type=int, default=0, help="Synthetic users, spread over the admins")
+        parser.add_argument("--tasks-per-user", type=int, default=0)
+        parser.add_argument("--status-mix", default=DEFAULT_STATUS_MIX,
+                            help=f"Relative task status weights (default {DEFAULT_STATUS_MIX})")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; same seed, same dataset")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT/transaction")
 
     def handle(self, *args, **options):
+        self.seed_demo_accounts()
+
+        if options["admins"] or options["users"] or options["tasks_per_user"]:
+            self.seed_synthetic(options)
+
+    def seed_demo_accounts(self):
         # SuperAdmin
         superadmin, _ = User.objects.get_or_create(username="superadmin")
         superadmin.set_password("pass123")
@@ -59,3 +123,106 @@ class Command(BaseCommand):
                 "user2 / pass123"
             )
         )
+
+    # ---------------- Synthetic dataset ----------------
+    def seed_synthetic(self, options):
+        rng = random.Random(options["seed"])
+        prefix = f"seed{options['seed']}"
+        batch_size = options["batch_size"]
+        statuses, weights = parse_status_mix(options["status_mix"])
+        if options["users"] and not options["admins"]:
+            raise CommandError("--users needs at least one --admins to be assigned to")
+
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Synthetic users for --seed {options['seed']} already exist; use another --seed.")
+
+        # Hashing once and sharing the result keeps every synthetic account able to log
+        # in with "pass123" without paying PBKDF2 per user.
+        password = make_password("pass123")
+        started = time.perf_counter()
+
+        admins = self.create_accounts(
+            [f"{prefix}-admin-{i}" for i in range(options["admins"])],
+            ROLE_ADMIN, password, batch_size,
+        )
+        admin_ids = [admin.pk for admin in admins]
+        user_admin_ids = [admin_ids[i % len(admin_ids)] for i in range(options["users"])]
+
+        users = self.create_accounts(
+            [f"{prefix}-user-{i}" for i in range(options["users"])],
+            ROLE_USER, password, batch_size, user_admin_ids,
+        )
+        user_ids = [user.pk for user in users]
+
+        self.stdout.write(f"{len(admins)} admins, {len(user_ids)} users "
+                          f"({time.perf_counter() - started:.1f}s)")
+
+        total = len(user_ids) * options["tasks_per_user"]
+        tasks = self.generate_tasks(
+            rng, user_ids, user_admin_ids, options["tasks_per_user"], statuses, weights
+        )
+        created = 0
+        with explicit_task_timestamps():
+            while created < total:
+                batch = [next(tasks) for _ in range(min(batch_size, total - created))]
+                with transaction.atomic():
+                    Task.objects.bulk_create(batch)
+                created += len(batch)
+
+                elapsed = time.perf_counter() - started
+                self.stderr.write(f"\r{created:,}/{total:,} tasks ({created / elapsed:,.0f}/s)", ending="")
+        if total:
+            self.stderr.write("")
+            # bulk_create() bypasses the signals that keep TaskStat current.
+            stats.rebuild()
+        # ...and those that bump cached view versions (bulk_create_users() included).
+        caching.bump(caching.ALL_TASKS, caching.ALL_USERS)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Synthetic data ({prefix}-*, password pass123): {len(admins)} admins, "
+            f"{len(user_ids)} users, {created} tasks in {time.perf_counter() - started:.1f}s"
+        ))
+
+    @staticmethod
+    def create_accounts(usernames, role, password, batch_size, assigned_admin_ids=None):
+        created = []
+        for start in range(0, len(usernames), batch_size):
+            chunk = usernames[start:start + batch_size]
+            users = [User(username=name, password=password, is_active=True) for name in chunk]
+            admins = assigned_admin_ids[start:start + batch_size] if assigned_admin_ids else None
+            with transaction.atomic():
+                created.extend(bulk_create_users(users, [role] * len(users), admins))
+        return created
+
+    @staticmethod
+    def generate_tasks(rng, user_ids, user_admin_ids, per_user, statuses, weights):
+        """
+        Deterministic task stream. Creation times skew recent (exponential, mean 90 days,
+        capped at two years); updates follow creation; due dates land 1-60 days after
+        creation, so older open tasks end up overdue as they would in production.
+        Tasks carry their assignee's admin (Task.owner_admin), as the signals would set.
+        """
+        now = timezone.now()
+        cum_weights = []
+        for weight in weights:
+            cum_weights.append((cum_weights[-1] if cum_weights else 0) + weight)
+
+        for user_id, admin_id in zip(user_ids, user_admin_ids):
+            for n in range(per_user):
+                status = rng.choices(statuses, cum_weights=cum_weights)[0]
+                age = timedelta(days=min(rng.expovariate(1 / 90), 730), seconds=rng.randrange(86400))
+                created_at = now - age
+                updated_at = created_at + (now - created_at) * rng.random() ** 3
+                done = status == Task.Status.COMPLETED
+                yield Task(
+                    title=f"Task {n + 1} for user {user_id}",
+                    description="Synthetic task generated by seed_data",
+                    assigned_to_id=user_id,
+                    owner_admin_id=admin_id,
+                    due_date=(created_at + timedelta(days=rng.randint(1, 60))).date(),
+                    status=status,
+                    completion_report="Completed as planned." if done else "",
+                    worked_hours=Decimal(rng.randint(25, 1600)) / 100 if done else None,
+                    created_at=created_at,
+                    updated_at=updated_at,
+                )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Embedded in issued JWTs; bump to revoke them (e.g. on role change).'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_token_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['assigned_admin', 'role'], name='profile_admin_role_idx'),
+        ),
+    ]
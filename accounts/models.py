@@ -14,6 +14,9 @@ class Profile(models.Model):
         ADMIN = ROLE_ADMIN, "Admin"
         USER = ROLE_USER, "User"
 
+    # Fields whose loaded value is remembered, so save()/signals only do work for what changed.
+    TRACKED_FIELDS = ("user_id", "role", "assigned_admin_id", "token_version")
+
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -36,21 +39,61 @@ class Profile(models.Model):
         help_text="Admin responsible for this user (scoping).",
     )
 
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Embedded in issued JWTs; bump to revoke them (e.g. on role change).",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # An admin's users by role (task assignment dropdowns), without a row lookup each.
+            models.Index(fields=["assigned_admin", "role"], name="profile_admin_role_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        self._loaded_values = {f: self.__dict__[f] for f in self.TRACKED_FIELDS if f in self.__dict__}
+
+    def has_changed(self, field) -> bool:
+        loaded = getattr(self, "_loaded_values", {})
+        return field not in loaded or loaded[field] != getattr(self, field)
+
     def clean(self):
-        if self.role != self.Role.USER and self.assigned_admin is not None:
+        if self.role != self.Role.USER and self.assigned_admin_id is not None:
             raise ValidationError({"assigned_admin": "Only USER profiles can be assigned to an Admin."})
 
-        if self.assigned_admin is not None:
-            admin_profile = getattr(self.assigned_admin, "profile", None)
-            if not admin_profile or admin_profile.role != self.Role.ADMIN:
+        if self.assigned_admin_id is not None and self.has_changed("assigned_admin_id"):
+            # One indexed lookup instead of loading the admin User and then its Profile.
+            is_admin = Profile.objects.filter(user_id=self.assigned_admin_id, role=self.Role.ADMIN).exists()
+            if not is_admin:
                 raise ValidationError({"assigned_admin": "assigned_admin must be a user with ADMIN role."})
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+        # Skip the existence/uniqueness queries for relations that did not change;
+        # assigned_admin existence is covered by clean().
+        exclude = ["assigned_admin"]
+        if not self.has_changed("user_id"):
+            exclude.append("user")
+        self.full_clean(exclude=exclude)
+
+        if not self._state.adding and self.has_changed("role") and not self.has_changed("token_version"):
+            # Outstanding API tokens carry the old role claim: revoke them, however the
+            # role was changed (panel, Django admin, shell, a command).
+            self.token_version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "token_version"}
+
+        result = super().save(*args, **kwargs)
+        self.remember_loaded_values()
+        return result
 
     def __str__(self) -> str:
         return f"{self.user.username} ({self.role})"
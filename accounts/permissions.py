@@ -1,17 +1,106 @@
-from .constants import GROUP_ADMIN, GROUP_SUPERADMIN, GROUP_USER
+from django.conf import settings
+from django.core.cache import cache
+
+from .constants import GROUP_ADMIN, GROUP_SUPERADMIN, GROUP_USER, ROLE_TO_GROUP
+
+ROLE_CACHE_KEY = "accounts:role-groups:{}"
+
+
+def _role_cache_timeout() -> int:
+    return getattr(settings, "ROLE_CACHE_TIMEOUT", 0)
+
+
+def get_role_groups(user) -> frozenset:
+    """
+    Names of the role groups `user` belongs to, resolved with one query and memoised on
+    the user object, i.e. once per request. With ROLE_CACHE_TIMEOUT > 0 the result is
+    also kept in the Django cache across requests; accounts.signals invalidates it
+    whenever a role changes.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    groups = getattr(user, "_role_groups", None)
+    if groups is not None:
+        return groups
+
+    timeout = _role_cache_timeout()
+    key = ROLE_CACHE_KEY.format(user.pk)
+    if timeout:
+        groups = cache.get(key)
+
+    if groups is None:
+        groups = frozenset(
+            user.groups.filter(name__in=ROLE_TO_GROUP.values()).values_list("name", flat=True)
+        )
+        if timeout:
+            cache.set(key, groups, timeout)
+
+    user._role_groups = groups
+    return groups
+
+
+def invalidate_role_cache(user) -> None:
+    """Forget the cached role of `user` (a User instance or a user id)."""
+    user_id = getattr(user, "pk", user)
+    if hasattr(user, "_role_groups"):
+        del user._role_groups
+    if _role_cache_timeout():
+        cache.delete(ROLE_CACHE_KEY.format(user_id))
 
 
 def is_superadmin(user) -> bool:
-    return user.is_authenticated and user.groups.filter(name=GROUP_SUPERADMIN).exists()
+    return GROUP_SUPERADMIN in get_role_groups(user)
 
 
 def is_admin(user) -> bool:
-    return user.is_authenticated and user.groups.filter(name=GROUP_ADMIN).exists()
+    return GROUP_ADMIN in get_role_groups(user)
 
 
 def is_user(user) -> bool:
-    return user.is_authenticated and user.groups.filter(name=GROUP_USER).exists()
+    return GROUP_USER in get_role_groups(user)
 
 
 def is_admin_or_superadmin(user) -> bool:
     return is_admin(user) or is_superadmin(user)
+
+
+# ---------------- Async (ASGI views) ----------------
+async def aget_role_groups(user) -> frozenset:
+    """Async get_role_groups(): same memo and cache, resolved with the async ORM."""
+    if not user.is_authenticated:
+        return frozenset()
+
+    groups = getattr(user, "_role_groups", None)
+    if groups is not None:
+        return groups
+
+    timeout = _role_cache_timeout()
+    key = ROLE_CACHE_KEY.format(user.pk)
+    if timeout:
+        groups = await cache.aget(key)
+
+    if groups is None:
+        names = user.groups.filter(name__in=ROLE_TO_GROUP.values()).values_list("name", flat=True)
+        groups = frozenset([name async for name in names])
+        if timeout:
+            await cache.aset(key, groups, timeout)
+
+    user._role_groups = groups
+    return groups
+
+
+async def ais_superadmin(user) -> bool:
+    return GROUP_SUPERADMIN in await aget_role_groups(user)
+
+
+async def ais_admin(user) -> bool:
+    return GROUP_ADMIN in await aget_role_groups(user)
+
+
+async def ais_user(user) -> bool:
+    return GROUP_USER in await aget_role_groups(user)
+
+
+async def ais_admin_or_superadmin(user) -> bool:
+    return await ais_admin(user) or await ais_superadmin(user)
@@ -0,0 +1,20 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .models import Profile
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    /api/token/: embeds the caller's role and token version as claims, so
+    accounts.authentication.RoleClaimsJWTAuthentication can authorize API requests
+    without loading the user or its groups.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+
+        profile, _ = Profile.objects.get_or_create(user=user)
+        token["role"] = profile.role
+        token["ver"] = profile.token_version
+        return token
@@ -3,9 +3,14 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 
 from .constants import ROLE_TO_GROUP, GROUP_ADMIN, GROUP_SUPERADMIN, GROUP_USER
+from .models import Profile
+from .permissions import invalidate_role_cache
 
 User = get_user_model()
 
+# {group name: group id} for the role groups; filled on first use, see role_group_ids().
+_role_group_ids = {}
+
 
 def ensure_role_groups_exist():
     """
@@ -15,18 +20,69 @@ def ensure_role_groups_exist():
         Group.objects.get_or_create(name=group_name)
 
 
-def set_user_group_for_role(user: User, role: str):
+def role_group_ids() -> dict:
     """
-    Ensure user is in exactly one role group based on role.
+    Role group ids, cached in-process. Cleared by accounts.signals when groups are
+    (re)created or deleted, e.g. after migrate/flush.
+    """
+    if len(_role_group_ids) != len(ROLE_TO_GROUP):
+        ids = dict(Group.objects.filter(name__in=ROLE_TO_GROUP.values()).values_list("name", "id"))
+        if len(ids) != len(ROLE_TO_GROUP):
+            ensure_role_groups_exist()
+            ids = dict(Group.objects.filter(name__in=ROLE_TO_GROUP.values()).values_list("name", "id"))
+        _role_group_ids.clear()
+        _role_group_ids.update(ids)
+    return _role_group_ids
+
+
+def clear_role_group_ids():
+    _role_group_ids.clear()
+
+
+def sync_role_group(user_id, role: str, created: bool = False):
+    """
+    Move a user into the group for `role`, touching auth_user_groups only as needed:
+    one INSERT for a new user, one DELETE + one INSERT for a role change.
+    """
+    ids = role_group_ids()
+    desired_id = ids[ROLE_TO_GROUP[role]]
+    through = User.groups.through
+
+    if not created:
+        other_ids = [group_id for group_id in ids.values() if group_id != desired_id]
+        through.objects.filter(user_id=user_id, group_id__in=other_ids).delete()
+
+    through.objects.bulk_create([through(user_id=user_id, group_id=desired_id)], ignore_conflicts=True)
+    invalidate_role_cache(user_id)
+
+
+def bulk_create_users(users, roles, assigned_admin_ids=None):
+    """
+    bulk_create() `users` together with their Profiles and role group memberships.
+
+    bulk_create() sends no post_save, so this does in three INSERTs what
+    accounts.signals would do per user. Call inside a transaction. Returns the saved
+    users (with pks).
     """
-    ensure_role_groups_exist()
+    assigned_admin_ids = assigned_admin_ids or [None] * len(users)
+    group_ids = role_group_ids()
+    through = User.groups.through
 
-    desired_group_name = ROLE_TO_GROUP[role]
-    desired_group = Group.objects.get(name=desired_group_name)
+    User.objects.bulk_create(users)
+    Profile.objects.bulk_create([
+        Profile(user=user, role=role, assigned_admin_id=admin_id)
+        for user, role, admin_id in zip(users, roles, assigned_admin_ids)
+    ])
+    through.objects.bulk_create([
+        through(user_id=user.pk, group_id=group_ids[ROLE_TO_GROUP[role]])
+        for user, role in zip(users, roles)
+    ])
+    return users
 
-    # remove user from all role groups
-    role_groups = Group.objects.filter(name__in=ROLE_TO_GROUP.values())
-    user.groups.remove(*role_groups)
 
-    # add to desired group
-    user.groups.add(desired_group)
+def set_user_group_for_role(user: User, role: str):
+    """
+    Ensure user is in exactly one role group based on role.
+    """
+    sync_role_group(user.pk, role)
+    invalidate_role_cache(user)
@@ -1,10 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save, post_migrate
+from django.db.models.signals import m2m_changed, post_delete, post_save, post_migrate
 from django.dispatch import receiver
 
+from .authentication import invalidate_token_state
 from .models import Profile
 from .constants import ROLE_TO_GROUP
+from .permissions import invalidate_role_cache
+from .services import clear_role_group_ids, sync_role_group
 
 User = get_user_model()
 
@@ -14,36 +17,70 @@ def create_role_groups(sender, **kwargs):
     """
     Ensure role groups exist AFTER migrations are applied (safe time to touch DB).
     """
+    clear_role_group_ids()
     for group_name in set(ROLE_TO_GROUP.values()):
         Group.objects.get_or_create(name=group_name)
 
 
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def forget_role_group_ids(sender, instance: Group, **kwargs):
+    if instance.name in ROLE_TO_GROUP.values():
+        clear_role_group_ids()
+
+
 @receiver(post_save, sender=User)
-def create_profile_and_role_group(sender, instance: User, created: bool, **kwargs):
+def create_profile_and_role_group(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    """
+    Every user gets a Profile; its own post_save below puts the user in the role group.
+    """
     if created:
-        profile = Profile.objects.create(user=instance)
-    else:
-        profile, _ = Profile.objects.get_or_create(user=instance)
+        Profile.objects.create(user=instance)
+        return
 
-    # Assign group according to profile.role
-    desired_group_name = ROLE_TO_GROUP.get(profile.role)
-    if desired_group_name:
-        # remove from other role groups
-        role_groups = Group.objects.filter(name__in=ROLE_TO_GROUP.values())
-        instance.groups.remove(*role_groups)
+    # e.g. update_last_login() on every login: nothing profile-related changed.
+    if update_fields is not None:
+        return
 
-        # add desired group
-        desired_group, _ = Group.objects.get_or_create(name=desired_group_name)
-        instance.groups.add(desired_group)
+    if not User.profile.is_cached(instance):
+        Profile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_state_on_user_change(sender, instance: User, update_fields=None, **kwargs):
+    # is_active is part of the cached token state; last_login is not.
+    if update_fields is None or not set(update_fields) <= {"last_login"}:
+        invalidate_token_state(instance.pk)
 
 
 @receiver(post_save, sender=Profile)
 def sync_groups_when_profile_changes(sender, instance: Profile, created: bool, **kwargs):
-    user = instance.user
-    desired_group_name = ROLE_TO_GROUP.get(instance.role)
-    if desired_group_name:
-        role_groups = Group.objects.filter(name__in=ROLE_TO_GROUP.values())
-        user.groups.remove(*role_groups)
-
-        desired_group, _ = Group.objects.get_or_create(name=desired_group_name)
-        user.groups.add(desired_group)
+    """
+    Diff-based: group membership is only touched when the role actually changed.
+    """
+    if created or instance.has_changed("role"):
+        sync_role_group(instance.user_id, instance.role, created=created)
+        if Profile.user.is_cached(instance):
+            invalidate_role_cache(instance.user)
+
+    if instance.has_changed("token_version"):
+        invalidate_token_state(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_role_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Catches group edits made outside the role sync above (e.g. Django admin).
+    """
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+
+    if not reverse:
+        invalidate_role_cache(instance)
+    elif pk_set:
+        for user_id in pk_set:
+            invalidate_role_cache(user_id)
+    elif action == "pre_clear":
+        for user_id in instance.user_set.values_list("pk", flat=True):
+            invalidate_role_cache(user_id)
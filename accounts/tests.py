@@ -1,3 +1,326 @@
-from django.test import TestCase
+import tempfile
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from tasks import caching
+from . import throttling
+from .authentication import RoleTokenUser
+from .constants import GROUP_ADMIN, GROUP_USER, ROLE_ADMIN, ROLE_SUPERADMIN, ROLE_USER
+from .models import Profile
+from .permissions import get_role_groups, is_admin, is_admin_or_superadmin, is_superadmin
+from .serializers import RoleTokenObtainPairSerializer
+from .services import role_group_ids
+
+User = get_user_model()
+
+
+class ProfileSignalQueryCountTests(TestCase):
+    """
+    Regression guard for the user/profile save pipeline in accounts.signals.
+    Role group ids are cached per process, so warm them first.
+    """
+
+    def setUp(self):
+        role_group_ids()
+
+    def test_create_user(self):
+        # INSERT user, user FK + unique checks, INSERT profile, INSERT role group membership.
+        with self.assertNumQueries(5):
+            user = User.objects.create_user("new-user", password="pass123")
+
+        self.assertEqual(get_role_groups(User.objects.get(pk=user.pk)), {GROUP_USER})
+
+    def test_change_role(self):
+        user = User.objects.create_user("promoted", password="pass123")
+        profile = user.profile
+
+        # UPDATE profile, DELETE old role group, INSERT new role group.
+        with self.assertNumQueries(3):
+            profile.role = ROLE_ADMIN
+            profile.save()
+
+        self.assertEqual(get_role_groups(User.objects.get(pk=user.pk)), {GROUP_ADMIN})
+
+    def test_resave_without_changes_skips_group_sync(self):
+        profile = User.objects.create_user("unchanged", password="pass123").profile
+
+        with self.assertNumQueries(1):
+            profile.save()
+
+    def test_assign_admin(self):
+        admin = User.objects.create_user("admin", password="pass123")
+        admin.profile.role = ROLE_ADMIN
+        admin.profile.save()
+        member = User.objects.create_user("member", password="pass123")
+        profile = Profile.objects.get(user=member)
+
+        # Admin role check, UPDATE profile, move the user's tasks and task stats to the
+        # new admin; no group queries since the role is unchanged.
+        with self.assertNumQueries(4):
+            profile.assigned_admin = admin
+            profile.save()
+
+    def test_user_save_with_update_fields_skips_profile(self):
+        user = User.objects.create_user("login", password="pass123")
+        user = User.objects.get(pk=user.pk)
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class RoleCacheTests(TestCase):
+    """accounts.permissions resolves a role once per request, or from the cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("role-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh_admin(self):
+        return User.objects.get(pk=self.admin.pk)
+
+    def test_one_query_per_request(self):
+        admin = self.fresh_admin()
+        with self.assertNumQueries(1):
+            self.assertTrue(is_admin(admin))
+            self.assertFalse(is_superadmin(admin))
+            self.assertTrue(is_admin_or_superadmin(admin))
+
+        # Without ROLE_CACHE_TIMEOUT the next request resolves it again.
+        admin = self.fresh_admin()
+        with self.assertNumQueries(1):
+            is_admin(admin)
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_cached_across_requests(self):
+        is_admin(self.fresh_admin())
+        admin = self.fresh_admin()
+        with self.assertNumQueries(0):
+            self.assertTrue(is_admin(admin))
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_demoted_admin_loses_access_on_next_request(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/panel/tasks/").status_code, 200)
+
+        profile = Profile.objects.get(user=self.admin)
+        profile.role = ROLE_USER
+        profile.save()
+
+        self.assertEqual(self.client.get("/panel/tasks/").status_code, 403)
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_group_changes_invalidate(self):
+        admin_group = Group.objects.get(name=GROUP_ADMIN)
+        self.assertTrue(is_admin(self.fresh_admin()))
+
+        # Forward side, e.g. the user form in Django admin.
+        self.fresh_admin().groups.remove(admin_group)
+        self.assertFalse(is_admin(self.fresh_admin()))
+
+        # Reverse side, e.g. the group form.
+        admin_group.user_set.add(self.admin)
+        self.assertTrue(is_admin(self.fresh_admin()))
+        admin_group.user_set.clear()
+        self.assertFalse(is_admin(self.fresh_admin()))
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class RoleClaimsAuthenticationTests(TestCase):
+    """API requests authorize from the token's claims until the token is revoked."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("claims")
+        cls.superadmin = User.objects.create_user("claims-superadmin", password="pass123")
+        cls.superadmin.profile.role = ROLE_SUPERADMIN
+        cls.superadmin.profile.save()
+
+    def setUp(self):
+        # Cached token states outlive the rolled-back rows of earlier tests.
+        cache.clear()
+        self.token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+
+    def get(self):
+        return self.client.get("/api/tasks/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_claims(self):
+        self.assertEqual(self.token["role"], self.user.profile.role)
+        self.assertEqual(self.token["ver"], 0)
+        self.assertNotIn("assigned_admin_id", self.token)
+
+    def test_authenticates_without_loading_the_user(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, RoleTokenUser)
+        self.assertEqual(response.wsgi_request.user.id, self.user.id)
+
+    def test_stale_version_is_rejected(self):
+        Profile.objects.filter(user=self.user).update(token_version=1)
+
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_revoked")
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_role_change_revokes_tokens(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        self.client.force_login(self.superadmin)
+        response = self.client.post(f"/panel/users/{self.user.id}/role/", {"role": ROLE_ADMIN})
+        self.assertEqual(response.status_code, 302)
+        self.client.logout()
+
+        self.assertEqual(self.get().status_code, 401)
+        self.token = RoleTokenObtainPairSerializer.get_token(User.objects.get(pk=self.user.pk)).access_token
+        self.assertEqual(self.token["role"], ROLE_ADMIN)
+        self.assertEqual(self.get().status_code, 200)
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_role_change_anywhere_revokes_tokens(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        profile = Profile.objects.get(user=self.user)
+        profile.role = ROLE_ADMIN
+        profile.save(update_fields=["role"])
+
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_revoked")
+        self.assertEqual(Profile.objects.get(user=self.user).token_version, 1)
+
+        # Saves that leave the role alone keep tokens valid.
+        profile = Profile.objects.get(user=self.user)
+        profile.save()
+        self.assertEqual(profile.token_version, 1)
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_inactive_user_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "user_inactive")
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        self.user.delete()
+
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "user_not_found")
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=300)
+class ImportUsersTests(TestCase):
+    def test_import(self):
+        rows = (
+            "username,email,password,role,admin\n"
+            "boss,boss@example.com,pass123,ADMIN,\n"
+            "worker,,pass123,USER,boss\n"
+            "worker,,pass123,USER,\n"
+            "stray,,pass123,USER,nobody\n"
+        )
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "users.csv"
+        path.write_text(rows)
+        versions = caching.get_versions([caching.ALL_USERS, caching.ALL_TASKS])
+
+        out, err = StringIO(), StringIO()
+        call_command("import_users", str(path), workers=1, stdout=out, stderr=err)
+
+        self.assertIn("Imported 2 users", out.getvalue())
+        self.assertIn("line 4: username 'worker' already exists", err.getvalue())
+        self.assertIn("line 5: admin 'nobody' is not an ADMIN", err.getvalue())
+        worker = User.objects.get(username="worker")
+        self.assertTrue(worker.check_password("pass123"))
+        self.assertEqual(worker.profile.assigned_admin.username, "boss")
+        self.assertEqual(User.objects.get(username="boss").profile.role, ROLE_ADMIN)
+        self.assertEqual(list(worker.groups.values_list("name", flat=True)), [GROUP_USER])
+        # Cached user and task lists were invalidated.
+        new_versions = caching.get_versions([caching.ALL_USERS, caching.ALL_TASKS])
+        self.assertTrue(all(new != old for new, old in zip(new_versions, versions)))
+
+
+class LoginThrottleTests(TestCase):
+    """Login attempts over a bucket are rejected before the password is hashed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("throttled", password="pass123")
+
+    def setUp(self):
+        throttling.clear()
+        throttling.reset_counters()
+
+    def login(self, username="throttled", password="wrong", ip="10.0.0.1"):
+        return self.client.post("/api/token/", {"username": username, "password": password}, REMOTE_ADDR=ip)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": "3/min"})
+    def test_ip_bucket(self):
+        self.assertEqual([self.login().status_code for _ in range(3)], [401, 401, 401])
+
+        # No user lookup, so no password hash either.
+        with self.assertNumQueries(0):
+            response = self.login(password="pass123")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response["Retry-After"], {"19", "20"})
+
+        self.assertEqual(self.login(ip="10.0.0.2", password="pass123").status_code, 200)
+        self.assertEqual(throttling.counters()["ip"], {"allowed": 4, "rejected": 1})
+
+    @override_settings(LOGIN_THROTTLE_RATES={"username": "2/min"})
+    def test_username_bucket_spans_ips_and_case(self):
+        self.assertEqual(self.login(ip="10.0.0.1").status_code, 401)
+        self.assertEqual(self.login(ip="10.0.0.2", username="Throttled").status_code, 401)
+        self.assertEqual(self.login(ip="10.0.0.3", password="pass123").status_code, 429)
+        self.assertEqual(self.login(username="someone-else").status_code, 401)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": "1/min"})
+    def test_panel_login(self):
+        self.assertContains(self.client.post("/panel/login/", {"username": "throttled", "password": "x"}),
+                            "Invalid credentials")
+        response = self.client.post("/panel/login/", {"username": "throttled", "password": "pass123"})
+        self.assertContains(response, "Too many login attempts", status_code=429)
+        self.assertIn(response["Retry-After"], {"59", "60"})
+
+    def test_bucket_refills(self):
+        # 2 tokens, one more every 30 seconds.
+        self.assertEqual(throttling.parse_rate("2/min"), (2, 2 / 60))
+        take = [throttling.take("ip", "a", 2, 2 / 60, now=t) for t in (0, 1, 2, 17, 32, 33)]
+        self.assertEqual([round(wait) for wait in take], [0, 0, 28, 13, 0, 27])
+
+    @override_settings(LOGIN_THROTTLE_RATES={"username": "1/min"}, LOGIN_THROTTLE_CACHE="default")
+    def test_shared_cache(self):
+        self.assertEqual(self.login().status_code, 401)
+        throttling.clear()
+        self.assertEqual(self.login().status_code, 429)
+
+    def test_stats_are_superadmin_only(self):
+        superadmin = User.objects.create_user("throttle-superadmin")
+        superadmin.profile.role = ROLE_SUPERADMIN
+        superadmin.profile.save()
+
+        def get(user):
+            token = RoleTokenObtainPairSerializer.get_token(user).access_token
+            return self.client.get("/api/token/throttles/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.assertEqual(get(self.user).status_code, 403)
+        response = get(superadmin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["rates"]["ip"], {"capacity": 10, "per_second": 0.1667})
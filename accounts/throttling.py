@@ -0,0 +1,155 @@
+import hashlib
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+User = get_user_model()
+
+# Bucket scopes, in the order check() takes from them.
+SCOPES = ("ip", "username")
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_buckets = OrderedDict()  # "scope:value" -> (tokens, monotonic time of the last update)
+_buckets_lock = threading.Lock()
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """"<n>/<period>" (period s/sec, m/min, h/hour, d/day) -> (capacity, tokens per second)."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def rates() -> dict:
+    """{scope: (capacity, tokens per second)} for the enabled scopes."""
+    configured = getattr(settings, "LOGIN_THROTTLE_RATES", {"ip": "10/min", "username": "5/min"})
+    return {scope: parse_rate(configured.get(scope)) for scope in SCOPES if configured.get(scope)}
+
+
+def shared_cache():
+    alias = getattr(settings, "LOGIN_THROTTLE_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def client_ip(request) -> str:
+    # DRF's client address: REMOTE_ADDR, or X-Forwarded-For behind NUM_PROXIES proxies.
+    return BaseThrottle().get_ident(request) or ""
+
+
+def normalize_username(username) -> str:
+    # Case variants of one name share a bucket; anything but a string has none.
+    return username.strip().casefold() if isinstance(username, str) else ""
+
+
+# ---------------- Buckets ----------------
+def _refill(bucket, capacity, per_second, now):
+    tokens, updated = bucket or (capacity, now)
+    return min(capacity, tokens + (now - updated) * per_second)
+
+
+def _take(tokens, per_second):
+    """(tokens left, seconds to wait): wait is 0 when a token was taken."""
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / per_second
+
+
+def take(scope, value, capacity, per_second, now=None) -> float:
+    """
+    Take a token from the bucket of `scope`/`value`. Returns 0 if one was taken, else
+    the seconds until the next one is available.
+
+    Buckets live in this process, least recently used first out past
+    LOGIN_THROTTLE_MAX_KEYS, unless LOGIN_THROTTLE_CACHE names a cache shared by all
+    workers. That one is read and written without a lock, so attempts racing on one
+    key may take the same token; the sustained rate is still bounded.
+    """
+    key = f"{scope}:{value}"
+    cache = shared_cache()
+    if cache is not None:
+        # Wall time: every worker reads the same buckets.
+        now = time.time() if now is None else now
+        cache_key = "login-throttle:" + hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+        tokens, wait = _take(_refill(cache.get(cache_key), capacity, per_second, now), per_second)
+        # A bucket untouched for this long is full again, i.e. the same as a missing one.
+        cache.set(cache_key, (tokens, now), math.ceil(capacity / per_second))
+        return wait
+
+    now = time.monotonic() if now is None else now
+    with _buckets_lock:
+        tokens, wait = _take(_refill(_buckets.get(key), capacity, per_second, now), per_second)
+        _buckets[key] = (tokens, now)
+        _buckets.move_to_end(key)
+        while len(_buckets) > getattr(settings, "LOGIN_THROTTLE_MAX_KEYS", 100_000):
+            _buckets.popitem(last=False)
+    return wait
+
+
+def check(request, username):
+    """
+    Take a token for a login attempt by `username` from the client IP's bucket, then
+    from the username's. Returns None if the attempt may go ahead, else the seconds
+    the client should wait. Call before authenticate(): a rejected attempt costs no
+    password hash, and one rejected by IP costs the username nothing.
+    """
+    values = {"ip": client_ip(request), "username": normalize_username(username)}
+    for scope, (capacity, per_second) in rates().items():
+        if not values[scope]:
+            continue
+        wait = take(scope, values[scope], capacity, per_second)
+        _count(scope, allowed=not wait)
+        if wait:
+            return wait
+    return None
+
+
+def clear():
+    """Forget every in-process bucket; shared ones expire on their own."""
+    with _buckets_lock:
+        _buckets.clear()
+
+
+# ---------------- Counters ----------------
+def _count(scope, allowed):
+    with _counters_lock:
+        _counters[(scope, "allowed" if allowed else "rejected")] += 1
+
+
+def counters() -> dict:
+    """Per-process attempts allowed/rejected by each scope's buckets."""
+    with _counters_lock:
+        snapshot = dict(_counters)
+    return {
+        scope: {kind: snapshot.get((scope, kind), 0) for kind in ("allowed", "rejected")}
+        for scope in SCOPES
+    }
+
+
+def reset_counters():
+    with _counters_lock:
+        _counters.clear()
+
+
+# ---------------- DRF ----------------
+class LoginRateThrottle(BaseThrottle):
+    """check() as a DRF throttle: runs in APIView.initial(), before the serializer authenticates."""
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        if request.method != "POST":
+            return True
+        data = request.data
+        username = data.get(User.USERNAME_FIELD) if hasattr(data, "get") else None
+        self.retry_after = check(request, username)
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
 
-# Create your views here.
+from . import throttling
+from .permissions import is_superadmin
+
+
+class LoginTokenObtainPairView(TokenObtainPairView):
+    """
+    POST /api/token/ -> JWT pair, behind the login throttles: an attempt over the
+    client's or the username's rate gets 429 with Retry-After, without a password hash.
+    """
+    throttle_classes = [throttling.LoginRateThrottle]
+
+
+class LoginThrottleStatsView(APIView):
+    """
+    GET /api/token/throttles/ -> SuperAdmin: login throttle rates and this process's
+    allowed/rejected counters per bucket scope (see accounts.throttling).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not is_superadmin(request.user):
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response(
+            {
+                "rates": {
+                    scope: {"capacity": capacity, "per_second": round(per_second, 4)}
+                    for scope, (capacity, per_second) in throttling.rates().items()
+                },
+                "shared": throttling.shared_cache() is not None,
+                "counters": throttling.counters(),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -3,7 +3,9 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from accounts.constants import ROLE_ADMIN, ROLE_SUPERADMIN, ROLE_USER
+from tasks import due
 from tasks.models import Task
+from tasks.search import search_tasks
 
 User = get_user_model()
 
@@ -88,3 +90,91 @@ class TaskUpdateForm(forms.ModelForm):
             if hours is None or hours <= 0:
                 self.add_error("worked_hours", "Must be > 0 when completing a task.")
         return cleaned
+
+
+class TaskListFilterForm(forms.Form):
+    # sort value -> ORDER BY; each is served by an index on Task (see Task.Meta.indexes).
+    ORDERINGS = {
+        "-updated_at": ("-updated_at", "-id"),
+        "updated_at": ("updated_at", "id"),
+        "due_date": ("due_date", "id"),
+        "-due_date": ("-due_date", "-id"),
+        "status": ("status", "updated_at", "id"),
+        "-status": ("-status", "-updated_at", "-id"),
+    }
+
+    q = forms.CharField(required=False, label="Search")
+    status = forms.ChoiceField(choices=[("", "Any status")] + Task.Status.choices, required=False)
+    assignee = forms.CharField(required=False, label="Assignee username")
+    admin = forms.ModelChoiceField(queryset=User.objects.none(), required=False, empty_label="Any admin")
+    due_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    due_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    sort = forms.ChoiceField(choices=[(key, key) for key in ORDERINGS], required=False, widget=forms.HiddenInput)
+
+    def __init__(self, *args, **kwargs):
+        # Only SuperAdmins filter by admin; Admins are already scoped to themselves.
+        admins_qs = kwargs.pop("admins_qs", None)
+        super().__init__(*args, **kwargs)
+        if admins_qs is None:
+            del self.fields["admin"]
+        else:
+            self.fields["admin"].queryset = admins_qs
+
+    def value(self, name):
+        # Valid filters apply even when another one is invalid.
+        return getattr(self, "cleaned_data", {}).get(name)
+
+    @property
+    def ordering(self):
+        return self.ORDERINGS[self.value("sort") or "-updated_at"]
+
+    def filter(self, queryset):
+        if self.value("status"):
+            queryset = queryset.filter(status=self.value("status"))
+        if self.value("assignee"):
+            queryset = queryset.filter(assigned_to__username=self.value("assignee"))
+        if self.value("admin"):
+            queryset = queryset.filter(owner_admin=self.value("admin"))
+        if self.value("due_from"):
+            queryset = queryset.filter(due_date__gte=self.value("due_from"))
+        if self.value("due_to"):
+            queryset = queryset.filter(due_date__lte=self.value("due_to"))
+        if self.value("q"):
+            # Ranked by relevance unless a column sort was picked explicitly.
+            queryset = search_tasks(queryset, self.value("q"))
+            return queryset.order_by(*self.ordering) if self.value("sort") else queryset
+        return queryset.order_by(*self.ordering)
+
+    def filter_stats(self, stats):
+        """
+        Apply the same filters to TaskStat rows, or None when they cannot express them
+        (search and due dates are not part of the summary).
+        """
+        if self.value("q") or self.value("due_from") or self.value("due_to"):
+            return None
+        if self.value("status"):
+            stats = stats.filter(status=self.value("status"))
+        if self.value("assignee"):
+            stats = stats.filter(assignee__username=self.value("assignee"))
+        if self.value("admin"):
+            stats = stats.filter(admin=self.value("admin"))
+        return stats
+
+
+class TaskDueFilterForm(forms.Form):
+    days = forms.IntegerField(min_value=0, max_value=366, required=False, label="Due within (days)")
+    cursor = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def value(self, name):
+        return getattr(self, "cleaned_data", {}).get(name)
+
+    def window_days(self) -> int:
+        days = self.value("days")
+        return due.due_soon_days() if days is None else days
+
+    def position(self):
+        """(due_date, id) to continue after; None for the first page or a bad cursor."""
+        try:
+            return due.decode_position(self.value("cursor"))
+        except ValueError:
+            return None
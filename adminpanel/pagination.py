@@ -0,0 +1,73 @@
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large querysets. The count is either supplied by the caller
+    (e.g. summed from a summary table) or a COUNT over at most `count_cap` + 1 rows,
+    so it never scans the whole result set. `count_is_capped` is set when the real
+    count is larger than what is reported.
+
+    A capped count only bounds what is displayed: pages past it stay reachable, and
+    each page reads one row more than it shows to know whether there is a next one.
+    """
+
+    def __init__(self, object_list, per_page, count=None, count_cap=10_000, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = count
+        self.count_cap = count_cap
+        self.count_is_capped = False
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+
+        count = self.object_list.order_by()[: self.count_cap + 1].count()
+        if count > self.count_cap:
+            self.count_is_capped = True
+            return self.count_cap
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Past the capped count: whether the page has rows is up to page().
+            number = int(number)
+            if self.count and self.count_is_capped and number > 1:
+                return number
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_capped:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedCountPage(rows[: self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # A page past the capped count that turned out to be empty.
+            return self.page(self.num_pages)
+
+
+class EstimatedCountPage(Page):
+    """A page of a capped EstimatedCountPaginator: knows its next page from a look-ahead row."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
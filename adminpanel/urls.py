@@ -15,6 +15,7 @@ urlpatterns = [
 
     # Tasks (Admin + SuperAdmin)
     path("tasks/", views.tasks_list, name="panel_tasks_list"),
+    path("tasks/due/", views.tasks_due, name="panel_tasks_due"),
     path("tasks/create/", views.task_create, name="panel_task_create"),
     path("tasks/<int:id>/", views.task_detail, name="panel_task_detail"),
     path("tasks/<int:id>/update/", views.task_update, name="panel_task_update"),
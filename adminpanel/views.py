@@ -1,19 +1,33 @@
+import math
+from datetime import timedelta
+
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import Sum
 from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils import timezone
 
 from accounts.constants import ROLE_ADMIN, ROLE_SUPERADMIN, ROLE_USER
+from accounts import throttling
 from accounts.permissions import is_admin, is_superadmin
-from tasks.models import Task
+from config.routers import reads_from_replica
+from tasks import caching, due
+from tasks.models import Task, TaskStat
+from tasks.stats import dashboard_stats
 from .forms import (
     AssignUserToAdminForm,
     ChangeRoleForm,
     CreateUserForm,
     TaskCreateForm,
+    TaskDueFilterForm,
+    TaskListFilterForm,
     TaskUpdateForm,
 )
+from .pagination import EstimatedCountPaginator
 
 User = get_user_model()
 
@@ -24,6 +38,16 @@ def panel_login(request):
         username = request.POST.get("username")
         password = request.POST.get("password")
 
+        # Before authenticate(): a rejected attempt costs no password hash.
+        retry_after = throttling.check(request, username)
+        if retry_after is not None:
+            seconds = math.ceil(retry_after)
+            response = render(request, "adminpanel/login.html", {
+                "error": f"Too many login attempts. Try again in {seconds} seconds.",
+            }, status=429)
+            response["Retry-After"] = str(seconds)
+            return response
+
         user = authenticate(request, username=username, password=password)
         if user is not None:
             login(request, user)
@@ -42,7 +66,10 @@ def panel_logout(request):
 
 @login_required
 def dashboard(request):
-    return render(request, "adminpanel/dashboard.html")
+    return render(request, "adminpanel/dashboard.html", {
+        "stats": dashboard_stats(request.user),
+        "statuses": Task.Status.choices,
+    })
 
 
 # ---------------- Helpers ----------------
@@ -60,12 +87,17 @@ def admin_or_superadmin_required(request):
 
 # ---------------- SuperAdmin: Users/Admins ----------------
 @login_required
+@reads_from_replica
 def users_list(request):
     if not superadmin_required(request):
         return HttpResponseForbidden("SuperAdmin only")
 
-    users = User.objects.select_related("profile", "profile__assigned_admin").order_by("username")
-    return render(request, "adminpanel/users_list.html", {"users": users})
+    def render_users_table():
+        users = User.objects.select_related("profile", "profile__assigned_admin").order_by("username")
+        return render_to_string("adminpanel/_users_table.html", {"users": users}, request=request)
+
+    table = caching.get_or_set("panel-users-table", [caching.ALL_USERS], [], render_users_table)
+    return render(request, "adminpanel/users_list.html", {"table": table})
 
 
 @login_required
@@ -170,18 +202,104 @@ def assign_user_to_admin(request):
 
 # ---------------- Tasks: Admin + SuperAdmin ----------------
 @login_required
+@reads_from_replica
 def tasks_list(request):
     if not admin_or_superadmin_required(request):
         return HttpResponseForbidden("Admin/SuperAdmin only")
 
     if is_superadmin(request.user):
-        tasks = Task.objects.select_related("assigned_to").all().order_by("-updated_at")
+        scope = caching.ALL_TASKS
+    else:
+        scope = caching.admin_scope(request.user.id)
+
+    # The whole filter form + table + pager is cached until a task, user or profile in
+    # scope changes, so a hit costs no task queries at all.
+    table = caching.get_or_set(
+        "panel-tasks-table",
+        [scope],
+        [request.GET.urlencode()],
+        lambda: render_tasks_table(request),
+    )
+    return render(request, "adminpanel/tasks_list.html", {"table": table})
+
+
+def render_tasks_table(request):
+    if is_superadmin(request.user):
+        tasks = Task.objects.all()
+        stats = TaskStat.objects.all()
+        admins_qs = User.objects.filter(profile__role=ROLE_ADMIN).order_by("username")
     else:
-        tasks = Task.objects.select_related("assigned_to").filter(
-            assigned_to__profile__assigned_admin=request.user
-        ).order_by("-updated_at")
+        tasks = Task.objects.filter(owner_admin=request.user)
+        stats = TaskStat.objects.filter(admin=request.user)
+        admins_qs = None
+
+    form = TaskListFilterForm(request.GET, admins_qs=admins_qs)
+    form.is_valid()
+    tasks = form.filter(tasks.select_related("assigned_to"))
+
+    # Exact and cheap from the summary table when the filters allow it; otherwise a
+    # COUNT capped at PANEL_COUNT_CAP rows.
+    stats = form.filter_stats(stats)
+    count = None if stats is None else stats.aggregate(count=Sum("count"))["count"] or 0
+
+    paginator = EstimatedCountPaginator(
+        tasks,
+        getattr(settings, "PANEL_TASKS_PAGE_SIZE", 50),
+        count=count,
+        count_cap=getattr(settings, "PANEL_COUNT_CAP", 10_000),
+    )
+    page_obj = paginator.get_page(request.GET.get("page"))
+
+    # Sortable headers: clicking the current column flips its direction.
+    sort = form.value("sort") or "-updated_at"
+    columns = {
+        field: {
+            "next": f"-{field}" if sort == field else field,
+            "arrow": "▲" if sort == field else "▼" if sort == f"-{field}" else "",
+        }
+        for field in ("status", "due_date", "updated_at")
+    }
+
+    return render_to_string("adminpanel/_tasks_table.html", {
+        "form": form,
+        "page_obj": page_obj,
+        "tasks": page_obj.object_list,
+        "columns": columns,
+    }, request=request)
 
-    return render(request, "adminpanel/tasks_list.html", {"tasks": tasks})
+
+@login_required
+@reads_from_replica
+def tasks_due(request):
+    """Open tasks that are overdue or due within ?days=<n>, soonest first (tasks.due)."""
+    if not admin_or_superadmin_required(request):
+        return HttpResponseForbidden("Admin/SuperAdmin only")
+
+    if is_superadmin(request.user):
+        tasks = Task.objects.all()
+    else:
+        tasks = Task.objects.filter(owner_admin=request.user)
+
+    form = TaskDueFilterForm(request.GET)
+    form.is_valid()
+    today = timezone.localdate()
+    page_size = getattr(settings, "PANEL_TASKS_PAGE_SIZE", 50)
+    until = today + timedelta(days=form.window_days())
+    due_tasks = due.due_tasks(tasks, until, form.position())
+    rows = list(due_tasks.select_related("assigned_to")[: page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = due.encode_position(rows[-1].due_date, rows[-1].id)
+
+    return render(request, "adminpanel/tasks_due.html", {
+        "form": form,
+        "tasks": rows,
+        "today": today,
+        "until": until,
+        "next_cursor": next_cursor,
+    })
 
 
 @login_required
@@ -223,7 +341,7 @@ def task_detail(request, id):
     task = get_object_or_404(Task, id=id)
 
     if is_admin(request.user):
-        if task.assigned_to.profile.assigned_admin_id != request.user.id:
+        if task.owner_admin_id != request.user.id:
             return HttpResponseForbidden("Not allowed.")
 
     return render(request, "adminpanel/task_detail.html", {"task": task})
@@ -237,7 +355,7 @@ def task_update(request, id):
     task = get_object_or_404(Task, id=id)
 
     if is_admin(request.user):
-        if task.assigned_to.profile.assigned_admin_id != request.user.id:
+        if task.owner_admin_id != request.user.id:
             return HttpResponseForbidden("Not allowed.")
 
     if request.method == "POST":
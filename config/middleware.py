@@ -0,0 +1,303 @@
+import cProfile
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from accounts.authentication import RoleClaimsJWTAuthentication
+from accounts.permissions import is_superadmin
+from .routers import mark_recent_write, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write request (POST/PUT/PATCH/DELETE), keep that user's reads on
+    the primary for a while so they see their own changes despite replica lag (see
+    config.routers). Reads request.user after the view, when DRF has set it from the
+    JWT. A no-op without DATABASE_REPLICAS and a REPLICA_STICKY_CACHE.
+    """
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.process_response(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.process_response(request, response)
+        return response
+
+    @staticmethod
+    def process_response(request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                mark_recent_write(user.id)
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook that records every SQL statement run while
+    installed. Statements are kept parameterised and their parameters are dropped:
+    the SQL text doubles as the signature for spotting the same query repeated with
+    different ids (N+1), and the parameters may hold credentials or personal data.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "alias": context["connection"].alias,
+                "sql": sql,
+                "ms": (time.perf_counter() - started) * 1000,
+            })
+
+    @property
+    def db_ms(self):
+        return sum(query["ms"] for query in self.queries)
+
+    def duplicates(self, minimum):
+        counts = Counter(query["sql"] for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= minimum]
+
+
+class RequestMetricsMiddleware:
+    """
+    Opt-in per-request instrumentation (REQUEST_METRICS = True): query count, DB time,
+    repeated query signatures and view time, reported as a Server-Timing header and
+    one JSON log line per request on the "config.middleware" logger. Requests slower
+    than REQUEST_METRICS_SLOW_MS are logged as warnings together with their SQL text.
+    Install it first in MIDDLEWARE so the other layers are measured too.
+
+    Streaming responses are timed up to the start of the stream only. Synchronous
+    only: under ASGI, enabling it moves every request through a worker thread.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "REQUEST_METRICS_SLOW_MS", 500)
+        self.duplicate_min = getattr(settings, "REQUEST_METRICS_DUPLICATE_MIN", 3)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        db_ms = recorder.db_ms
+        duplicates = recorder.duplicates(self.duplicate_min)
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.1f};desc="{len(recorder.queries)} queries"',
+            f"app;dur={max(total_ms - db_ms, 0):.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "user_id": getattr(getattr(request, "user", None), "id", None),
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(db_ms, 2),
+            "queries": len(recorder.queries),
+            "duplicates": [{"sql": sql, "count": count} for sql, count in duplicates],
+        }
+        if total_ms >= self.slow_ms:
+            record["sql"] = [
+                {"alias": query["alias"], "sql": query["sql"], "ms": round(query["ms"], 2)}
+                for query in recorder.queries
+            ]
+            logger.warning("slow request %s", json.dumps(record, default=str))
+        else:
+            logger.info("request %s", json.dumps(record, default=str))
+        return response
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of one thread every `interval` seconds and counts identical
+    stacks, root first, in the collapsed format flamegraph.pl/speedscope read.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile a single request on demand. A superadmin (session or JWT) adds
+    `X-Profile: cprofile|sample` or `?_profile=cprofile|sample` and the request runs
+    under cProfile (written as a .prof pstats file) or under a stack sampler (written
+    as .collapsed stacks) in REQUEST_PROFILER_DIR. The response's X-Profile header
+    names the file.
+
+    Profiling is capped: at most one profile per REQUEST_PROFILER_MIN_INTERVAL seconds
+    per process, and none once the directory holds REQUEST_PROFILER_MAX_FILES profiles.
+    Set REQUEST_PROFILER_DIR = None to remove the hook entirely.
+    """
+
+    modes = ("cprofile", "sample")
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        directory = getattr(settings, "REQUEST_PROFILER_DIR", None)
+        if not directory:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.directory = Path(directory)
+        self.min_interval = getattr(settings, "REQUEST_PROFILER_MIN_INTERVAL", 60)
+        self.max_files = getattr(settings, "REQUEST_PROFILER_MAX_FILES", 50)
+        self.sample_interval = getattr(settings, "REQUEST_PROFILER_SAMPLE_INTERVAL_MS", 5) / 1000
+        self.lock = threading.Lock()
+        self.last_started = None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self.requested_mode(request)
+        if not mode or not self.is_allowed(request):
+            return self.get_response(request)
+        if not self.acquire():
+            response = self.get_response(request)
+            response["X-Profile"] = "rate-limited"
+            return response
+
+        path = self.directory / self.filename(request, mode)
+        profiler = self.start(mode)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(profiler, path)
+        response["X-Profile"] = path.name
+        return response
+
+    async def __acall__(self, request):
+        # Under ASGI the profile covers the event loop thread, i.e. whatever else it
+        # runs meanwhile, but not the ORM's worker threads.
+        mode = self.requested_mode(request)
+        if not mode or not await sync_to_async(self.is_allowed)(request):
+            return await self.get_response(request)
+        if not self.acquire():
+            response = await self.get_response(request)
+            response["X-Profile"] = "rate-limited"
+            return response
+
+        path = self.directory / self.filename(request, mode)
+        profiler = self.start(mode)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(profiler, path)
+        response["X-Profile"] = path.name
+        return response
+
+    def requested_mode(self, request):
+        mode = request.headers.get("X-Profile") or request.GET.get("_profile")
+        return mode if mode in self.modes else None
+
+    def start(self, mode):
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), self.sample_interval)
+            profiler.start()
+        return profiler
+
+    @staticmethod
+    def stop(profiler, path):
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            path.write_text(profiler.collapsed())
+        else:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+    @staticmethod
+    def is_allowed(request):
+        # API requests authenticate inside DRF, after middleware; check their token here.
+        if "HTTP_AUTHORIZATION" in request.META:
+            try:
+                authenticated = RoleClaimsJWTAuthentication().authenticate(request)
+            except APIException:
+                return False
+            return authenticated is not None and is_superadmin(authenticated[0])
+        return is_superadmin(request.user)
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.last_started is not None and now - self.last_started < self.min_interval:
+                return False
+            self.directory.mkdir(parents=True, exist_ok=True)
+            taken = sum(1 for p in self.directory.iterdir() if p.suffix in (".prof", ".collapsed"))
+            if taken >= self.max_files:
+                return False
+            self.last_started = now
+            return True
+
+    @staticmethod
+    def filename(request, mode):
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "root"
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+        suffix = ".prof" if mode == "cprofile" else ".collapsed"
+        return f"{stamp}-{request.method}-{slug[:60]}{suffix}"
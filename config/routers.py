@@ -0,0 +1,106 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_KEY = "db:sticky:{}"
+
+# Alias reads are sent to inside reads_from_replica(); None = default routing (primary).
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def sticky_cache():
+    alias = getattr(settings, "REPLICA_STICKY_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def replica_aliases() -> list:
+    """
+    DATABASE_REPLICAS, or none without a REPLICA_STICKY_CACHE: a worker that cannot
+    see the read-your-writes flag another worker set would send a user's next read to
+    a replica that may not have their write yet.
+    """
+    if sticky_cache() is None:
+        return []
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def current_read_alias():
+    return _read_alias.get()
+
+
+def reading_from_replica() -> bool:
+    return _read_alias.get() is not None
+
+
+# ---------------- Read-your-writes ----------------
+def mark_recent_write(user_id):
+    """Send `user_id`'s replica reads to the primary for REPLICA_STICKY_SECONDS."""
+    if user_id is not None and replica_aliases():
+        sticky_cache().set(STICKY_KEY.format(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+
+
+def is_sticky(user_id) -> bool:
+    return user_id is not None and bool(sticky_cache().get(STICKY_KEY.format(user_id)))
+
+
+async def ais_sticky(user_id) -> bool:
+    """is_sticky() for async views, which pass it to replica_reads(sticky=...)."""
+    if user_id is None or not replica_aliases():
+        return False
+    return bool(await sticky_cache().aget(STICKY_KEY.format(user_id)))
+
+
+@contextmanager
+def replica_reads(user_id=None, sticky=None):
+    """
+    Route ORM reads in this block to a random replica, unless there are none or
+    `user_id` wrote recently (then they stay on the primary). Writes always go to the
+    primary. Async callers look the flag up with ais_sticky() and pass it as `sticky`
+    instead of `user_id`, so no blocking cache read runs on the event loop.
+    """
+    replicas = replica_aliases()
+    if sticky is None:
+        sticky = bool(replicas) and is_sticky(user_id)
+    alias = random.choice(replicas) if replicas and not sticky else None
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+def reads_from_replica(view_func):
+    """
+    View decorator for read-mostly views (use method_decorator() on class views). The
+    response must be rendered inside the view, as render() and our API views do.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(getattr(request.user, "id", None)):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary ("default"); reads go to the primary except inside
+    replica_reads(). Replicas are expected to receive the schema and data through
+    replication, so this router takes no part in migrations.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
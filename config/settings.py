@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,13 +49,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so it times and counts the queries of every layer below: a no-op
+    # unless REQUEST_METRICS is enabled.
+    "config.middleware.RequestMetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Read-your-writes for replica routing; a no-op without replicas (config.routers).
+    "config.middleware.ReadYourWritesMiddleware",
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Superadmin-only, on-demand profiling of a single request (X-Profile header).
+    "config.middleware.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -88,6 +96,41 @@ DATABASES = {
     }
 }
 
+# Read replicas (aliases in DATABASES). Read-heavy views (task list API, task report,
+# panel task/user lists) read from one of them; writes always go to "default", and a
+# user's reads stay on "default" for REPLICA_STICKY_SECONDS after they write.
+# See config/settings_replica.py for a local two-file SQLite setup.
+DATABASE_ROUTERS = ["config.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_STICKY_SECONDS = 10
+# Cache alias holding those read-your-writes flags. It must be shared by all workers
+# (see CACHES), so without one every read stays on the primary; REDIS_URL provides one.
+REPLICA_STICKY_CACHE = "default" if os.environ.get("REDIS_URL") else None
+# Cap on how long a view rendered from a replica is cached (tasks.caching), since the
+# replica may lag behind the write that invalidated the previous entry.
+REPLICA_CACHE_TIMEOUT = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Local memory: bounded by MAX_ENTRIES with LRU eviction, but private to each process.
+# With more than one worker, point REDIS_URL at a Redis-compatible server (configure it
+# with maxmemory + allkeys-lru), or use FileBasedCache on a shared directory.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "task-manager",
+        "OPTIONS": {"MAX_ENTRIES": 5000, "CULL_FREQUENCY": 10},
+    }
+}
+
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -128,12 +171,90 @@ STATIC_URL = 'static/'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.RoleClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # Reverse proxies in front of the app whose X-Forwarded-For entry is trusted as the
+    # client address (login throttles). 0 = REMOTE_ADDR, so clients cannot pick their IP.
+    "NUM_PROXIES": 0,
+}
+
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.RoleTokenObtainPairSerializer",
+}
+
+# Default page size for the cursor-paginated task API (clients may pass ?page_size=).
+TASKS_PAGE_SIZE = 50
+
+# Admin panel task list: rows per page, and the most rows COUNTed for the pager when
+# the total cannot be read from the stats table (larger results show as "10,000+", and
+# their later pages are still reachable).
+PANEL_TASKS_PAGE_SIZE = 50
+PANEL_COUNT_CAP = 10_000
+
+# Upper bound on items accepted by PUT /api/tasks/batch/.
+TASKS_BATCH_MAX_ITEMS = 200
+
+# Rows fetched per round-trip when streaming report exports.
+TASKS_EXPORT_CHUNK_SIZE = 2000
+
+# "Due soon" window of the due listings and the due-soon sweep (tasks.due).
+TASKS_DUE_SOON_DAYS = 7
+
+# Tasks flagged per transaction by `manage.py sweep_due_tasks`.
+TASKS_SWEEP_CHUNK_SIZE = 1000
+
+# Seconds to cache a user's role across requests (0 = resolve once per request only).
+# Only enable with a cache shared by all workers: role changes invalidate the entry.
+ROLE_CACHE_TIMEOUT = 0
+
+# Seconds to keep cached task list payloads and panel table fragments (tasks.caching;
+# 0 = off). Entries are keyed by per-user/per-admin versions that every Task, Profile
+# and User write bumps, so with a cache shared by all workers (see CACHES) they never go
+# stale; the timeout only bounds their lifetime. With the default per-process LocMemCache
+# one worker's bumps never reach the others, which would serve stale lists until the
+# timeout, so it is only on with REDIS_URL; set it yourself for another shared backend.
+# GET /api/tasks/cache/ shows hit/miss counters.
+VIEW_CACHE_TIMEOUT = 300 if os.environ.get("REDIS_URL") else 0
+
+# Per-request SQL/timing instrumentation (config.middleware.RequestMetricsMiddleware).
+# Requests slower than REQUEST_METRICS_SLOW_MS are logged with their SQL text (never the
+# parameters, which may hold passwords, tokens or personal data); a query
+# signature repeated REQUEST_METRICS_DUPLICATE_MIN times or more is flagged as N+1.
+REQUEST_METRICS = False
+REQUEST_METRICS_SLOW_MS = 500
+REQUEST_METRICS_DUPLICATE_MIN = 3
+
+# On-demand profiles (config.middleware.RequestProfilerMiddleware) are written here,
+# e.g. BASE_DIR / "profiles"; None (the default) removes the hook. Capped per process by
+# interval and overall by file count.
+REQUEST_PROFILER_DIR = None
+REQUEST_PROFILER_MIN_INTERVAL = 60
+REQUEST_PROFILER_MAX_FILES = 50
+REQUEST_PROFILER_SAMPLE_INTERVAL_MS = 5
+
+# Token-bucket throttles on password logins: POST /api/token/ and the panel login form
+# (accounts.throttling). "<n>/<period>" allows bursts of n attempts per client IP / per
+# username, refilled at n per period; an attempt over either is rejected with 429 before
+# its password is hashed. Leave a scope out to turn it off. Buckets are kept per process
+# (at most LOGIN_THROTTLE_MAX_KEYS) unless LOGIN_THROTTLE_CACHE names a cache alias shared
+# by all workers (see CACHES). GET /api/token/throttles/ shows allowed/rejected counters.
+LOGIN_THROTTLE_RATES = {"ip": "10/min", "username": "5/min"}
+LOGIN_THROTTLE_CACHE = None
+LOGIN_THROTTLE_MAX_KEYS = 100_000
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "config.middleware": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
 }
 
 LOGIN_URL = "/panel/login/"
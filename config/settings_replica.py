@@ -0,0 +1,29 @@
+"""
+Primary + replica on two local SQLite files, for exercising config.routers:
+
+    python manage.py migrate --settings=config.settings_replica
+    python manage.py migrate --database=replica --settings=config.settings_replica
+
+Nothing copies rows from the primary to the replica here, which shows which database
+a read was served from. The test suite does not need this: tasks.tests adds its own
+in-memory replica.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",  # noqa: F405
+        "TEST": {"NAME": BASE_DIR / "test_primary.sqlite3"},  # noqa: F405
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.replica.sqlite3",  # noqa: F405
+        "TEST": {"NAME": BASE_DIR / "test_replica.sqlite3"},  # noqa: F405
+    },
+}
+
+DATABASE_REPLICAS = ["replica"]
+# One process, so its local memory cache is shared by everything that runs.
+REPLICA_STICKY_CACHE = "default"
@@ -1,12 +1,14 @@
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
+from accounts.views import LoginThrottleStatsView, LoginTokenObtainPairView
 from django.shortcuts import redirect
 def home(request):
     return redirect("panel_login")
 urlpatterns = [
     # JWT
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("api/token/", LoginTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/token/throttles/", LoginThrottleStatsView.as_view(), name="token_throttle_stats"),
     path("panel/", include("adminpanel.urls")),
     path("", home),
 
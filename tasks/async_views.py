@@ -0,0 +1,183 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.authentication import RoleClaimsJWTAuthentication
+from config.routers import ais_sticky, replica_reads
+from . import caching
+from .conditional import aqueryset_etag, instance_validators, not_modified_response, set_validators
+from .models import Task
+from .pagination import KeysetPagination
+from .permissions import AsyncIsAdminOrSuperAdmin, AsyncIsAuthenticated
+from .serializers import TaskReportSerializer, TaskUpdateSerializer, task_list_values
+from .sync import changes_since
+from .utils import can_view_task_report
+
+
+def json_response(data, status=200):
+    # DRF's encoder: dates, decimals and error details come out as in the DRF views.
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+class AsyncAPIView(View):
+    """
+    The parts of DRF's APIView the async task endpoints need, on a native async
+    Django view: JWT authentication, permission checks and APIException handling.
+    Handlers are coroutines and get a DRF Request (query_params, parsed data).
+
+    DRF views run their handlers synchronously, so under ASGI each one takes a worker
+    thread; these only leave the event loop for the ORM's own thread hops.
+    """
+    authentication_class = RoleClaimsJWTAuthentication
+    permission_classes = [AsyncIsAuthenticated]
+    parser_classes = [JSONParser]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token authentication only, like our DRF views: no session, so no CSRF.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        try:
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            await self.initial(request)
+            return await handler(request, *args, **kwargs)
+        except Http404:
+            return self.handle_exception(exceptions.NotFound())
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def initial(self, request):
+        authenticator = self.authentication_class()
+        authenticated = await authenticator.aauthenticate(request)
+        # Also sets request._request.user, which ReadYourWritesMiddleware reads.
+        request.user = authenticated[0] if authenticated else AnonymousUser()
+
+        for permission in [permission() for permission in self.permission_classes]:
+            if not await permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, exc):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = json_response(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response["WWW-Authenticate"] = self.authentication_class().authenticate_header(None)
+        return response
+
+
+class AsyncTaskListView(AsyncAPIView):
+    """
+    GET /api/async/tasks/ -> Async GET /api/tasks/: same pagination, validators,
+    delta sync and view cache.
+    """
+    pagination_class = KeysetPagination
+
+    async def get(self, request):
+        with replica_reads(sticky=await ais_sticky(request.user.id)):
+            tasks = Task.objects.filter(assigned_to_id=request.user.id)
+
+            if "since" in request.query_params:
+                etag = await aqueryset_etag(tasks, request.user.id, request.GET.urlencode())
+                not_modified = not_modified_response(request, etag)
+                if not_modified is not None:
+                    return not_modified
+                limit = self.pagination_class().get_page_size(request)
+                return set_validators(await self.get_delta(request, limit), etag)
+
+            # Own entry family: the cached page holds next links to this view.
+            page = await caching.aget_or_set(
+                "api-async-task-list",
+                [caching.user_scope(request.user.id)],
+                [request.scheme, request.get_host(), request.GET.urlencode()],
+                lambda: self.get_page(request, tasks),
+            )
+        etag = page["etag"]
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(json_response(page["data"]), etag)
+
+    async def get_page(self, request, tasks):
+        etag = await aqueryset_etag(tasks, request.user.id, request.GET.urlencode())
+        paginator = self.pagination_class()
+        rows = await paginator.apaginate_queryset(task_list_values.values(tasks), request, view=self)
+        data = paginator.get_paginated_response(task_list_values.to_representation(rows)).data
+        return {"etag": etag, "data": data}
+
+    async def get_delta(self, request, limit):
+        # Several dependent queries: one thread hop for all of them.
+        try:
+            delta = await sync_to_async(changes_since)(
+                request.user.id, request.query_params["since"], limit, task_list_values
+            )
+        except ValueError:
+            raise exceptions.ValidationError({"since": "Invalid sync token."})
+
+        return json_response(
+            {
+                "results": delta["changed"],
+                "deleted": delta["deleted"],
+                "next_token": delta["next_token"],
+                "has_more": delta["has_more"],
+            }
+        )
+
+
+class AsyncTaskUpdateView(AsyncAPIView):
+    """
+    PUT /api/async/tasks/<id>/ -> Async PUT /api/tasks/<id>/.
+    """
+
+    async def put(self, request, id):
+        tasks = Task.objects.select_related("assigned_to")
+        task = await aget_object_or_404(tasks, id=id, assigned_to_id=request.user.id)
+
+        serializer = TaskUpdateSerializer(task, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        for attr, value in serializer.validated_data.items():
+            setattr(task, attr, value)
+        # Runs save() and its signal receivers (stats, cache versions) in a thread.
+        await task.asave()
+
+        return json_response(TaskReportSerializer(task).data)
+
+
+class AsyncTaskReportView(AsyncAPIView):
+    """
+    GET /api/async/tasks/<id>/report/ -> Async GET /api/tasks/<id>/report/.
+    """
+    permission_classes = [AsyncIsAuthenticated, AsyncIsAdminOrSuperAdmin]
+
+    async def get(self, request, id):
+        with replica_reads(sticky=await ais_sticky(request.user.id)):
+            task = await aget_object_or_404(Task.objects.select_related("assigned_to"), id=id)
+
+        if task.status != Task.Status.COMPLETED:
+            return json_response(
+                {"detail": "Report is only available for completed tasks."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The permission check memoised the role on the user, so this runs no queries.
+        if not can_view_task_report(request.user, task):
+            return json_response({"detail": "Not authorized for this task."}, status=status.HTTP_403_FORBIDDEN)
+
+        etag, last_modified = instance_validators(task)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        return set_validators(json_response(TaskReportSerializer(task).data), etag, last_modified)
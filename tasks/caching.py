@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+from config.routers import reading_from_replica
+
+VERSION_KEY = "views:v:{}"
+
+# Version scopes. A cached entry names the scopes it depends on; bumping any of them
+# makes every entry built on the old version unreachable (it then ages out / is evicted).
+ALL_TASKS = "tasks"
+ALL_USERS = "users"
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def admin_scope(admin_id) -> str:
+    return f"admin:{admin_id}"
+
+
+def get_cache():
+    return caches[getattr(settings, "VIEW_CACHE_ALIAS", "default")]
+
+
+def cache_timeout() -> int:
+    return getattr(settings, "VIEW_CACHE_TIMEOUT", 0)
+
+
+def enabled() -> bool:
+    return bool(cache_timeout())
+
+
+# ---------------- Versions ----------------
+def get_versions(scopes) -> list:
+    """
+    Current version of each scope. A missing version (never set, or evicted) starts at
+    the current time in ns, so it can never come back to a number an older entry used.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        cache.add(key, time.time_ns(), None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+async def aget_versions(scopes) -> list:
+    cache = get_cache()
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        await cache.aadd(key, time.time_ns(), None)
+    if missing:
+        found.update(await cache.aget_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def bump(*scopes):
+    if not enabled():
+        return
+    cache = get_cache()
+    for scope in set(scopes):
+        key = VERSION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def tasks_changed(tasks):
+    """
+    Bump the versions of everyone whose cached task lists may show `tasks`: their
+    assignees and owner admins, current and as loaded. Call before the tasks'
+    loaded values are reset; writes that send no signals (bulk_update()) call it
+    directly.
+    """
+    if not enabled():
+        return
+    assignee_ids, admin_ids = set(), set()
+    for task in tasks:
+        for field, ids in (("assigned_to_id", assignee_ids), ("owner_admin_id", admin_ids)):
+            ids.add(getattr(task, field))
+            ids.add(task.loaded_value(field))
+    bump(ALL_TASKS, *(user_scope(u) for u in assignee_ids if u), *(admin_scope(a) for a in admin_ids if a))
+
+
+def user_changed(user_id, admin_ids=()):
+    # Task lists show assignee usernames and are scoped by admin, so they depend on users too.
+    bump(ALL_USERS, ALL_TASKS, user_scope(user_id), *(admin_scope(a) for a in admin_ids if a))
+
+
+# ---------------- Entries ----------------
+def make_key(name, scopes, parts, versions=None) -> str:
+    if versions is None:
+        versions = get_versions(scopes)
+    versions = ".".join(str(version) for version in versions)
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+    return f"views:{name}:{','.join(scopes)}:{versions}:{digest}"
+
+
+def get_or_set(name, scopes, parts, compute):
+    """
+    Cached `compute()` for entry family `name`, valid while every scope in `scopes`
+    keeps its version. `parts` (query string, host, ...) tell entries of one family
+    apart. Computes directly when VIEW_CACHE_TIMEOUT is 0.
+    """
+    if not enabled():
+        return compute()
+
+    cache = get_cache()
+    key = make_key(name, scopes, parts)
+    value = cache.get(key)
+    _count(name, value is not None)
+    if value is None:
+        value = compute()
+        cache.set(key, value, entry_timeout())
+    return value
+
+
+async def aget_or_set(name, scopes, parts, compute):
+    """get_or_set() for async views: `compute` is a coroutine function."""
+    if not enabled():
+        return await compute()
+
+    cache = get_cache()
+    key = make_key(name, scopes, parts, versions=await aget_versions(scopes))
+    value = await cache.aget(key)
+    _count(name, value is not None)
+    if value is None:
+        value = await compute()
+        await cache.aset(key, value, entry_timeout())
+    return value
+
+
+def entry_timeout() -> int:
+    timeout = cache_timeout()
+    if reading_from_replica():
+        # A lagging replica may not have the write that bumped the version yet.
+        timeout = min(timeout, getattr(settings, "REPLICA_CACHE_TIMEOUT", 5))
+    return timeout
+
+
+def _count(name, hit):
+    with _counters_lock:
+        _counters[(name, "hits" if hit else "misses")] += 1
+
+
+def counters() -> dict:
+    """Per-process hit/miss counts by entry family."""
+    with _counters_lock:
+        snapshot = dict(_counters)
+    names = sorted({name for name, _ in snapshot})
+    result = {}
+    for name in names:
+        hits, misses = snapshot.get((name, "hits"), 0), snapshot.get((name, "misses"), 0)
+        result[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+    return result
+
+
+def reset_counters():
+    with _counters_lock:
+        _counters.clear()
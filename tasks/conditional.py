@@ -0,0 +1,63 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(p) for p in parts).encode()
+    return quote_etag(hashlib.md5(raw, usedforsecurity=False).hexdigest())
+
+
+def queryset_etag(queryset, *extra):
+    """
+    ETag of a task queryset from one aggregate query. MAX(updated_at) moves on every
+    create/update, COUNT(*) catches deletes. `extra` is folded in so different
+    pages/filters of the same rows differ.
+
+    Collections get no Last-Modified: If-Modified-Since compares whole seconds of
+    MAX(updated_at), which neither a delete nor a second update within that second moves.
+    """
+    agg = queryset.order_by().aggregate(last=Max("updated_at"), n=Count("id"))
+    return make_etag(agg["n"], agg["last"].isoformat() if agg["last"] else "-", *extra)
+
+
+async def aqueryset_etag(queryset, *extra):
+    agg = await queryset.order_by().aaggregate(last=Max("updated_at"), n=Count("id"))
+    return make_etag(agg["n"], agg["last"].isoformat() if agg["last"] else "-", *extra)
+
+
+def instance_validators(task, *extra):
+    """
+    (etag, last_modified) of a single task's report. The ETag also covers the assignee's
+    username, which the report shows but which does not move the task's updated_at;
+    load the task with select_related("assigned_to").
+    """
+    etag = make_etag(task.id, task.updated_at.isoformat(), task.assigned_to_id, task.assigned_to.username, *extra)
+    return etag, task.updated_at
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """
+    Evaluate If-None-Match / If-Modified-Since. Returns a 304 (or 412) response when
+    the client copy is current, else None and the caller renders the body.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # Bodies are per-user: never share them, but let clients revalidate cheaply.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
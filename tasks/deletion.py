@@ -0,0 +1,47 @@
+from . import caching, stats
+from .models import Task, TaskTombstone
+
+# What the bookkeeping below needs to know about a task being deleted.
+DELETED_FIELDS = ("id", "assigned_to_id", "owner_admin_id", "status", "worked_hours")
+
+
+def tasks_deleted(rows):
+    """
+    Tombstones, stats and cache versions for deleted tasks; `rows` are dicts of
+    DELETED_FIELDS, read before the delete. Called by Task.delete() and
+    TaskQuerySet.delete(): Task has no delete receivers, so that deleting a user
+    does not load and signal every one of their tasks (see assignee_deleted()).
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    TaskTombstone.objects.bulk_create(
+        TaskTombstone(task_id=row["id"], assignee_id=row["assigned_to_id"]) for row in rows
+    )
+    stats.tasks_deleted(rows)
+    caching.bump(
+        caching.ALL_TASKS,
+        *(caching.user_scope(row["assigned_to_id"]) for row in rows),
+        *(caching.admin_scope(row["owner_admin_id"]) for row in rows if row["owner_admin_id"]),
+    )
+
+
+def assignee_deleted(assignee_id):
+    """
+    The same for all tasks of a user about to be deleted, which go by CASCADE without
+    passing through Task.delete(): one INSERT of tombstones, one grouped stats delta
+    and one cache bump, however many tasks they had.
+    """
+    tasks = Task.objects.filter(assigned_to_id=assignee_id).order_by()
+    TaskTombstone.objects.bulk_create(
+        TaskTombstone(task_id=task_id, assignee_id=assignee_id)
+        for task_id in tasks.values_list("id", flat=True).iterator()
+    )
+    stats.assignee_deleted(assignee_id)
+    if caching.enabled():
+        admin_ids = tasks.values_list("owner_admin_id", flat=True).distinct()
+        caching.bump(
+            caching.ALL_TASKS,
+            caching.user_scope(assignee_id),
+            *(caching.admin_scope(admin_id) for admin_id in admin_ids if admin_id),
+        )
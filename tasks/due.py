@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task, TaskReminder, TaskSweep
+from .pagination import decode_cursor, encode_cursor
+
+
+def due_soon_days() -> int:
+    return getattr(settings, "TASKS_DUE_SOON_DAYS", 7)
+
+
+def open_tasks(queryset=None):
+    """
+    Tasks with a due date that are not completed. Spelled exactly like the condition
+    of the partial index task_open_due_idx: SQLite only uses a partial index when the
+    query repeats its WHERE terms.
+    """
+    queryset = Task.objects.all() if queryset is None else queryset
+    return queryset.filter(due_date__isnull=False).exclude(status=Task.Status.COMPLETED)
+
+
+def after(queryset, position):
+    """
+    Keyset seek past `position` = (due_date, id) in (due_date, id) order. The plain
+    range on due_date lets the index seek; the OR only trims ties on that date.
+    """
+    if position is None:
+        return queryset
+    due_date, pk = position
+    return queryset.filter(due_date__gte=due_date).filter(Q(due_date__gt=due_date) | Q(id__gt=pk))
+
+
+def due_tasks(queryset, until, position=None):
+    """Open tasks of `queryset` due on or before `until`, soonest first."""
+    return after(open_tasks(queryset).filter(due_date__lte=until), position).order_by("due_date", "id")
+
+
+# ---------------- Listing cursor ----------------
+def encode_position(due_date, pk) -> str:
+    return encode_cursor({"d": due_date.isoformat(), "i": pk})
+
+
+def decode_position(cursor):
+    """(due_date, id) from encode_position(); None for no cursor. Raises ValueError."""
+    if not cursor:
+        return None
+    position = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(position["d"]), int(position["i"])
+    except (KeyError, TypeError) as e:
+        raise ValueError("Malformed cursor.") from e
+
+
+# ---------------- Sweeps ----------------
+def sweep_window(kind, today, days):
+    """(first due date, last due date) a sweep of `kind` flags on `today`."""
+    if kind == TaskReminder.Kind.OVERDUE:
+        return None, today - timedelta(days=1)
+    return today, today + timedelta(days=days)
+
+
+def sweep(kind, today=None, days=None, chunk_size=1000):
+    """
+    Flag open tasks of `kind` (TaskReminder.Kind) with a TaskReminder, walking
+    task_open_due_idx in (due_date, id) order.
+
+    The overdue sweep starts from its checkpoint: each chunk's reminders and the
+    checkpoint are committed together, so an interrupted sweep resumes after its last
+    committed chunk and a repeated run reads only tasks that became due since. Tasks
+    that become open and overdue behind it (created with a past due date, re-dated,
+    reopened) rewind it, see rewind_overdue_sweep(). The due-soon window is only
+    TASKS_DUE_SOON_DAYS long, so that sweep reads all of it on every run and sees any
+    task that entered it. Returns the number of tasks read; a task already flagged
+    for its due date is not flagged again.
+    """
+    today = today or timezone.localdate()
+    days = due_soon_days() if days is None else days
+    first, last = sweep_window(kind, today, days)
+
+    checkpoint, _ = TaskSweep.objects.get_or_create(name=kind)
+    position = (checkpoint.due_date, checkpoint.task_id) if checkpoint.due_date else None
+    if first is not None:
+        # Due-soon tasks from before today are overdue now; start at today.
+        position = (first, 0)
+
+    swept = 0
+    while True:
+        rows = list(due_tasks(Task.objects.all(), last, position).values_list("id", "due_date")[:chunk_size])
+        if not rows:
+            break
+        with transaction.atomic():
+            TaskReminder.objects.bulk_create(
+                [TaskReminder(task_id=pk, kind=kind, due_date=due_date) for pk, due_date in rows],
+                ignore_conflicts=True,
+            )
+            position = (rows[-1][1], rows[-1][0])
+            checkpoint.due_date, checkpoint.task_id = position
+            checkpoint.save(update_fields=["due_date", "task_id", "updated_at"])
+        swept += len(rows)
+        if len(rows) < chunk_size:
+            break
+    return swept
+
+
+def rewind_overdue_sweep(tasks, created=False):
+    """
+    Move the overdue sweep's checkpoint back to the earliest of `tasks` (saved, with
+    their loaded values still set) that became open with a due date: created, re-dated
+    or reopened. Those behind the checkpoint would never be read again otherwise; one
+    UPDATE, which matches no row when the checkpoint is already before them.
+    """
+    positions = [
+        (task.due_date, task.pk)
+        for task in tasks
+        if task.due_date is not None
+        and task.status != Task.Status.COMPLETED
+        and (created or task.has_changed("due_date") or task.loaded_value("status") == Task.Status.COMPLETED)
+    ]
+    if not positions:
+        return
+    due_date, pk = min(positions)
+    TaskSweep.objects.filter(name=TaskReminder.Kind.OVERDUE).filter(
+        Q(due_date__gt=due_date) | Q(due_date=due_date, task_id__gte=pk)
+    ).update(due_date=due_date, task_id=pk - 1)
+
+
+def reset_sweep(kind):
+    """Start the next sweep of `kind` from the beginning; flagged tasks are not flagged twice."""
+    TaskSweep.objects.filter(name=kind).delete()
@@ -0,0 +1,79 @@
+import csv
+import json
+import zlib
+
+from .serializers import task_report_values
+
+# Same columns, in the same order, as TaskReportSerializer.
+EXPORT_FIELDS = ["id", "title", "assigned_to", "status", "completion_report", "worked_hours", "updated_at"]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_report_rows(queryset, chunk_size=2000):
+    """
+    Yield one TaskReportSerializer-shaped dict per task. Rows are read as .values() with
+    .iterator(), so only `chunk_size` rows are alive at a time however large the
+    queryset is.
+    """
+    rows = task_report_values.values(queryset.order_by("id")).iterator(chunk_size=chunk_size)
+    return task_report_values.iter_representation(rows)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+# Leading characters that make a spreadsheet read a cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    """
+    `value` as a CSV cell. Text that a spreadsheet would evaluate as a formula (e.g. a
+    completion report starting with "=") is prefixed with a quote, as OWASP advises.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([csv_cell(row[f]) for f in EXPORT_FIELDS])
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_gzip(chunks):
+    """
+    Gzip a stream of str chunks incrementally. zlib buffers internally and only hands
+    back output once it has a block, so memory stays constant.
+    """
+    compressor = zlib.compressobj(wbits=31)  # 16 + MAX_WBITS -> gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk.encode())
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def iter_export(queryset, fmt="csv", gzip=False, chunk_size=2000):
+    rows = iter_report_rows(queryset, chunk_size=chunk_size)
+    chunks = iter_ndjson(rows) if fmt == "ndjson" else iter_csv(rows)
+    if gzip:
+        return iter_gzip(chunks)
+    return (chunk.encode() for chunk in chunks)
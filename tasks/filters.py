@@ -0,0 +1,31 @@
+import datetime
+
+import django_filters
+from django.utils import timezone
+
+from .models import Task
+
+
+class TaskReportFilter(django_filters.FilterSet):
+    """
+    Filters for GET /api/tasks/reports/. Date bounds are inclusive calendar days in the
+    server timezone and are turned into plain updated_at range lookups (index friendly).
+    """
+    status = django_filters.ChoiceFilter(choices=Task.Status.choices)
+    user = django_filters.NumberFilter(field_name="assigned_to_id")
+    updated_from = django_filters.DateFilter(method="filter_updated_from")
+    updated_to = django_filters.DateFilter(method="filter_updated_to")
+
+    class Meta:
+        model = Task
+        fields = ["status", "user", "updated_from", "updated_to"]
+
+    @staticmethod
+    def _start_of(day):
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+    def filter_updated_from(self, queryset, name, value):
+        return queryset.filter(updated_at__gte=self._start_of(value))
+
+    def filter_updated_to(self, queryset, name, value):
+        return queryset.filter(updated_at__lt=self._start_of(value + datetime.timedelta(days=1)))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.constants import ROLE_ADMIN
+from accounts.models import Profile
+from tasks import caching, ownership
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy each task's assignee admin into Task.owner_admin, one id range per UPDATE. "
+        "Needed after writes that bypass the model signals, e.g. bulk_create() or raw SQL; "
+        "`manage.py check_task_owner_admin` reports whether it is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=10_000, help="Tasks per UPDATE")
+        parser.add_argument("--only-mismatched", action="store_true",
+                            help="Rewrite only the tasks check_task_owner_admin would report")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        started = time.perf_counter()
+        updated = ownership.backfill(options["chunk_size"], only_mismatched=options["only_mismatched"])
+        # Every admin's cached task lists may now show other tasks.
+        admin_ids = Profile.objects.filter(role=ROLE_ADMIN).values_list("user_id", flat=True)
+        caching.bump(caching.ALL_TASKS, *map(caching.admin_scope, admin_ids))
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated owner_admin of {updated} tasks in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,208 @@
+import asyncio
+import io
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from tasks.benchmarking import temporary_database
+
+User = get_user_model()
+
+SEED = 1
+
+# mode -> (handler, path). The same task list, served three ways.
+MODES = {
+    "wsgi": ("wsgi", "/api/tasks/"),
+    "asgi-sync": ("asgi", "/api/tasks/"),
+    "asgi-async": ("asgi", "/api/async/tasks/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare GET task list throughput and latency under many concurrent clients: "
+        "WSGI with a fixed thread pool, ASGI with the sync DRF view, ASGI with the async "
+        "view. Runs the Django handlers in-process on a throwaway database; prints JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=1000, help="Concurrent client connections")
+        parser.add_argument("--requests", type=int, default=5000, help="Requests per mode")
+        parser.add_argument("--wsgi-threads", type=int, default=32,
+                            help="WSGI worker threads (a gthread server's threads)")
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--tasks-per-user", type=int, default=100)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+        parser.add_argument("--cache", action="store_true",
+                            help="Keep the view cache on (by default every request reaches the database)")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+
+        results = []
+        setup_test_environment()
+        try:
+            with temporary_database():
+                call_command(
+                    "seed_data",
+                    admins=max(1, options["users"] // 10),
+                    users=options["users"],
+                    tasks_per_user=options["tasks_per_user"],
+                    seed=SEED,
+                    stdout=io.StringIO(),
+                    stderr=io.StringIO(),
+                )
+                tokens = [
+                    str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+                    for user in User.objects.filter(username__startswith=f"seed{SEED}-user-")
+                ]
+                cache_settings = {} if options["cache"] else {"VIEW_CACHE_TIMEOUT": 0}
+                with override_settings(**cache_settings):
+                    for mode in options["modes"]:
+                        result = asyncio.run(self.run_mode(mode, tokens, options))
+                        results.append(result)
+                        self.stderr.write(
+                            f"{mode:<11} c={options['concurrency']:<5} p50 {result['p50_ms']:>9.2f}ms  "
+                            f"p99 {result['p99_ms']:>9.2f}ms  {result['rps']:>8.1f} req/s  "
+                            f"{result['errors']} errors  {result['peak_threads']} threads"
+                        )
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps({"results": results}, indent=2))
+
+    async def run_mode(self, mode, tokens, options):
+        kind, path = MODES[mode]
+        query = f"page_size={options['page_size']}"
+        headers = itertools.cycle(tokens)
+
+        if kind == "wsgi":
+            # Like a threaded WSGI server: connections beyond the pool wait in the queue.
+            app = WSGIHandler()
+            pool = ThreadPoolExecutor(max_workers=options["wsgi_threads"])
+            loop = asyncio.get_running_loop()
+
+            async def send(token):
+                return await loop.run_in_executor(pool, wsgi_request, app, path, query, token)
+        else:
+            app = ASGIHandler()
+            pool = None
+
+            async def send(token):
+                return await asgi_request(app, path, query, token)
+
+        # Warm-up: lazy imports, URL resolver, first-touch of the database pages.
+        await send(next(headers))
+
+        latencies, statuses = [], []
+        remaining = iter(range(options["requests"]))
+        peak_threads = threading.active_count()
+
+        async def client():
+            # One connection: requests back to back, as a keep-alive client would.
+            nonlocal peak_threads
+            for _ in remaining:
+                started = time.perf_counter()
+                statuses.append(await send(next(headers)))
+                latencies.append((time.perf_counter() - started) * 1000)
+                peak_threads = max(peak_threads, threading.active_count())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options["concurrency"])))
+        elapsed = time.perf_counter() - started
+        if pool is not None:
+            pool.shutdown()
+
+        latencies.sort()
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 3)
+
+        return {
+            "mode": mode,
+            "path": path,
+            "concurrency": options["concurrency"],
+            "requests": len(latencies),
+            "errors": sum(1 for code in statuses if code != 200),
+            "p50_ms": percentile(50),
+            "p90_ms": percentile(90),
+            "p99_ms": percentile(99),
+            "max_ms": round(latencies[-1], 3),
+            "rps": round(len(latencies) / elapsed, 2),
+            "peak_threads": peak_threads,
+        }
+
+
+def wsgi_request(app, path, query, token):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "HTTP_AUTHORIZATION": f"Bearer {token}",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.url_scheme": "http",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    status = []
+    response = app(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return status[0]
+
+
+async def asgi_request(app, path, query, token):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects; the handler cancels this wait when it is done.
+        await asyncio.Event().wait()
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
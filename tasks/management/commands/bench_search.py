@@ -0,0 +1,92 @@
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.benchmarking import best_of, temporary_database
+from tasks.models import Task
+from tasks.search import fts_available, search_tasks
+
+User = get_user_model()
+
+VOCABULARY = (
+    "invoice customer onboarding migration release backlog review audit payroll vendor "
+    "contract renewal dashboard outage incident rollout training budget forecast report "
+    "quarterly compliance security database backup network printer laptop license refund "
+    "shipment warehouse inventory supplier meeting agenda presentation proposal deadline"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Compare FTS5 search vs icontains (LIKE) scans on a throwaway database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--limit", type=int, default=50, help="Results fetched per search")
+
+    def handle(self, *args, **options):
+        results = []
+        with temporary_database():
+            if not fts_available():
+                raise CommandError("This database has no FTS5 index to compare against.")
+            user = User.objects.create_user("bench")
+            created = 0
+            for rows in sorted(options["rows"]):
+                self._create_tasks(user, created, rows - created)
+                created = rows
+                results.extend(self._measure(rows, options["repeat"], options["limit"]))
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _create_tasks(self, user, start, count):
+        rng = random.Random(start)
+        # Zipf-like word frequencies, so there are both common and rare terms.
+        weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+        def words(n):
+            return " ".join(rng.choices(VOCABULARY, weights=weights, k=n))
+
+        batch = [
+            Task(
+                title=f"{words(3)} #{start + i}",
+                # One task in 10,000 mentions a word nothing else uses.
+                description=words(30) + (" zeppelin" if (start + i) % 10_000 == 0 else ""),
+                assigned_to=user,
+                completion_report=words(15) if i % 3 == 0 else "",
+            )
+            for i in range(count)
+        ]
+        Task.objects.bulk_create(batch, batch_size=5000)
+
+    def _measure(self, rows, repeat, limit):
+        queries = {
+            "common word": VOCABULARY[0],
+            "uncommon word": VOCABULARY[-1],
+            "two words": f"{VOCABULARY[1]} {VOCABULARY[-2]}",
+            "prefix": VOCABULARY[5][:4],
+            "rare word": "zeppelin",
+            "no match": "xylophone",
+        }
+        results = []
+        for label, text in queries.items():
+            for backend in ("fts", "like"):
+                queryset = search_tasks(Task.objects.all(), text, backend=backend)
+                # A first page can stop early on LIKE; counting all matches cannot.
+                first_page = best_of(lambda: list(queryset[:limit]), repeat)
+                count = best_of(queryset.count, repeat)
+                results.append({
+                    "query": label,
+                    "text": text,
+                    "backend": backend,
+                    "rows": rows,
+                    "matches": queryset.count(),
+                    "first_page_seconds": round(first_page, 5),
+                    "count_seconds": round(count, 5),
+                })
+                self.stderr.write(
+                    f"{label:<14} {backend:<5} {rows:>8} rows  first page {first_page * 1000:>8.2f} ms  "
+                    f"count {count * 1000:>8.2f} ms"
+                )
+        return results
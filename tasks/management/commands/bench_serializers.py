@@ -0,0 +1,72 @@
+import json
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tasks.benchmarking import best_of, temporary_database
+from tasks.models import Task
+from tasks.serializers import TaskListSerializer, TaskReportSerializer, task_list_values, task_report_values
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Compare ModelSerializer vs values() serialization throughput on a throwaway database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        results = []
+        with temporary_database():
+            user = User.objects.create_user("bench")
+            created = 0
+            for rows in sorted(options["rows"]):
+                self._create_tasks(user, rows - created)
+                created = rows
+                results.extend(self._measure(rows, options["repeat"]))
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _create_tasks(self, user, count):
+        rng = random.Random(count)
+        statuses = Task.Status.values
+        batch = []
+        for i in range(count):
+            status = rng.choice(statuses)
+            done = status == Task.Status.COMPLETED
+            batch.append(Task(
+                title=f"Task {i}",
+                description="Benchmark task",
+                assigned_to=user,
+                due_date=date(2030, 1, 1) + timedelta(days=rng.randrange(365)),
+                status=status,
+                completion_report="Done" if done else "",
+                worked_hours=Decimal(rng.randrange(1, 4000)) / 100 if done else None,
+            ))
+        Task.objects.bulk_create(batch, batch_size=5000)
+
+    def _measure(self, rows, repeat):
+        list_qs = Task.objects.order_by("-updated_at", "-id")
+        report_qs = Task.objects.select_related("assigned_to").order_by("-updated_at", "-id")
+        cases = [
+            ("list/model_serializer", lambda: TaskListSerializer(list_qs, many=True).data),
+            ("list/values", lambda: task_list_values.to_representation(task_list_values.values(list_qs))),
+            ("report/model_serializer", lambda: TaskReportSerializer(report_qs, many=True).data),
+            ("report/values", lambda: task_report_values.to_representation(task_report_values.values(report_qs))),
+        ]
+        results = []
+        for name, func in cases:
+            seconds = best_of(func, repeat)
+            results.append({
+                "case": name,
+                "rows": rows,
+                "seconds": round(seconds, 4),
+                "rows_per_second": round(rows / seconds),
+            })
+            self.stderr.write(f"{name:<24} {rows:>8} rows  {rows / seconds:>12,.0f} rows/s")
+        return results
@@ -0,0 +1,214 @@
+import io
+import itertools
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.utils import timezone
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from tasks.benchmarking import temporary_database
+from tasks.models import Task
+
+User = get_user_model()
+
+USERS_PER_SIZE = 50
+ADMINS_PER_SIZE = 5
+SEED = 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API and admin panel hot paths on throwaway generated datasets. "
+        "Prints JSON; with --baseline, fails when a run regresses against a previous one."
+    )
+
+    scenarios = [
+        "api_task_list",
+        "api_task_update",
+        "api_task_report",
+        "api_task_search",
+        "api_token",
+        "panel_tasks_list",
+        "panel_tasks_search",
+        "panel_users_list",
+        "panel_task_create",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                            help="Total tasks in each generated dataset")
+        parser.add_argument("--iterations", type=int, default=30, help="Requests per scenario")
+        parser.add_argument("--token-iterations", type=int, default=5,
+                            help="Requests for api_token (each one runs a full password hash)")
+        parser.add_argument("--scenarios", nargs="+", choices=self.scenarios, default=self.scenarios)
+        parser.add_argument("--output", help="Also write the JSON results to this file")
+        parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed p50 latency growth vs the baseline (0.25 = +25%%)")
+
+    def handle(self, *args, **options):
+        results = []
+        setup_test_environment()
+        try:
+            # api_token measures the password hash, which the login throttles would cut off,
+            # and the scenarios measure the views, not hits on whatever VIEW_CACHE_TIMEOUT
+            # the environment sets (bench_concurrency compares the two). Replicas would be
+            # read instead of the throwaway database.
+            with override_settings(LOGIN_THROTTLE_RATES={}, VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[]):
+                for size in options["sizes"]:
+                    with temporary_database():
+                        self.generate(size)
+                        results.extend(self.run_size(size, options))
+        finally:
+            teardown_test_environment()
+
+        payload = json.dumps({"results": results}, indent=2)
+        self.stdout.write(payload)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(payload + "\n")
+
+        if options["baseline"]:
+            regressions = self.compare(results, options["baseline"], options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n" + "\n".join(regressions))
+            self.stderr.write(self.style.SUCCESS("No regressions against baseline."))
+
+    # ---------------- Dataset ----------------
+    def generate(self, size):
+        per_user = max(1, size // USERS_PER_SIZE)
+        self.stderr.write(f"Generating {USERS_PER_SIZE * per_user:,} tasks...")
+        call_command(
+            "seed_data",
+            admins=ADMINS_PER_SIZE,
+            users=USERS_PER_SIZE,
+            tasks_per_user=per_user,
+            seed=SEED,
+            stdout=io.StringIO(),
+            stderr=io.StringIO(),
+        )
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    # ---------------- Scenarios ----------------
+    def run_size(self, size, options):
+        superadmin = User.objects.get(username="superadmin")
+        admin = User.objects.get(username=f"seed{SEED}-admin-0")
+        user = User.objects.get(username=f"seed{SEED}-user-0")
+        own_task = Task.objects.filter(assigned_to=user).order_by("id").first()
+        completed = Task.objects.filter(status=Task.Status.COMPLETED).order_by("id")
+        # Tiny datasets may leave user-0 without a completed task; any of admin-0's will do.
+        report_task = completed.filter(assigned_to=user).first() or completed.filter(owner_admin=admin).first()
+        if report_task is None:
+            raise CommandError(f"No completed task for {admin.username} in a {size:,}-task dataset; use larger --sizes.")
+
+        api_user = self.api_client(user)
+        api_admin = self.api_client(admin)
+        panel_admin = Client()
+        panel_admin.force_login(admin)
+        panel_superadmin = Client()
+        panel_superadmin.force_login(superadmin)
+        due = (timezone.now() + timedelta(days=7)).date().isoformat()
+        statuses = itertools.cycle([Task.Status.IN_PROGRESS, Task.Status.PENDING])
+
+        requests = {
+            "api_task_list": lambda: api_user.get("/api/tasks/"),
+            "api_task_update": lambda: api_user.put(
+                f"/api/tasks/{own_task.id}/",
+                data=json.dumps({"status": next(statuses)}),
+                content_type="application/json",
+            ),
+            "api_task_report": lambda: api_admin.get(f"/api/tasks/{report_task.id}/report/"),
+            "api_task_search": lambda: api_admin.get("/api/tasks/search/?q=planned"),
+            "api_token": lambda: Client().post(
+                "/api/token/", {"username": user.username, "password": "pass123"}
+            ),
+            "panel_tasks_list": lambda: panel_admin.get("/panel/tasks/"),
+            "panel_tasks_search": lambda: panel_admin.get("/panel/tasks/?q=planned"),
+            "panel_users_list": lambda: panel_superadmin.get("/panel/users/"),
+            "panel_task_create": lambda: panel_admin.post("/panel/tasks/create/", {
+                "title": "Benchmark task",
+                "description": "",
+                "assigned_to": user.id,
+                "due_date": due,
+                "status": Task.Status.PENDING,
+            }),
+        }
+
+        results = []
+        for name in options["scenarios"]:
+            iterations = options["token_iterations"] if name == "api_token" else options["iterations"]
+            result = self.measure(requests[name], iterations)
+            result.update({"scenario": name, "size": size})
+            results.append(result)
+            self.stderr.write(
+                f"{name:<18} {size:>8,} tasks  p50 {result['p50_ms']:>8.2f}ms  "
+                f"p95 {result['p95_ms']:>8.2f}ms  {result['rps']:>8.1f} req/s  {result['queries']} queries"
+            )
+        return results
+
+    @staticmethod
+    def api_client(user):
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+        return Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    @staticmethod
+    def measure(request, iterations):
+        request()  # warm-up: caches, lazy imports, first-touch of pages
+
+        latencies, queries = [], []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                t0 = time.perf_counter()
+                response = request()
+                latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f"Benchmark request failed with {response.status_code}")
+            queries.append(len(captured))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 3)
+
+        return {
+            "iterations": iterations,
+            "p50_ms": percentile(50),
+            "p90_ms": percentile(90),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "rps": round(iterations / elapsed, 2),
+            "queries": max(queries),
+        }
+
+    # ---------------- Baseline comparison ----------------
+    @staticmethod
+    def compare(results, baseline_path, tolerance):
+        with open(baseline_path) as fh:
+            baseline = {(r["scenario"], r["size"]): r for r in json.load(fh)["results"]}
+
+        regressions = []
+        for result in results:
+            before = baseline.get((result["scenario"], result["size"]))
+            if before is None:
+                continue
+            label = f"{result['scenario']} @ {result['size']}"
+            if result["queries"] > before["queries"]:
+                regressions.append(f"{label}: {before['queries']} -> {result['queries']} queries")
+            if result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+                regressions.append(f"{label}: p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+        return regressions
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from tasks import query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN on the registered hot querysets (tasks.query_plans) and "
+        "fail when one scans a table or sorts in a temp b-tree without an allowance. "
+        "Plans follow the table statistics, so run ANALYZE on a realistic database first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--query", nargs="+", choices=sorted(query_plans.HOT_QUERIES),
+                            help="Only check these queries")
+        parser.add_argument("--plans", action="store_true", help="Print every plan, not only failures")
+
+    def handle(self, *args, **options):
+        if connections[options["database"]].vendor != "sqlite":
+            raise CommandError("Only SQLite query plans are understood.")
+
+        failed = []
+        for name in options["query"] or query_plans.HOT_QUERIES:
+            plan, problems = query_plans.check(name, using=options["database"])
+            if problems:
+                failed.append(name)
+            if problems or options["plans"]:
+                style = self.style.ERROR if problems else self.style.SUCCESS
+                self.stdout.write(style(f"{'FAIL' if problems else 'ok'}  {name}"))
+                for line in plan:
+                    marker = "!" if line in problems else " "
+                    self.stdout.write(f"   {marker} {line}")
+
+        if failed:
+            raise CommandError(f"{len(failed)} queries scan or sort: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"{len(query_plans.HOT_QUERIES)} query plans use their indexes."))
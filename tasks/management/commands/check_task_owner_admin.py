@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import ownership
+
+
+class Command(BaseCommand):
+    help = (
+        "Report tasks whose owner_admin is not their assignee's current admin and fail "
+        "if there are any. Fix them with `manage.py backfill_task_owner_admin --only-mismatched`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--show", type=int, default=20, help="How many mismatched tasks to list")
+
+    def handle(self, *args, **options):
+        mismatched = ownership.mismatched_tasks().order_by("id")
+        count = mismatched.count()
+        if not count:
+            self.stdout.write(self.style.SUCCESS("Every task's owner_admin matches its assignee's admin."))
+            return
+
+        rows = mismatched.values_list(
+            "id", "assigned_to_id", "owner_admin_id", "assigned_to__profile__assigned_admin_id"
+        )
+        for task_id, assignee_id, owner_admin_id, admin_id in rows[:options["show"]]:
+            self.stdout.write(
+                f"task #{task_id}: assignee {assignee_id}, owner_admin {owner_admin_id}, expected {admin_id}"
+            )
+        raise CommandError(f"{count} tasks have a stale owner_admin.")
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard statistics table (TaskStat) from Task. Needed after "
+        "writes that bypass the model signals, e.g. bulk_create() or raw SQL."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} task statistics rows in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_assignee_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('assignee_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['assignee_id', 'id'], name='tombstone_assignee_idx')],
+            },
+        ),
+    ]
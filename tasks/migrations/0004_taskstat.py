@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_task_stats(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskStat = apps.get_model("tasks", "TaskStat")
+    db = schema_editor.connection.alias
+    rows = (
+        Task.objects.using(db).values("assigned_to_id", "assigned_to__profile__assigned_admin_id", "status")
+        .annotate(count=Count("id"), worked_hours=Sum("worked_hours"))
+        .order_by()
+    )
+    TaskStat.objects.using(db).bulk_create(
+        [
+            TaskStat(
+                assignee_id=row["assigned_to_id"],
+                admin_id=row["assigned_to__profile__assigned_admin_id"],
+                status=row["status"],
+                count=row["count"],
+                worked_hours=row["worked_hours"] or 0,
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_tasktombstone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('worked_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('admin', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('assignee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['admin', 'status'], name='taskstat_admin_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('assignee', 'status'), name='taskstat_assignee_status_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_task_stats, migrations.RunPython.noop),
+    ]
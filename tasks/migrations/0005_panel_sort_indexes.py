@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_taskstat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', 'id'], name='task_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'updated_at', 'id'], name='task_status_updated_idx'),
+        ),
+    ]
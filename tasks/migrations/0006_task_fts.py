@@ -0,0 +1,76 @@
+from django.db import migrations
+
+FTS_TABLE = "tasks_task_fts"
+FTS_COLUMNS = "title, description, completion_report"
+
+# External-content FTS5 index over tasks_task: it stores only the index, not another
+# copy of the text. Triggers keep it in sync for every write path, including
+# bulk_create()/bulk_update() and raw SQL.
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {FTS_COLUMNS},
+        content='tasks_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.description, new.completion_report);
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.description, old.completion_report);
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.description, new.completion_report);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def fts5_supported(schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_fts(apps, schema_editor):
+    # Other backends (and SQLite builds without FTS5) use tasks.search's icontains fallback.
+    if fts5_supported(schema_editor):
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_panel_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('OVERDUE', 'Overdue'), ('DUE_SOON', 'Due soon')], max_length=20)),
+                ('due_date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='tasks.task')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('task_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'COMPLETED'), _negated=True)), fields=['due_date', 'id'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['id'], name='taskreminder_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskreminder',
+            constraint=models.UniqueConstraint(fields=('task', 'kind', 'due_date'), name='taskreminder_task_kind_due_uniq'),
+        ),
+    ]
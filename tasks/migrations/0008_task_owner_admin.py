@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_owner_admin(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Profile = apps.get_model("accounts", "Profile")
+    db = schema_editor.connection.alias
+    admin_of_assignee = Profile.objects.using(db).filter(user_id=OuterRef("assigned_to_id"))
+    Task.objects.using(db).update(owner_admin_id=Subquery(admin_of_assignee.values("assigned_admin_id")[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_profile_admin_role_idx'),
+        ('tasks', '0007_due_sweeps'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='owner_admin',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        # Before the indexes: filled in one UPDATE, then indexed once.
+        migrations.RunPython(populate_owner_admin, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner_admin', 'updated_at', 'id'], name='task_owner_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner_admin', 'due_date', 'id'], name='task_owner_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner_admin', 'status', 'updated_at', 'id'], name='task_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'COMPLETED'), _negated=True)), fields=['owner_admin', 'due_date', 'id'], name='task_owner_open_due_idx'),
+        ),
+    ]
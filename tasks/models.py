@@ -1,5 +1,18 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, router, transaction
+
+
+class TaskQuerySet(models.QuerySet):
+    def delete(self):
+        # Tombstones, stats and cache versions for the deleted rows (tasks.deletion).
+        from . import deletion
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            deletion.tasks_deleted(self.select_for_update().values(*deletion.DELETED_FIELDS))
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Task(models.Model):
@@ -8,6 +21,12 @@ class Task(models.Model):
         IN_PROGRESS = "IN_PROGRESS", "In Progress"
         COMPLETED = "COMPLETED", "Completed"
 
+    # Fields that TaskStat is kept from (tasks.stats) or grouped by.
+    STAT_FIELDS = ("assigned_to_id", "status", "worked_hours", "owner_admin_id")
+    # Fields whose loaded value is remembered, so tasks.stats can apply only the
+    # difference (and tasks.due can tell a re-dated or reopened task).
+    TRACKED_FIELDS = (*STAT_FIELDS, "due_date")
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     assigned_to = models.ForeignKey(
@@ -15,6 +34,16 @@ class Task(models.Model):
         on_delete=models.CASCADE,
         related_name="tasks",
     )
+    # The assignee's Profile.assigned_admin, copied in so an admin's tasks are one
+    # indexed range of this table. Kept in sync by tasks.ownership; indexed below.
+    owner_admin = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
     due_date = models.DateField(null=True, blank=True)
 
     status = models.CharField(
@@ -30,5 +59,186 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the per-user task feed and its keyset pagination.
+            models.Index(fields=["assigned_to", "updated_at", "id"], name="task_assignee_updated_idx"),
+            # Sort orders of the admin panel task list (adminpanel.forms.TaskListFilterForm).
+            models.Index(fields=["updated_at", "id"], name="task_updated_idx"),
+            models.Index(fields=["due_date", "id"], name="task_due_idx"),
+            models.Index(fields=["status", "updated_at", "id"], name="task_status_updated_idx"),
+            # The same for an admin's own tasks (owner_admin); also serves the admin's
+            # report listing, which reads completed tasks newest first.
+            models.Index(fields=["owner_admin", "updated_at", "id"], name="task_owner_updated_idx"),
+            models.Index(fields=["owner_admin", "due_date", "id"], name="task_owner_due_idx"),
+            models.Index(fields=["owner_admin", "status", "updated_at", "id"], name="task_owner_status_idx"),
+            # Open tasks with a due date only, in due order: the due/overdue listings and
+            # sweeps (tasks.due) read this small index instead of every task ever made.
+            models.Index(
+                fields=["due_date", "id"],
+                condition=models.Q(due_date__isnull=False) & ~models.Q(status="COMPLETED"),
+                name="task_open_due_idx",
+            ),
+            models.Index(
+                fields=["owner_admin", "due_date", "id"],
+                condition=models.Q(due_date__isnull=False) & ~models.Q(status="COMPLETED"),
+                name="task_owner_open_due_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self.stats_may_change():
+            if kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+                # Leave the stat fields alone: written back from a stale load, they would
+                # undo a concurrent change that the stats already count.
+                skipped = {*self.STAT_FIELDS, *self.get_deferred_fields()}
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in skipped
+                ]
+            return super().save(*args, **kwargs)
+
+        # tasks.signals re-reads the values this save replaces under a row lock, so the
+        # stats deltas computed from them commit together with the write.
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+    def stats_may_change(self) -> bool:
+        """Whether saving this task may change TaskStat, so needs the locked re-read."""
+        return self._state.adding or any(self.has_changed(field) for field in self.STAT_FIELDS)
+
+    def delete(self, *args, **kwargs):
+        # Tasks deleted with their assignee skip this: see tasks.deletion.assignee_deleted().
+        from . import deletion
+
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            rows = Task.objects.using(using).select_for_update().filter(pk=self.pk)
+            deletion.tasks_deleted(rows.values(*deletion.DELETED_FIELDS))
+            return super().delete(*args, **kwargs)
+
+    def remember_loaded_values(self):
+        self._loaded_values = {f: self.__dict__[f] for f in self.TRACKED_FIELDS if f in self.__dict__}
+
+    def loaded_value(self, field):
+        return getattr(self, "_loaded_values", {}).get(field)
+
+    def has_changed(self, field) -> bool:
+        loaded = getattr(self, "_loaded_values", {})
+        return field not in loaded or loaded[field] != getattr(self, field)
+
     def __str__(self) -> str:
         return f"{self.title} -> {self.assigned_to.username} ({self.status})"
+
+
+class TaskTombstone(models.Model):
+    """
+    Record of a deleted Task, so delta-sync clients can drop it locally.
+
+    Plain ids instead of foreign keys: the task is gone, and the assignee may be too
+    (tasks are removed by CASCADE when their user is deleted).
+    """
+    task_id = models.BigIntegerField()
+    assignee_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["assignee_id", "id"], name="tombstone_assignee_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Task #{self.task_id} deleted at {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class TaskStat(models.Model):
+    """
+    Running totals of tasks per (assignee, status), with the assignee's admin copied
+    in so the dashboard can group by admin without touching Task or Profile.
+
+    Maintained incrementally by tasks.stats; `manage.py rebuild_task_stats` recomputes
+    it from scratch.
+    """
+    assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    admin = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    count = models.IntegerField(default=0)
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["assignee", "status"], name="taskstat_assignee_status_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["admin", "status"], name="taskstat_admin_status_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.assignee_id}/{self.status}: {self.count}"
+
+
+class TaskSweep(models.Model):
+    """
+    Checkpoint of a resumable sweep over open tasks in (due_date, id) order. Each run
+    of `manage.py sweep_due_tasks` continues after the last task it handled, so it only
+    reads tasks that became due since, and resumes where it stopped after a crash.
+    Saving a task behind it rewinds it (tasks.due.rewind_overdue_sweep()).
+    """
+    name = models.CharField(max_length=50, unique=True)
+    due_date = models.DateField(null=True, blank=True)
+    task_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} at {self.due_date or '-'}/#{self.task_id}"
+
+
+class TaskReminder(models.Model):
+    """
+    A task flagged by a sweep: overdue, or due within TASKS_DUE_SOON_DAYS. One row per
+    task, kind and due date, so re-running a sweep never flags a task twice, while a
+    task whose due date moves is flagged again. Rows with notified_at unset are the
+    queue for whatever sends the notifications.
+    """
+    class Kind(models.TextChoices):
+        OVERDUE = "OVERDUE", "Overdue"
+        DUE_SOON = "DUE_SOON", "Due soon"
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reminders")
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    due_date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task", "kind", "due_date"], name="taskreminder_task_kind_due_uniq"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"], condition=models.Q(notified_at__isnull=True), name="taskreminder_pending_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()}: task #{self.task_id} due {self.due_date}"
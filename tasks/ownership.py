@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F, OuterRef, Q, Subquery
+
+from accounts.models import Profile
+from .models import Task
+
+User = get_user_model()
+
+
+def assignee_admin_id(task):
+    """
+    The admin of `task`'s assignee, as Task.owner_admin should hold it. Reads the
+    assignee's profile when it is already loaded, else one indexed lookup.
+    """
+    if Task.assigned_to.is_cached(task) and User.profile.is_cached(task.assigned_to):
+        return task.assigned_to.profile.assigned_admin_id
+    return Profile.objects.filter(user_id=task.assigned_to_id).values_list("assigned_admin_id", flat=True).first()
+
+
+def assignee_admin_changed(assignee_id, admin_id) -> int:
+    """
+    Move every task of `assignee_id` to `admin_id` in one UPDATE. Returns the number of
+    tasks moved. Sends no signals and leaves updated_at alone: the tasks themselves did
+    not change, and the caller bumps the cached views of both admins.
+    """
+    tasks = Task.objects.filter(assigned_to_id=assignee_id)
+    return tasks.exclude(owner_admin_id=admin_id).update(owner_admin_id=admin_id)
+
+
+def mismatched_tasks(queryset=None):
+    """
+    Tasks whose owner_admin is not their assignee's current admin, e.g. after
+    bulk_create(), raw SQL, or a task created while its assignee was being moved.
+    """
+    queryset = Task.objects.all() if queryset is None else queryset
+    profile_admin = "assigned_to__profile__assigned_admin_id"
+    return queryset.filter(
+        Q(owner_admin_id__isnull=True, **{f"{profile_admin}__isnull": False})
+        | Q(owner_admin_id__isnull=False, **{f"{profile_admin}__isnull": True})
+        | (
+            Q(owner_admin_id__isnull=False, **{f"{profile_admin}__isnull": False})
+            & ~Q(owner_admin_id=F(profile_admin))
+        )
+    )
+
+
+def backfill(chunk_size=10_000, only_mismatched=False) -> int:
+    """
+    Copy each task's assignee admin into owner_admin, one id range of `chunk_size`
+    tasks per UPDATE so no statement holds the write lock for long. With
+    `only_mismatched`, rows already correct are not rewritten. Returns the number of
+    rows updated.
+    """
+    admin_of_assignee = Subquery(
+        Profile.objects.filter(user_id=OuterRef("assigned_to_id")).values("assigned_admin_id")[:1]
+    )
+    last_id = Task.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    updated = 0
+    for start in range(0, last_id + 1, chunk_size):
+        tasks = Task.objects.filter(id__gte=start, id__lt=start + chunk_size)
+        if only_mismatched:
+            tasks = Task.objects.filter(id__in=mismatched_tasks(tasks).values("id"))
+        updated += tasks.update(owner_admin_id=admin_of_assignee)
+    return updated
@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(position: dict) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Reverse of encode_cursor(). Raises ValueError on anything we did not issue.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor.") from e
+    if not isinstance(position, dict):
+        raise ValueError("Malformed cursor.")
+    return position
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (updated_at DESC, id DESC).
+
+    Each page is fetched with a `WHERE (updated_at, id) < (cursor)` seek instead of an
+    OFFSET, so page N costs the same as page 1 as long as the filtered queryset is
+    backed by an index ending in (updated_at, id).
+
+    Response shape: {"next": <url or null>, "results": [...]}.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self, page_size=None):
+        self.page_size = page_size or getattr(settings, "TASKS_PAGE_SIZE", 50)
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_position(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = decode_cursor(cursor)
+            updated_at = parse_datetime(position["u"])
+            pk = int(position["i"])
+        except (ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if updated_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return updated_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size, queryset = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset), page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size, queryset = self.page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset], page_size)
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        position = self.get_position(request)
+        if position is not None:
+            updated_at, pk = position
+            queryset = queryset.filter(
+                Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=pk)
+            )
+
+        # Fetch one extra row to know whether there is a next page without a COUNT(*).
+        return page_size, queryset.order_by("-updated_at", "-id")[: page_size + 1]
+
+    def set_page(self, rows, page_size):
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+        self.next_position = None
+        if self.has_next:
+            updated_at, pk = self.position_of(page[-1])
+            self.next_position = {"u": updated_at.isoformat(), "i": pk}
+        return page
+
+    @staticmethod
+    def position_of(row):
+        # Works for model instances and for .values() rows.
+        if isinstance(row, dict):
+            return row["updated_at"], row["id"]
+        return row.updated_at, row.id
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
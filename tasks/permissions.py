@@ -1,5 +1,5 @@
 from rest_framework.permissions import BasePermission
-from accounts.permissions import is_admin, is_superadmin
+from accounts.permissions import ais_admin_or_superadmin, is_admin, is_superadmin
 
 
 class IsAdminOrSuperAdmin(BasePermission):
@@ -10,3 +10,19 @@ class IsAdminOrSuperAdmin(BasePermission):
 class IsSuperAdmin(BasePermission):
     def has_permission(self, request, view):
         return is_superadmin(request.user)
+
+
+# ---------------- Async (tasks.async_views) ----------------
+class AsyncIsAuthenticated:
+    message = "Authentication credentials were not provided."
+
+    async def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+
+class AsyncIsAdminOrSuperAdmin:
+    message = "Not authorized."
+
+    async def has_permission(self, request, view):
+        return await ais_admin_or_superadmin(request.user)
+
@@ -0,0 +1,224 @@
+import re
+from datetime import date, datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Count, Q, Sum
+
+from accounts.authentication import token_state_query
+from accounts.constants import ROLE_ADMIN, ROLE_USER
+from accounts.models import Profile
+from . import due
+from .models import Task, TaskStat, TaskTombstone
+from .serializers import task_list_values, task_report_values
+
+User = get_user_model()
+
+# Plan lines that read a whole table or index, or sort/group rows in a temporary b-tree.
+PROBLEMS = re.compile(r"^(SCAN |USE TEMP B-TREE)")
+
+# Placeholder parameters: plans depend on the query's shape, not on the values.
+ID = 1
+DAY = date(2030, 1, 1)
+MOMENT = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+# name -> {"build": callable returning the queryset, "allow": {plan line regex: reason}}
+HOT_QUERIES = {}
+
+
+def hot_query(name, allow=None):
+    """
+    Register a queryset builder under `name`. `allow` maps regexes of plan lines that
+    are accepted for this query to the reason why, e.g. an index walked in order and
+    cut short by LIMIT.
+    """
+    def register(build):
+        HOT_QUERIES[name] = {"build": build, "allow": allow or {}}
+        return build
+    return register
+
+
+def explain(queryset, using=None) -> list:
+    """SQLite's EXPLAIN QUERY PLAN for `queryset`: one detail line per plan step."""
+    connection = connections[using or queryset.db]
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def find_problems(plan, allow=None) -> list:
+    """Lines of `plan` that scan or build a temp b-tree, unless a regex in `allow` accepts them."""
+    return [
+        line for line in plan
+        if PROBLEMS.match(line) and not any(re.search(pattern, line) for pattern in allow or {})
+    ]
+
+
+def check(name, using=None):
+    """(plan lines, problem lines) of the registered query `name`."""
+    entry = HOT_QUERIES[name]
+    plan = explain(entry["build"](), using)
+    return plan, find_problems(plan, entry["allow"])
+
+
+def check_all(using=None):
+    """{name: (plan, problems)} for every registered query."""
+    return {name: check(name, using) for name in HOT_QUERIES}
+
+
+def _ordered_walk(index):
+    return {rf"^SCAN \w+ USING INDEX {index}\b": "walks the index in the requested order; LIMIT stops it early"}
+
+
+# ---------------- API ----------------
+@hot_query("api.task_list")
+def _api_task_list():
+    tasks = Task.objects.filter(assigned_to_id=ID)
+    return task_list_values.values(tasks).order_by("-updated_at", "-id")[:51]
+
+
+@hot_query("api.task_list.next_page")
+def _api_task_list_next_page():
+    tasks = Task.objects.filter(assigned_to_id=ID).filter(
+        Q(updated_at__lt=MOMENT) | Q(updated_at=MOMENT, id__lt=ID)
+    )
+    return task_list_values.values(tasks).order_by("-updated_at", "-id")[:51]
+
+
+@hot_query("api.task_sync")
+def _api_task_sync():
+    tasks = Task.objects.filter(assigned_to_id=ID).filter(Q(updated_at__gt=MOMENT) | Q(updated_at=MOMENT, id__gt=ID))
+    return task_list_values.values(tasks).order_by("updated_at", "id")[:51]
+
+
+@hot_query("api.task_sync.tombstones")
+def _api_task_sync_tombstones():
+    return TaskTombstone.objects.filter(assignee_id=ID, id__gt=ID).order_by("id").values_list("id", "task_id")[:51]
+
+
+@hot_query("api.token_state")
+def _api_token_state():
+    return token_state_query(ID)[:1]
+
+
+@hot_query("api.reports.superadmin", allow=_ordered_walk("task_status_updated_idx"))
+def _api_reports_superadmin():
+    tasks = Task.objects.filter(status=Task.Status.COMPLETED)
+    return task_report_values.values(tasks).order_by("-updated_at", "-id")[:51]
+
+
+@hot_query("api.reports.admin")
+def _api_reports_admin():
+    tasks = Task.objects.filter(owner_admin_id=ID, status=Task.Status.COMPLETED)
+    return task_report_values.values(tasks).order_by("-updated_at", "-id")[:51]
+
+
+@hot_query("api.due.admin")
+def _api_due_admin():
+    tasks = Task.objects.filter(owner_admin_id=ID)
+    return due.due_tasks(tasks, DAY)[:51]
+
+
+# ---------------- Admin panel ----------------
+@hot_query("panel.tasks.superadmin", allow=_ordered_walk("task_updated_idx"))
+def _panel_tasks_superadmin():
+    return Task.objects.select_related("assigned_to").order_by("-updated_at", "-id")[:50]
+
+
+@hot_query("panel.tasks.superadmin.by_due_date", allow=_ordered_walk("task_due_idx"))
+def _panel_tasks_superadmin_by_due_date():
+    return Task.objects.select_related("assigned_to").order_by("due_date", "id")[:50]
+
+
+@hot_query("panel.tasks.admin")
+def _panel_tasks_admin():
+    tasks = Task.objects.filter(owner_admin_id=ID)
+    return tasks.select_related("assigned_to").order_by("-updated_at", "-id")[:50]
+
+
+@hot_query("panel.tasks.admin.by_due_date")
+def _panel_tasks_admin_by_due_date():
+    tasks = Task.objects.filter(owner_admin_id=ID)
+    return tasks.select_related("assigned_to").order_by("due_date", "id")[:50]
+
+
+@hot_query("panel.tasks.admin.by_status")
+def _panel_tasks_admin_by_status():
+    tasks = Task.objects.filter(owner_admin_id=ID)
+    return tasks.select_related("assigned_to").order_by("status", "updated_at", "id")[:50]
+
+
+@hot_query("panel.assign.admins", allow={
+    r"^USE TEMP B-TREE FOR ORDER BY": "sorts the admins only, found through the role index",
+    r"^SCAN auth_user USING INDEX sqlite_autoindex_auth_user_1": "the planner's pick while users are few",
+})
+def _panel_assign_admins():
+    return User.objects.filter(profile__role=ROLE_ADMIN).order_by("username")
+
+
+@hot_query("panel.assign.users", allow={
+    r"^SCAN auth_user USING INDEX sqlite_autoindex_auth_user_1": "the dropdown lists every USER account",
+    r"^USE TEMP B-TREE FOR ORDER BY": "the dropdown lists every USER account",
+})
+def _panel_assign_users():
+    return User.objects.filter(profile__role=ROLE_USER).order_by("username")
+
+
+@hot_query("panel.task_create.admin_users")
+def _panel_task_create_admin_users():
+    return User.objects.filter(profile__role=ROLE_USER, profile__assigned_admin_id=ID)
+
+
+@hot_query("panel.dashboard.admin", allow={
+    r"^USE TEMP B-TREE FOR GROUP BY": "groups one admin's summary rows: statuses x their users",
+})
+def _panel_dashboard_admin():
+    return (
+        TaskStat.objects.filter(admin_id=ID)
+        .values("admin_id", "admin__username", "status")
+        .annotate(count=Sum("count"), worked_hours=Sum("worked_hours"))
+        .order_by()
+    )
+
+
+@hot_query("panel.dashboard.overdue", allow={
+    r"^USE TEMP B-TREE FOR GROUP BY": "groups overdue open tasks, read from the partial index",
+    r"^SCAN tasks_task USING INDEX task_owner_open_due_idx\b": "reads open tasks only, already grouped by admin",
+})
+def _panel_dashboard_overdue():
+    return (
+        Task.objects.filter(due_date__lt=DAY)
+        .exclude(status=Task.Status.COMPLETED)
+        .values("owner_admin_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+@hot_query("panel.dashboard.overdue.admin")
+def _panel_dashboard_overdue_admin():
+    return (
+        Task.objects.filter(owner_admin_id=ID, due_date__lt=DAY)
+        .exclude(status=Task.Status.COMPLETED)
+        .values("owner_admin_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+# ---------------- Background work ----------------
+@hot_query("due.sweep")
+def _due_sweep():
+    return due.due_tasks(Task.objects.all(), DAY, (DAY, ID)).values_list("id", "due_date")[:1000]
+
+
+@hot_query("stats.assignee_admin")
+def _stats_assignee_admin():
+    return Profile.objects.filter(user_id=ID).values_list("assigned_admin_id", flat=True)[:1]
+
+
+@hot_query("ownership.assignee_admin_changed")
+def _ownership_assignee_admin_changed():
+    # The rows of the UPDATE that moves a user's tasks to their new admin.
+    return Task.objects.filter(assigned_to_id=ID).exclude(owner_admin_id=ID).values_list("id", flat=True)
@@ -0,0 +1,77 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import Task
+
+FTS_TABLE = "tasks_task_fts"
+SEARCH_FIELDS = ("title", "description", "completion_report")
+
+# bm25() column weights, in SEARCH_FIELDS order: a hit in the title counts most.
+FTS_WEIGHTS = (10.0, 1.0, 2.0)
+
+_fts_tables = {}
+
+
+def search_terms(text):
+    return re.findall(r"\w+", text or "")[:16]
+
+
+def fts_available(using=None) -> bool:
+    """True if the FTS5 index created by migration 0006 exists on this database."""
+    connection = connections[using or router.db_for_read(Task)]
+    # Keyed by database name too: the test runner and benchmarks swap it per alias.
+    key = (connection.alias, str(connection.settings_dict["NAME"]))
+    if key not in _fts_tables:
+        _fts_tables[key] = connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[key]
+
+
+def fts_query(terms):
+    """Every term must match, each as a prefix: ["rep", "q3"] -> '"rep"* "q3"*'."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_tasks(queryset, text, backend=None):
+    """
+    Narrow a Task queryset to tasks matching every word of `text` in title,
+    description or completion_report, best match first.
+
+    backend "fts" joins the FTS5 index and orders by bm25() rank; "like" is an
+    icontains scan ordered by recency, used where FTS5 is unavailable. By default the
+    FTS index is used when present.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+
+    if backend is None:
+        backend = "fts" if fts_available(queryset.db) else "like"
+
+    if backend == "fts":
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = tasks_task.id", f"{FTS_TABLE} MATCH %s"],
+            params=[fts_query(terms)],
+            select={"search_rank": f"bm25({FTS_TABLE}, {weights})"},
+            order_by=["search_rank", "-id"],
+        )
+
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term) | Q(completion_report__icontains=term)
+        )
+    return queryset.order_by("-updated_at", "-id")
+
+
+def rebuild_index(using=None):
+    """Re-read every task into the FTS index (after restoring a dump, or to compact it)."""
+    using = using or router.db_for_write(Task)
+    if not fts_available(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return True
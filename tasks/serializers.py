@@ -1,4 +1,12 @@
+import decimal
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+
 from .models import Task
 
 
@@ -34,3 +42,115 @@ class TaskReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ["id", "title", "assigned_to", "status", "completion_report", "worked_hours", "updated_at"]
+
+
+class TaskDueSerializer(serializers.ModelSerializer):
+    assigned_to = serializers.CharField(source="assigned_to.username", read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ["id", "title", "assigned_to", "status", "due_date"]
+
+
+# ---------------- values() fast path ----------------
+def _identity(value):
+    return value
+
+
+def _datetime_converter(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return lambda tz: field.to_representation
+
+    def bind(tz):
+        def convert(value):
+            if tz is not None and value.tzinfo is not None and value.utcoffset() != tz.utcoffset(value):
+                value = value.astimezone(tz)
+            text = value.isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+        return convert
+    return bind
+
+
+def _date_converter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return lambda tz: field.to_representation
+    return lambda tz: date.isoformat
+
+
+def _decimal_converter(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+        return lambda tz: field.to_representation
+
+    exponent = Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+    return lambda tz: convert
+
+
+def _converter_for(field):
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, (serializers.IntegerField, serializers.CharField, serializers.ChoiceField)):
+        return lambda tz: _identity
+    return lambda tz: field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Produces exactly what `serializer_class(many=True).data` would, but from
+    `.values()` rows: no model instances and no per-object DRF field dispatch.
+
+    Converters are compiled once from the serializer's own fields, so declared
+    formats/decimal settings are honoured; fields without a fast converter fall back
+    to their DRF `to_representation`.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._columns = None
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            self._columns = [
+                (name, field.source.replace(".", "__"), _converter_for(field))
+                for name, field in self.serializer_class().fields.items()
+            ]
+        return self._columns
+
+    @property
+    def lookups(self):
+        return [lookup for _, lookup, _ in self.columns]
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def converters(self):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [(name, lookup, bind(tz)) for name, lookup, bind in self.columns]
+
+    def iter_representation(self, rows):
+        converters = self.converters()
+        for row in rows:
+            yield {
+                name: None if row[lookup] is None else convert(row[lookup])
+                for name, lookup, convert in converters
+            }
+
+    def to_representation(self, rows):
+        return list(self.iter_representation(rows))
+
+
+task_list_values = ValuesSerializer(TaskListSerializer)
+task_report_values = ValuesSerializer(TaskReportSerializer)
+task_due_values = ValuesSerializer(TaskDueSerializer)
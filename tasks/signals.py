@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import Profile
+from . import caching, deletion, due, ownership, stats
+from .models import Task, TaskTombstone
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Task)
+def load_task_snapshot(sender, instance: Task, raw=False, using=None, **kwargs):
+    """
+    Stats are updated from the difference to the values this save replaces. Those
+    loaded with the instance may be stale by now (another save of the same task in
+    between would be counted twice), so read them again under a row lock, which
+    Task.save() holds until its transaction commits. Saves that change no stat field
+    skip both, and Task.save() leaves those fields out of the UPDATE.
+    """
+    if raw or not instance.stats_may_change():
+        return
+    instance._loaded_values = (
+        Task.objects.using(using).select_for_update().filter(pk=instance.pk).values(*Task.TRACKED_FIELDS).first()
+        or {}
+    )
+
+
+@receiver(pre_save, sender=Task)
+def set_task_owner_admin(sender, instance: Task, raw=False, **kwargs):
+    """New and reassigned tasks take their assignee's admin (Task.owner_admin)."""
+    if raw:
+        return
+    if instance._state.adding or instance.has_changed("assigned_to_id"):
+        instance.owner_admin_id = ownership.assignee_admin_id(instance)
+
+
+@receiver(post_save, sender=Task)
+def record_reassignment_tombstone(sender, instance: Task, created: bool, raw=False, **kwargs):
+    """
+    A task moved to another user leaves the previous assignee's delta sync like a
+    deleted one. The new assignee gets it as a change, so an older tombstone of theirs
+    for it would contradict that. Runs before stats.task_saved() resets the loaded values.
+    """
+    if raw or created or not instance.has_changed("assigned_to_id"):
+        return
+    previous = instance.loaded_value("assigned_to_id")
+    if previous is not None:
+        TaskTombstone.objects.create(task_id=instance.id, assignee_id=previous)
+    TaskTombstone.objects.filter(task_id=instance.id, assignee_id=instance.assigned_to_id).delete()
+
+
+@receiver(post_save, sender=Task)
+def rewind_overdue_sweep_on_save(sender, instance: Task, created: bool, raw=False, **kwargs):
+    # Before stats.task_saved(), which resets the loaded values.
+    if not raw:
+        due.rewind_overdue_sweep([instance], created=created)
+
+
+@receiver(post_save, sender=Task)
+def update_task_stats_on_save(sender, instance: Task, created: bool, raw=False, **kwargs):
+    if raw:
+        return
+    # Before stats.task_saved(), which resets the loaded values.
+    caching.tasks_changed([instance])
+    stats.task_saved(instance, created=created)
+
+
+@receiver(pre_delete, sender=User)
+def remove_deleted_assignee_tasks(sender, instance, **kwargs):
+    """
+    Tombstones, stats and cache versions for the tasks a user's CASCADE deletes, once
+    for all of them. Deleted tasks are otherwise handled by Task.delete() and
+    TaskQuerySet.delete(); no receiver on Task, so the CASCADE can skip loading them.
+    """
+    deletion.assignee_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def move_tasks_with_admin(sender, instance: Profile, created: bool, **kwargs):
+    """
+    Assigning a user to another admin, or clearing it on a role change, moves their
+    tasks and stats along. Deleting an admin needs nothing here: Task.owner_admin and
+    TaskStat.admin are SET_NULL like Profile.assigned_admin.
+    """
+    if not created and instance.has_changed("assigned_admin_id"):
+        ownership.assignee_admin_changed(instance.user_id, instance.assigned_admin_id)
+        stats.assignee_admin_changed(instance.user_id, instance.assigned_admin_id)
+
+
+# ---------------- View cache versions (tasks.caching) ----------------
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_caches_on_profile_change(sender, instance: Profile, created=False, **kwargs):
+    if caching.enabled():
+        loaded_admin_id = getattr(instance, "_loaded_values", {}).get("assigned_admin_id")
+        caching.user_changed(instance.user_id, {instance.assigned_admin_id, loaded_admin_id})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_caches_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # update_last_login() on every login changes nothing that is rendered.
+    if not caching.enabled() or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    if User.profile.is_cached(instance):
+        admin_id = instance.profile.assigned_admin_id
+    else:
+        # Usernames show in the admin's task table too.
+        admin_id = Profile.objects.filter(user_id=instance.pk).values_list("assigned_admin_id", flat=True).first()
+    caching.user_changed(instance.pk, {admin_id})
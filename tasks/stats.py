@@ -0,0 +1,210 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.permissions import is_admin, is_superadmin
+from .models import Task, TaskStat
+
+ZERO = Decimal("0")
+CENTS = Decimal("0.01")
+
+
+# ---------------- Incremental maintenance ----------------
+def _new_deltas():
+    """{(assignee_id, status): [count delta, worked_hours delta]}"""
+    return defaultdict(lambda: [0, ZERO])
+
+
+def _add(deltas, assignee_id, status, worked_hours, sign):
+    delta = deltas[(assignee_id, status)]
+    delta[0] += sign
+    delta[1] += sign * (worked_hours or ZERO)
+
+
+def task_deltas(task, created=False, deltas=None):
+    """
+    Stat deltas for one saved task: from its loaded values (Task.from_db) to its
+    current ones, or just the current ones for a new task.
+    """
+    deltas = _new_deltas() if deltas is None else deltas
+    if not created:
+        if not any(task.has_changed(field) for field in Task.TRACKED_FIELDS):
+            return deltas
+        _add(
+            deltas,
+            task.loaded_value("assigned_to_id"),
+            task.loaded_value("status"),
+            task.loaded_value("worked_hours"),
+            -1,
+        )
+    _add(deltas, task.assigned_to_id, task.status, task.worked_hours, 1)
+    return deltas
+
+
+def apply_deltas(deltas):
+    """
+    Add `deltas` to TaskStat with one UPDATE per (assignee, status); a missing row is
+    inserted with the assignee's current admin. Rows are never created for a negative
+    delta (e.g. tasks deleted by CASCADE together with their assignee).
+    """
+    for (assignee_id, status), (count, hours) in deltas.items():
+        if not count and not hours:
+            continue
+        rows = TaskStat.objects.filter(assignee_id=assignee_id, status=status)
+        if rows.update(count=F("count") + count, worked_hours=F("worked_hours") + hours) or count <= 0:
+            continue
+
+        admin_id = Profile.objects.filter(user_id=assignee_id).values_list("assigned_admin_id", flat=True).first()
+        try:
+            with transaction.atomic():
+                TaskStat.objects.create(
+                    assignee_id=assignee_id, admin_id=admin_id, status=status, count=count, worked_hours=hours
+                )
+        except IntegrityError:
+            # Created concurrently since our UPDATE.
+            rows.update(count=F("count") + count, worked_hours=F("worked_hours") + hours)
+
+
+def task_saved(task, created=False):
+    apply_deltas(task_deltas(task, created))
+    task.remember_loaded_values()
+
+
+def tasks_deleted(rows):
+    """`rows`: dicts with assigned_to_id, status and worked_hours of deleted tasks."""
+    deltas = _new_deltas()
+    for row in rows:
+        _add(deltas, row["assigned_to_id"], row["status"], row["worked_hours"], -1)
+    apply_deltas(deltas)
+
+
+def assignee_deleted(assignee_id):
+    """
+    Take all tasks of `assignee_id` out of the stats at once, from one grouped
+    query, before they go with their assignee by CASCADE.
+    """
+    deltas = _new_deltas()
+    totals = (
+        Task.objects.filter(assigned_to_id=assignee_id)
+        .order_by()
+        .values("status")
+        .annotate(count=Count("id"), hours=Sum("worked_hours"))
+    )
+    for row in totals:
+        delta = deltas[(assignee_id, row["status"])]
+        delta[0] -= row["count"]
+        delta[1] -= row["hours"] or ZERO
+    apply_deltas(deltas)
+
+
+def tasks_updated(tasks):
+    """
+    Hook for writes that send no signals (QuerySet.bulk_update()): call with the saved
+    instances, which must have been loaded from the database with select_for_update()
+    in the transaction that writes them, or a concurrent save makes the deltas drift.
+    """
+    deltas = _new_deltas()
+    for task in tasks:
+        task_deltas(task, deltas=deltas)
+        task.remember_loaded_values()
+    apply_deltas(deltas)
+
+
+def assignee_admin_changed(assignee_id, admin_id):
+    TaskStat.objects.filter(assignee_id=assignee_id).update(admin_id=admin_id)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute TaskStat from Task. Returns the number of rows written."""
+    TaskStat.objects.all().delete()
+    rows = (
+        Task.objects.values("assigned_to_id", "assigned_to__profile__assigned_admin_id", "status")
+        .annotate(count=Count("id"), worked_hours=Sum("worked_hours"))
+        .order_by()
+    )
+    stats = TaskStat.objects.bulk_create(
+        [
+            TaskStat(
+                assignee_id=row["assigned_to_id"],
+                admin_id=row["assigned_to__profile__assigned_admin_id"],
+                status=row["status"],
+                count=row["count"],
+                worked_hours=row["worked_hours"] or ZERO,
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+    return len(stats)
+
+
+# ---------------- Reading ----------------
+def dashboard_stats(actor):
+    """
+    Per-admin task counts by status, worked hours and overdue counts, or None if
+    `actor` is neither Admin nor SuperAdmin. A SuperAdmin gets every admin (admin_id
+    None collects users without one); an Admin gets their own row only.
+
+    Counts come from TaskStat, i.e. O(assignees x statuses) rows. Overdue depends on
+    today's date, so it is counted live over open tasks with a due date.
+    """
+    if is_superadmin(actor):
+        stats = TaskStat.objects.all()
+        overdue = Task.objects.all()
+    elif is_admin(actor):
+        stats = TaskStat.objects.filter(admin_id=actor.id)
+        overdue = Task.objects.filter(owner_admin_id=actor.id)
+    else:
+        return None
+
+    admins = {}
+
+    def row_for(admin_id, username=None):
+        if admin_id not in admins:
+            admins[admin_id] = {
+                "admin_id": admin_id,
+                "admin": username,
+                "counts": {status: 0 for status in Task.Status.values},
+                "overdue": 0,
+                "worked_hours": ZERO,
+            }
+        return admins[admin_id]
+
+    if not is_superadmin(actor):
+        row_for(actor.id, actor.username)
+
+    totals = (
+        stats.values("admin_id", "admin__username", "status")
+        .annotate(count=Sum("count"), worked_hours=Sum("worked_hours"))
+        .order_by()
+    )
+    for total in totals:
+        row = row_for(total["admin_id"], total["admin__username"])
+        row["counts"][total["status"]] += total["count"]
+        row["worked_hours"] += total["worked_hours"] or ZERO
+
+    overdue_counts = (
+        overdue.filter(due_date__lt=timezone.localdate())
+        .exclude(status=Task.Status.COMPLETED)
+        .values("owner_admin_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for total in overdue_counts:
+        row_for(total["owner_admin_id"])["overdue"] = total["count"]
+
+    rows = sorted(admins.values(), key=lambda row: (row["admin"] is None, row["admin"] or ""))
+    for row in rows:
+        # SQLite sums decimals as floats.
+        row["worked_hours"] = row["worked_hours"].quantize(CENTS)
+    summary = {
+        "counts": {status: sum(row["counts"][status] for row in rows) for status in Task.Status.values},
+        "overdue": sum(row["overdue"] for row in rows),
+        "worked_hours": sum((row["worked_hours"] for row in rows), ZERO),
+    }
+    return {"admins": rows, "totals": summary}
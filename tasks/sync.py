@@ -0,0 +1,66 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, TaskTombstone
+from .pagination import decode_cursor, encode_cursor
+
+
+def parse_sync_token(token: str) -> dict:
+    """
+    An empty token means "from the beginning" (initial sync).
+    Raises ValueError for tokens we did not issue.
+    """
+    if not token:
+        return {"u": None, "i": 0, "d": 0}
+
+    position = decode_cursor(token)
+    try:
+        updated_at = position["u"]
+        if updated_at is not None and parse_datetime(updated_at) is None:
+            raise ValueError("Malformed sync token.")
+        return {"u": updated_at, "i": int(position["i"]), "d": int(position["d"])}
+    except (KeyError, TypeError) as e:
+        raise ValueError("Malformed sync token.") from e
+
+
+def changes_since(user_id, token: str, limit: int, row_serializer) -> dict:
+    """
+    Tasks created/changed and tasks deleted for `user_id` after `token`.
+    Changed tasks are fetched as `row_serializer.values()` rows.
+
+    Changes are walked in (updated_at, id) order on the assignee index and deletions
+    in tombstone id order, each capped at `limit`; `has_more` tells the client to call
+    again with `next_token` straight away.
+    """
+    position = parse_sync_token(token)
+
+    changed = Task.objects.filter(assigned_to_id=user_id)
+    if position["u"] is not None:
+        updated_at = parse_datetime(position["u"])
+        changed = changed.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=position["i"])
+        )
+    changed = list(row_serializer.values(changed.order_by("updated_at", "id"))[: limit + 1])
+
+    deleted = list(
+        TaskTombstone.objects.filter(assignee_id=user_id, id__gt=position["d"])
+        .order_by("id")
+        .values_list("id", "task_id")[: limit + 1]
+    )
+
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    next_position = dict(position)
+    if changed:
+        next_position["u"] = changed[-1]["updated_at"].isoformat()
+        next_position["i"] = changed[-1]["id"]
+    if deleted:
+        next_position["d"] = deleted[-1][0]
+
+    return {
+        "changed": row_serializer.to_representation(changed),
+        "deleted": [task_id for _, task_id in deleted],
+        "next_token": encode_cursor(next_position),
+        "has_more": has_more,
+    }
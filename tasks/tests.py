@@ -1,3 +1,1304 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.core.paginator import EmptyPage
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from django.utils.http import http_date
+
+from accounts.constants import ROLE_ADMIN, ROLE_SUPERADMIN
+from adminpanel.pagination import EstimatedCountPaginator
+from accounts.serializers import RoleTokenObtainPairSerializer
+from config.routers import mark_recent_write
+from . import caching, due, ownership, query_plans, stats
+from .management.commands.benchmark import Command as Benchmark
+from .exports import EXPORT_FIELDS, EXPORT_FORMATS
+from .models import Task, TaskReminder, TaskStat, TaskTombstone
+from .pagination import encode_cursor
+from .search import fts_available, search_tasks
+from .serializers import TaskListSerializer, TaskReportSerializer, task_list_values, task_report_values
+
+User = get_user_model()
+
+
+class ValuesSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("parity", password="pass123")
+        Task.objects.create(title="Pending, no due date", assigned_to=user)
+        Task.objects.create(
+            title="Completed",
+            description="Multi\nline",
+            assigned_to=user,
+            due_date=date(2030, 1, 31),
+            status=Task.Status.COMPLETED,
+            completion_report="Done",
+            worked_hours=Decimal("7.5"),
+        )
+        Task.objects.create(
+            title="Whole hours",
+            assigned_to=user,
+            status=Task.Status.IN_PROGRESS,
+            worked_hours=Decimal("12"),
+        )
+
+    def assertParity(self, serializer_class, values_serializer, queryset):
+        expected = serializer_class(queryset, many=True).data
+        actual = values_serializer.to_representation(values_serializer.values(queryset))
+        self.assertEqual([dict(row) for row in expected], actual)
+
+    def test_task_list_parity(self):
+        self.assertParity(TaskListSerializer, task_list_values, Task.objects.order_by("id"))
+
+    def test_task_report_parity(self):
+        queryset = Task.objects.select_related("assigned_to").order_by("id")
+        self.assertParity(TaskReportSerializer, task_report_values, queryset)
+
+    def test_parity_in_non_utc_timezone(self):
+        with timezone.override("Asia/Kolkata"):
+            self.assertParity(TaskListSerializer, task_list_values, Task.objects.order_by("id"))
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class KeysetPaginationTests(TestCase):
+    """GET /api/tasks/: {next, results} pages walked by opaque cursors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("page-user")
+        cls.other = User.objects.create_user("page-other")
+        cls.tasks = [Task.objects.create(title=f"Task {i}", assigned_to=cls.user) for i in range(5)]
+        Task.objects.create(title="Not mine", assigned_to=cls.other)
+
+    def setUp(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+    def walk(self, page_size):
+        """Ids of every page, following the next links."""
+        pages = []
+        url = f"/api/tasks/?page_size={page_size}"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(set(body), {"next", "results"})
+            pages.append([task["id"] for task in body["results"]])
+            url = body["next"]
+        return pages
+
+    def newest_first(self):
+        return list(
+            Task.objects.filter(assigned_to=self.user).order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_cursor_round_trip(self):
+        pages = self.walk(2)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), self.newest_first())
+
+    def test_ties_on_updated_at(self):
+        Task.objects.filter(assigned_to=self.user).update(updated_at=timezone.now())
+        pages = self.walk(2)
+        self.assertEqual(sum(pages, []), sorted((task.id for task in self.tasks), reverse=True))
+
+    def test_exact_last_page_has_no_next(self):
+        self.assertEqual([len(page) for page in self.walk(5)], [5])
+
+    def test_invalid_cursors(self):
+        for cursor in ["garbage!", "bm90LWpzb24", encode_cursor({"u": "yesterday", "i": 1}), encode_cursor({"i": 1})]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/tasks/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {"detail": "Invalid cursor."})
+
+    def test_page_size_bounds(self):
+        self.assertEqual(len(self.client.get("/api/tasks/?page_size=0").json()["results"]), 5)
+        self.assertEqual(len(self.client.get("/api/tasks/?page_size=abc").json()["results"]), 5)
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class TaskReportListTests(TestCase):
+    """GET /api/tasks/reports/: scoped to the caller's users, filtered, cursor-paginated."""
+
+    @classmethod
+    def setUpTestData(cls):
+        def admin_with_user(name):
+            admin = User.objects.create_user(f"{name}-admin")
+            admin.profile.role = ROLE_ADMIN
+            admin.profile.save()
+            user = User.objects.create_user(f"{name}-user")
+            user.profile.assigned_admin = admin
+            user.profile.save()
+            return admin, user
+
+        cls.admin, cls.user = admin_with_user("reports")
+        cls.other_admin, cls.other_user = admin_with_user("reports-other")
+        cls.second_user = User.objects.create_user("reports-user-2")
+        cls.second_user.profile.assigned_admin = cls.admin
+        cls.second_user.profile.save()
+
+        def task(title, assignee, day, status=Task.Status.COMPLETED):
+            done = status == Task.Status.COMPLETED
+            task = Task.objects.create(
+                title=title, assigned_to=assignee, status=status,
+                completion_report="ok" if done else "", worked_hours=Decimal("1") if done else None,
+            )
+            Task.objects.filter(pk=task.pk).update(
+                updated_at=timezone.make_aware(timezone.datetime(2030, 1, day, 12))
+            )
+            return task
+
+        task("Done 1", cls.user, 1)
+        task("Done 2", cls.user, 2)
+        task("Done 3", cls.second_user, 3)
+        task("Open", cls.user, 4, status=Task.Status.IN_PROGRESS)
+        task("Other admin's", cls.other_user, 5)
+
+    def get(self, actor, **params):
+        token = RoleTokenObtainPairSerializer.get_token(actor).access_token
+        return self.client.get("/api/tasks/reports/", params, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def titles(self, actor, **params):
+        response = self.get(actor, **params)
+        self.assertEqual(response.status_code, 200)
+        return [task["title"] for task in response.json()["results"]]
+
+    def test_completed_and_scoped_to_admin(self):
+        self.assertEqual(self.titles(self.admin), ["Done 3", "Done 2", "Done 1"])
+        self.assertEqual(self.titles(self.other_admin), ["Other admin's"])
+        # Another admin's user cannot be reached through ?user= either.
+        self.assertEqual(self.titles(self.admin, user=self.other_user.id), [])
+        self.assertEqual(self.get(self.user).status_code, 403)
+
+    def test_superadmin_sees_all(self):
+        superadmin = User.objects.create_user("reports-superadmin")
+        superadmin.profile.role = ROLE_SUPERADMIN
+        superadmin.profile.save()
+        self.assertEqual(self.titles(superadmin), ["Other admin's", "Done 3", "Done 2", "Done 1"])
+
+    def test_filters(self):
+        self.assertEqual(self.titles(self.admin, status="IN_PROGRESS"), ["Open"])
+        self.assertEqual(self.titles(self.admin, user=self.second_user.id), ["Done 3"])
+        self.assertEqual(self.titles(self.admin, updated_from="2030-01-02"), ["Done 3", "Done 2"])
+        self.assertEqual(self.titles(self.admin, updated_to="2030-01-02"), ["Done 2", "Done 1"])
+        self.assertEqual(
+            self.titles(self.admin, updated_from="2030-01-02", updated_to="2030-01-02", user=self.user.id),
+            ["Done 2"],
+        )
+        self.assertEqual(self.get(self.admin, status="BOGUS").status_code, 400)
+        self.assertEqual(self.get(self.admin, updated_from="yesterday").status_code, 400)
+
+    def test_cursor_pages(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.admin).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        def walk(url):
+            pages = []
+            while url:
+                body = self.client.get(url).json()
+                pages.append([task["title"] for task in body["results"]])
+                url = body["next"]
+            return pages
+
+        self.assertEqual(walk("/api/tasks/reports/?page_size=2"), [["Done 3", "Done 2"], ["Done 1"]])
+        # Filters carry over into the next links.
+        self.assertEqual(walk(f"/api/tasks/reports/?page_size=1&user={self.user.id}"), [["Done 2"], ["Done 1"]])
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class TaskReportExportTests(TestCase):
+    """GET /api/tasks/reports/export/ and `manage.py export_reports`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("export-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.other_admin = User.objects.create_user("export-admin-2")
+        cls.other_admin.profile.role = ROLE_ADMIN
+        cls.other_admin.profile.save()
+        user = User.objects.create_user("export-user")
+        user.profile.assigned_admin = cls.admin
+        user.profile.save()
+
+        def done(title, report="ok"):
+            return Task.objects.create(
+                title=title, assigned_to=user, status=Task.Status.COMPLETED,
+                completion_report=report, worked_hours=Decimal("1.50"),
+            )
+
+        cls.tasks = [done("Plain"), done("=HYPERLINK(\"http://x\")", report="@SUM(A1)\nsecond line")]
+        Task.objects.create(title="Open", assigned_to=user)
+
+    def export(self, actor=None, **params):
+        token = RoleTokenObtainPairSerializer.get_token(actor or self.admin).access_token
+        response = self.client.get("/api/tasks/reports/export/", params, HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="task-reports.csv"', response["Content-Disposition"])
+
+        rows = list(csv.reader(StringIO(body.decode())))
+        self.assertEqual(rows[0], EXPORT_FIELDS)
+        self.assertEqual([row[:2] for row in rows[1:]], [
+            [str(self.tasks[0].id), "Plain"],
+            # Formula-like text is neutralised for spreadsheets.
+            [str(self.tasks[1].id), "'=HYPERLINK(\"http://x\")"],
+        ])
+        self.assertEqual(rows[2][2:6], ["export-user", "COMPLETED", "'@SUM(A1)\nsecond line", "1.50"])
+
+    def test_ndjson(self):
+        response, body = self.export(output="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([line["id"] for line in lines], [task.id for task in self.tasks])
+        self.assertEqual(set(lines[0]), set(EXPORT_FIELDS))
+        # Only CSV cells are escaped: JSON values are data, not formulas.
+        self.assertEqual(lines[1]["title"], '=HYPERLINK("http://x")')
+
+    def test_gzip(self):
+        for output in EXPORT_FORMATS:
+            with self.subTest(output):
+                _, plain = self.export(output=output)
+                response, body = self.export(output=output, compress="gzip")
+                self.assertEqual(response["Content-Type"], "application/gzip")
+                self.assertEqual(gzip.decompress(body), plain)
+
+    def test_scoped_per_admin(self):
+        _, body = self.export(self.other_admin)
+        self.assertEqual(body.decode().splitlines(), [",".join(EXPORT_FIELDS)])
+
+        user = User.objects.get(username="export-user")
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+        response = self.client.get("/api/tasks/reports/export/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 403)
+
+    def test_bad_format(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.admin).access_token
+        response = self.client.get("/api/tasks/reports/export/", {"output": "xml"}, HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 400)
+
+    def test_command(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "reports.ndjson.gz"
+        _, expected = self.export(output="ndjson")
+
+        call_command("export_reports", output="ndjson", gzip=True, file=str(path), as_user="export-admin",
+                     stderr=StringIO())
+        self.assertEqual(gzip.decompress(path.read_bytes()), expected)
+
+        call_command("export_reports", output="ndjson", file=str(path), as_user="export-admin-2",
+                     stderr=StringIO())
+        self.assertEqual(path.read_bytes(), b"")
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class ConditionalRequestTests(TestCase):
+    """ETag / Last-Modified validators and 304s on the task list and report."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("etag-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.user = User.objects.create_user("etag-user")
+        cls.user.profile.assigned_admin = cls.admin
+        cls.user.profile.save()
+        cls.task = Task.objects.create(
+            title="Done", assigned_to=cls.user, status=Task.Status.COMPLETED,
+            completion_report="ok", worked_hours=Decimal("1.0"),
+        )
+
+    def get(self, url, user, **headers):
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+        return self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}", **headers)
+
+    def test_task_list_validators(self):
+        response = self.get("/api/tasks/", self.user)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Authorization", response["Vary"])
+        self.assertIn("private", response["Cache-Control"])
+        etag = response["ETag"]
+        # Collections are validated by the ETag only (see tasks.conditional.queryset_etag).
+        self.assertNotIn("Last-Modified", response)
+
+        self.assertEqual(self.get("/api/tasks/", self.user, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Task.objects.create(title="New", assigned_to=self.user)
+        response = self.get("/api/tasks/", self.user, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_delete_of_an_older_task_is_not_modified_since(self):
+        older = Task.objects.create(title="Older", assigned_to=self.user)
+        Task.objects.create(title="Newest", assigned_to=self.user)
+        response = self.get("/api/tasks/", self.user)
+        etag, since = response["ETag"], http_date(time.time() + 60)
+
+        older.delete()
+
+        response = self.get("/api/tasks/", self.user, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Older", [task["title"] for task in response.json()["results"]])
+        self.assertEqual(self.get("/api/tasks/", self.user, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_report_etag_follows_assignee_username(self):
+        url = f"/api/tasks/{self.task.id}/report/"
+        response = self.get(url, self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Authorization", response["Vary"])
+        etag = response["ETag"]
+        self.assertEqual(self.get(url, self.admin, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.user.username = "etag-user-renamed"
+        self.user.save()
+        response = self.get(url, self.admin, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assigned_to"], "etag-user-renamed")
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class DeltaSyncTests(TestCase):
+    """GET /api/tasks/?since=<token>: changes and deletions after a token, in pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("sync-user")
+        cls.other = User.objects.create_user("sync-other")
+        cls.tasks = [Task.objects.create(title=f"Task {i}", assigned_to=cls.user) for i in range(3)]
+
+    def sync(self, token="", user=None, page_size=50):
+        token_for = RoleTokenObtainPairSerializer.get_token(user or self.user).access_token
+        response = self.client.get(
+            "/api/tasks/", {"since": token, "page_size": page_size}, HTTP_AUTHORIZATION=f"Bearer {token_for}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sync_all(self, token="", user=None, page_size=50):
+        """(changed ids, deleted ids, last token), following has_more."""
+        changed, deleted = [], []
+        while True:
+            body = self.sync(token, user, page_size)
+            changed += [task["id"] for task in body["results"]]
+            deleted += body["deleted"]
+            token = body["next_token"]
+            if not body["has_more"]:
+                return changed, deleted, token
+
+    def test_initial_sync_in_pages(self):
+        body = self.sync(page_size=2)
+        self.assertEqual(len(body["results"]), 2)
+        self.assertTrue(body["has_more"])
+
+        changed, deleted, token = self.sync_all(page_size=2)
+        self.assertEqual(changed, [task.id for task in self.tasks])
+        self.assertEqual(deleted, [])
+        self.assertEqual(self.sync(token)["results"], [])
+
+    def test_changes_and_deletions_after_token(self):
+        _, _, token = self.sync_all()
+        self.tasks[1].title = "Renamed"
+        self.tasks[1].save()
+        Task.objects.filter(pk=self.tasks[2].pk).delete()
+
+        changed, deleted, token = self.sync_all(token, page_size=1)
+        self.assertEqual(changed, [self.tasks[1].id])
+        self.assertEqual(deleted, [self.tasks[2].id])
+        self.assertEqual(self.sync_all(token)[:2], ([], []))
+
+    def test_reassignment_leaves_previous_assignees_sync(self):
+        _, _, token = self.sync_all()
+        _, _, other_token = self.sync_all(user=self.other)
+
+        task = Task.objects.get(pk=self.tasks[0].pk)
+        task.assigned_to = self.other
+        task.save()
+        self.assertEqual(self.sync_all(token)[:2], ([], [task.id]))
+        self.assertEqual(self.sync_all(other_token, user=self.other)[:2], ([task.id], []))
+
+        # Moved back: a change for the first user again, and no stale deletion.
+        _, _, token = self.sync_all(token)
+        task.assigned_to = self.user
+        task.save()
+        self.assertEqual(self.sync_all(token)[:2], ([task.id], []))
+        self.assertEqual(TaskTombstone.objects.filter(task_id=task.id, assignee_id=self.user.id).count(), 0)
+
+    def test_invalid_token(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        response = self.client.get("/api/tasks/", {"since": "garbage!"}, HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"since": "Invalid sync token."})
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[], TASKS_BATCH_MAX_ITEMS=3)
+class TaskBatchUpdateTests(TestCase):
+    """PUT /api/tasks/batch/: per-item results, own tasks only, bounded size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("batch-user")
+        cls.other = User.objects.create_user("batch-other")
+        cls.tasks = [Task.objects.create(title=f"Task {i}", assigned_to=cls.user) for i in range(2)]
+        cls.foreign = Task.objects.create(title="Not mine", assigned_to=cls.other)
+
+    def put(self, items):
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        return self.client.put(
+            "/api/tasks/batch/", items, content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+    def status_of(self, task):
+        return Task.objects.get(pk=task.pk).status
+
+    def test_partial_success(self):
+        response = self.put([
+            {"id": self.tasks[0].id, "status": "IN_PROGRESS"},
+            {"id": self.tasks[1].id, "status": "COMPLETED"},  # needs a report and hours
+            {"id": self.foreign.id, "status": "IN_PROGRESS"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([result["ok"] for result in results], [True, False, False])
+        self.assertEqual(results[0]["task"]["status"], "IN_PROGRESS")
+        self.assertIn("completion_report", results[1]["errors"])
+        self.assertEqual(results[2]["errors"], {"detail": "Not found."})
+
+        self.assertEqual(self.status_of(self.tasks[0]), "IN_PROGRESS")
+        self.assertEqual(self.status_of(self.tasks[1]), "PENDING")
+        self.assertEqual(self.status_of(self.foreign), "PENDING")
+
+    def test_malformed_batches(self):
+        for items in [[], {"id": self.tasks[0].id}, [{"status": "IN_PROGRESS"}], ["x"],
+                      [{"id": "1"}], [{"id": True, "status": "IN_PROGRESS"}]]:
+            with self.subTest(items=items):
+                response = self.put(items)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual({self.status_of(task) for task in self.tasks}, {"PENDING"})
+
+    def test_item_cap(self):
+        response = self.put([{"id": self.tasks[0].id, "status": "IN_PROGRESS"}] * 4)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "At most 3 tasks per batch."})
+        self.assertEqual(self.status_of(self.tasks[0]), "PENDING")
+
+
+@override_settings(REQUEST_METRICS=True, VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class RequestMetricsTests(TestCase):
+    """config.middleware.RequestMetricsMiddleware reports every request's queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("metrics")
+        for n in range(2):
+            Task.objects.create(title=f"Metrics {n}", assigned_to=cls.user, due_date=date(2030, 1, 1))
+
+    def get(self, path, **params):
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        return self.client.get(path, params, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_outermost(self):
+        self.assertEqual(settings.MIDDLEWARE[0], "config.middleware.RequestMetricsMiddleware")
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=60_000)
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs("config.middleware", "INFO") as logs:
+            response = self.get("/api/tasks/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        record = json.loads(logs.records[0].getMessage().removeprefix("request "))
+        self.assertEqual(record["path"], "/api/tasks/")
+        self.assertEqual(record["user_id"], self.user.id)
+        self.assertGreater(record["queries"], 0)
+        self.assertIn(f'desc="{record["queries"]} queries"', response["Server-Timing"])
+        self.assertNotIn("sql", record)
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_request_logs_sql_without_params(self):
+        with self.assertLogs("config.middleware", "WARNING") as logs:
+            self.get("/api/tasks/search/", q="hunter2")
+
+        message = logs.records[0].getMessage()
+        self.assertTrue(message.startswith("slow request "))
+        record = json.loads(message.removeprefix("slow request "))
+        self.assertTrue(record["sql"])
+        self.assertEqual(set(record["sql"][0]), {"alias", "sql", "ms"})
+        self.assertNotIn("hunter2", message)
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[])
+class RequestProfilerTests(TestCase):
+    """config.middleware.RequestProfilerMiddleware: superadmins only, capped."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = User.objects.create_user("profiler-superadmin")
+        cls.superadmin.profile.role = ROLE_SUPERADMIN
+        cls.superadmin.profile.save()
+        cls.admin = User.objects.create_user("profiler-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+
+    def setUp(self):
+        self.directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(self.settings(REQUEST_PROFILER_DIR=self.directory, REQUEST_PROFILER_MIN_INTERVAL=0))
+
+    def get(self, user=None, mode="cprofile", **headers):
+        if user is not None:
+            token = RoleTokenObtainPairSerializer.get_token(user).access_token
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return self.client.get("/api/tasks/reports/", HTTP_X_PROFILE=mode, **headers)
+
+    def files(self):
+        return sorted(path.suffix for path in self.directory.iterdir())
+
+    def test_not_for_other_users(self):
+        responses = [
+            self.get(self.admin),
+            self.get(HTTP_AUTHORIZATION="Bearer forged.token.value"),
+            self.client.get("/api/tasks/reports/?_profile=cprofile"),
+        ]
+        self.client.force_login(self.admin)
+        responses.append(self.client.get("/panel/tasks/", HTTP_X_PROFILE="cprofile"))
+
+        for response in responses:
+            self.assertNotIn("X-Profile", response)
+        self.assertEqual(self.files(), [])
+
+    def test_superadmin_profiles(self):
+        response = self.get(self.superadmin)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["X-Profile"].endswith(".prof"))
+        self.assertTrue((self.directory / response["X-Profile"]).stat().st_size)
+
+        response = self.get(self.superadmin, mode="sample")
+        self.assertTrue(response["X-Profile"].endswith(".collapsed"))
+
+        self.client.force_login(self.superadmin)
+        response = self.client.get("/panel/tasks/?_profile=cprofile")
+        self.assertTrue(response["X-Profile"].endswith(".prof"))
+        self.assertEqual(self.files(), [".collapsed", ".prof", ".prof"])
+
+        self.assertNotIn("X-Profile", self.get(self.superadmin, mode="bogus"))
+
+    def test_min_interval(self):
+        self.enterContext(self.settings(REQUEST_PROFILER_MIN_INTERVAL=60))
+        self.assertTrue(self.get(self.superadmin)["X-Profile"].endswith(".prof"))
+        response = self.get(self.superadmin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Profile"], "rate-limited")
+        self.assertEqual(self.files(), [".prof"])
+
+    def test_max_files(self):
+        self.enterContext(self.settings(REQUEST_PROFILER_MAX_FILES=1))
+        self.get(self.superadmin)
+        self.assertEqual(self.get(self.superadmin)["X-Profile"], "rate-limited")
+        self.assertEqual(self.files(), [".prof"])
+
+    def test_off_without_a_directory(self):
+        self.enterContext(self.settings(REQUEST_PROFILER_DIR=None))
+        self.assertNotIn("X-Profile", self.get(self.superadmin))
+
+
+class TaskStatTests(TestCase):
+    """The incrementally maintained TaskStat rows must always equal a full rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("stats-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.other_admin = User.objects.create_user("stats-admin-2")
+        cls.other_admin.profile.role = ROLE_ADMIN
+        cls.other_admin.profile.save()
+        cls.user = User.objects.create_user("stats-user")
+        cls.user.profile.assigned_admin = cls.admin
+        cls.user.profile.save()
+
+    def snapshot(self):
+        return sorted(
+            TaskStat.objects.filter(count__gt=0).values_list("assignee_id", "admin_id", "status", "count", "worked_hours")
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        stats.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_create_update_delete(self):
+        task = Task.objects.create(title="a", assigned_to=self.user)
+        Task.objects.create(title="b", assigned_to=self.user, status=Task.Status.IN_PROGRESS)
+        self.assertMatchesRebuild()
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = Task.Status.COMPLETED
+        task.worked_hours = Decimal("3.25")
+        task.save()
+        self.assertMatchesRebuild()
+
+        Task.objects.filter(pk=task.pk).delete()
+        self.assertMatchesRebuild()
+
+        other = Task.objects.get(title="b")
+        other_id = other.id
+        other.delete()
+        self.assertMatchesRebuild()
+        self.assertEqual(
+            set(TaskTombstone.objects.values_list("task_id", "assignee_id")),
+            {(task.id, self.user.id), (other_id, self.user.id)},
+        )
+
+    def test_assignee_deletion_does_not_touch_tasks_one_by_one(self):
+        def delete_user_with_tasks(username, count):
+            user = User.objects.create_user(username)
+            user.profile.assigned_admin = self.admin
+            user.profile.save()
+            ids = {Task.objects.create(title=str(i), assigned_to=user, worked_hours=1).id for i in range(count)}
+            user_id, user = user.pk, User.objects.get(pk=user.pk)
+            with CaptureQueriesContext(connection) as queries:
+                user.delete()
+            self.assertEqual(set(TaskTombstone.objects.filter(assignee_id=user_id).values_list("task_id", flat=True)), ids)
+            return len(queries)
+
+        Task.objects.create(title="kept", assigned_to=self.user, worked_hours=2)
+        self.assertEqual(delete_user_with_tasks("few-tasks", 2), delete_user_with_tasks("many-tasks", 20))
+        self.assertFalse(Task.objects.exclude(assigned_to=self.user).exists())
+        self.assertMatchesRebuild()
+
+    def test_admin_reassignment_moves_rows(self):
+        Task.objects.create(title="a", assigned_to=self.user)
+
+        profile = self.user.profile
+        profile.assigned_admin = self.other_admin
+        profile.save()
+
+        self.assertEqual(set(TaskStat.objects.values_list("admin_id", flat=True)), {self.other_admin.id})
+        self.assertMatchesRebuild()
+
+    def test_stale_instances(self):
+        task = Task.objects.create(title="a", assigned_to=self.user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+
+        # Both were loaded as PENDING; the second save replaces COMPLETED, not PENDING.
+        first.status = Task.Status.COMPLETED
+        first.worked_hours = Decimal("2")
+        first.save()
+        second.status = Task.Status.IN_PROGRESS
+        second.save()
+
+        self.assertMatchesRebuild()
+
+    def test_saves_that_change_no_stat_field(self):
+        task = Task.objects.create(title="a", assigned_to=self.user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+
+        first.status = Task.Status.COMPLETED
+        first.save()
+        # No re-read of the loaded values, and the stale status is not written back.
+        second.title = "b"
+        with self.assertNumQueries(1):
+            second.save()
+
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.status), ("b", Task.Status.COMPLETED))
+        self.assertMatchesRebuild()
+
+    def test_batch_update(self):
+        tasks = [Task.objects.create(title=str(i), assigned_to=self.user) for i in range(3)]
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        response = self.client.put(
+            "/api/tasks/batch/",
+            [
+                {"id": tasks[0].id, "status": "IN_PROGRESS"},
+                {"id": tasks[1].id, "status": "COMPLETED", "completion_report": "ok", "worked_hours": "2.5"},
+            ],
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            dict(Task.objects.filter(pk__in=[t.pk for t in tasks]).values_list("title", "status")),
+            {"0": "IN_PROGRESS", "1": "COMPLETED", "2": "PENDING"},
+        )
+        self.assertEqual(
+            self.snapshot(),
+            [
+                (self.user.id, self.admin.id, "COMPLETED", 1, Decimal("2.5")),
+                (self.user.id, self.admin.id, "IN_PROGRESS", 1, Decimal("0")),
+                (self.user.id, self.admin.id, "PENDING", 1, Decimal("0")),
+            ],
+        )
+        self.assertMatchesRebuild()
+
+    def test_dashboard_stats(self):
+        yesterday = timezone.localdate() - timezone.timedelta(days=1)
+        Task.objects.create(title="late", assigned_to=self.user, due_date=yesterday)
+        Task.objects.create(
+            title="done", assigned_to=self.user, due_date=yesterday,
+            status=Task.Status.COMPLETED, worked_hours=Decimal("1.5"),
+        )
+
+        summary = stats.dashboard_stats(self.admin)
+        self.assertEqual(len(summary["admins"]), 1)
+        self.assertEqual(summary["totals"]["counts"], {"PENDING": 1, "IN_PROGRESS": 0, "COMPLETED": 1})
+        self.assertEqual(summary["totals"]["overdue"], 1)
+        self.assertEqual(summary["totals"]["worked_hours"], Decimal("1.5"))
+
+        self.assertIsNone(stats.dashboard_stats(self.user))
+
+        superadmin = User.objects.create_user("stats-superadmin")
+        superadmin.profile.role = ROLE_SUPERADMIN
+        superadmin.profile.save()
+        self.assertEqual(stats.dashboard_stats(User.objects.get(pk=superadmin.pk))["totals"]["overdue"], 1)
+
+
+class TaskOwnerAdminTests(TestCase):
+    """Task.owner_admin follows the assignee's Profile.assigned_admin."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("owner-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.other_admin = User.objects.create_user("owner-admin-2")
+        cls.other_admin.profile.role = ROLE_ADMIN
+        cls.other_admin.profile.save()
+        cls.user = User.objects.create_user("owner-user")
+        cls.user.profile.assigned_admin = cls.admin
+        cls.user.profile.save()
+
+    def owners(self):
+        return set(Task.objects.values_list("owner_admin_id", flat=True))
+
+    def test_set_on_create_and_reassignment(self):
+        task = Task.objects.create(title="a", assigned_to=self.user)
+        self.assertEqual(task.owner_admin_id, self.admin.id)
+
+        task.assigned_to = self.admin
+        task.save()
+        self.assertIsNone(Task.objects.get(pk=task.pk).owner_admin_id)
+
+    def test_follows_admin_changes(self):
+        Task.objects.create(title="a", assigned_to=self.user)
+        Task.objects.create(title="b", assigned_to=self.user)
+
+        profile = self.user.profile
+        profile.assigned_admin = self.other_admin
+        profile.save()
+        self.assertEqual(self.owners(), {self.other_admin.id})
+
+        # A role change clears the assignment.
+        profile.role = ROLE_ADMIN
+        profile.assigned_admin = None
+        profile.save()
+        self.assertEqual(self.owners(), {None})
+
+    def test_admin_deletion(self):
+        Task.objects.create(title="a", assigned_to=self.user)
+        User.objects.filter(pk=self.admin.pk).delete()
+        self.assertEqual(self.owners(), {None})
+        self.assertFalse(ownership.mismatched_tasks().exists())
+
+    def test_admin_sees_only_owned_tasks(self):
+        task = Task.objects.create(title="owned task", assigned_to=self.user)
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(f"/panel/tasks/{task.id}/"), "owned task")
+        self.client.force_login(self.other_admin)
+        self.assertEqual(self.client.get(f"/panel/tasks/{task.id}/").status_code, 403)
+
+    def test_check_and_backfill(self):
+        Task.objects.create(title="a", assigned_to=self.user)
+        Task.objects.create(title="b", assigned_to=self.user)
+        Task.objects.update(owner_admin=self.other_admin)
+
+        with self.assertRaisesMessage(CommandError, "2 tasks have a stale owner_admin."):
+            call_command("check_task_owner_admin", stdout=StringIO())
+
+        call_command("backfill_task_owner_admin", "--chunk-size", "1", "--only-mismatched", stdout=StringIO())
+        self.assertEqual(self.owners(), {self.admin.id})
+        call_command("check_task_owner_admin", stdout=StringIO())
+
+
+class TaskSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("search-user")
+        Task.objects.create(title="Quarterly report", description="numbers", assigned_to=cls.user)
+        Task.objects.create(title="Fix login", description="The report page crashes", assigned_to=cls.user)
+        Task.objects.bulk_create([Task(title="Reporting backlog", assigned_to=cls.user)])
+
+    def titles(self, text, backend=None):
+        return {task.title for task in search_tasks(Task.objects.all(), text, backend=backend)}
+
+    def test_backends_agree(self):
+        for text in ["report", "report page", "quarterly", "missing", ""]:
+            with self.subTest(text=text):
+                self.assertEqual(self.titles(text, "like"), self.titles(text))
+
+    def test_index_follows_writes(self):
+        if not fts_available():
+            self.skipTest("FTS5 index not available on this database")
+        task = Task.objects.get(title="Quarterly report")
+        task.title = "Annual plan"
+        task.save()
+        Task.objects.filter(title="Fix login").delete()
+
+        self.assertEqual(self.titles("quarterly", "fts"), set())
+        self.assertEqual(self.titles("annual", "fts"), {"Annual plan"})
+        self.assertEqual(self.titles("crashes", "fts"), set())
+        self.assertEqual(self.titles("report", "fts"), {"Reporting backlog"})
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=300, DATABASE_REPLICAS=[])
+class ViewCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cache-user")
+        cls.task = Task.objects.create(title="Before", assigned_to=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        caching.reset_counters()
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.auth = f"Bearer {token}"
+        self.client.defaults["HTTP_AUTHORIZATION"] = self.auth
+
+    def titles(self):
+        return [task["title"] for task in self.client.get("/api/tasks/").json()["results"]]
+
+    def test_task_list_is_cached_until_a_task_changes(self):
+        self.assertEqual(self.titles(), ["Before"])
+        with self.assertNumQueries(1):  # token version only
+            self.assertEqual(self.titles(), ["Before"])
+
+        self.task.title = "After"
+        self.task.save()
+        self.assertEqual(self.titles(), ["After"])
+
+        self.client.put("/api/tasks/batch/", [{"id": self.task.id, "status": "IN_PROGRESS"}],
+                        content_type="application/json")
+        self.assertEqual(self.client.get("/api/tasks/").json()["results"][0]["status"], "IN_PROGRESS")
+
+        self.assertEqual(caching.counters()["api-task-list"]["hits"], 1)
+
+    def test_task_list_is_cached_per_scheme(self):
+        Task.objects.create(title="Second", assigned_to=self.user)
+        http = self.client.get("/api/tasks/?page_size=1").json()["next"]
+        https = self.client.get("/api/tasks/?page_size=1", secure=True).json()["next"]
+        self.assertEqual((urlsplit(http).scheme, urlsplit(https).scheme), ("http", "https"))
+        self.assertEqual(caching.counters()["api-task-list"]["hits"], 0)
+
+    def test_panel_task_table_follows_assignee_renames(self):
+        admin = User.objects.create_user("cache-admin")
+        admin.profile.role = ROLE_ADMIN
+        admin.profile.save()
+        self.user.profile.assigned_admin = admin
+        self.user.profile.save()
+        self.client.force_login(admin)
+        self.assertContains(self.client.get("/panel/tasks/"), "cache-user")
+
+        # A fresh instance: the profile (and so the admin) is not loaded with it.
+        user = User.objects.get(pk=self.user.pk)
+        user.username = "renamed-user"
+        user.save()
+
+        self.assertContains(self.client.get("/panel/tasks/"), "renamed-user")
+        self.assertEqual(caching.counters()["panel-tasks-table"]["hits"], 0)
+
+
+REPLICA_ALIAS = "test_replica"
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA_ALIAS],
+    REPLICA_STICKY_CACHE="sticky",
+    CACHES={
+        **settings.CACHES,
+        "sticky": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "replica-sticky"},
+    },
+)
+class ReplicaRoutingTests(TestCase):
+    """
+    Nothing replicates in the test setup, so rows written to the primary are missing
+    on the replica: an empty read proves it was served by the replica.
+    """
+    @classmethod
+    def setUpClass(cls):
+        # Django creates test databases only for the aliases configured at start-up (and
+        # the runner checks every alias a test class names), so the replica, an in-memory
+        # SQLite database with the schema, is added here.
+        settings.DATABASES[REPLICA_ALIAS] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        connections.configure_settings(settings.DATABASES)
+        connections[REPLICA_ALIAS].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].creation.destroy_test_db(":memory:", verbosity=0)
+        del connections[REPLICA_ALIAS]
+        del settings.DATABASES[REPLICA_ALIAS]
+
+    def setUp(self):
+        cache.clear()
+        caches["sticky"].clear()
+        self.user = User.objects.create_user("replica-user")
+        self.task = Task.objects.create(title="Primary only", assigned_to=self.user)
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.auth = f"Bearer {token}"
+        self.client.defaults["HTTP_AUTHORIZATION"] = self.auth
+
+    def titles(self):
+        return [task["title"] for task in self.client.get("/api/tasks/").json()["results"]]
+
+    def test_list_reads_from_replica(self):
+        self.assertEqual(self.titles(), [])
+
+    def test_own_write_makes_reads_sticky(self):
+        response = self.client.put(f"/api/tasks/{self.task.id}/", {"status": "IN_PROGRESS"},
+                                   content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(), ["Primary only"])
+
+    async def test_async_list_reads_from_replica_unless_sticky(self):
+        async def titles():
+            response = await self.async_client.get("/api/async/tasks/", headers={"authorization": self.auth})
+            return [task["title"] for task in response.json()["results"]]
+
+        self.assertEqual(await titles(), [])
+        await sync_to_async(mark_recent_write)(self.user.id)
+        self.assertEqual(await titles(), ["Primary only"])
+
+    @override_settings(REPLICA_STICKY_CACHE=None)
+    def test_no_replica_reads_without_a_sticky_cache(self):
+        # Nowhere to keep read-your-writes flags that every worker sees.
+        self.assertEqual(self.titles(), ["Primary only"])
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=300, DATABASE_REPLICAS=[])
+class AsyncViewTests(TestCase):
+    """The async endpoints must answer exactly like their DRF counterparts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("async-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.user = User.objects.create_user("async-user")
+        cls.user.profile.assigned_admin = cls.admin
+        cls.user.profile.save()
+        cls.tasks = [Task.objects.create(title=f"Task {i}", assigned_to=cls.user) for i in range(3)]
+        cls.done = Task.objects.create(
+            title="Done", assigned_to=cls.user, status=Task.Status.COMPLETED,
+            completion_report="Report", worked_hours=Decimal("2"),
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Tokens are issued synchronously, before the async test body runs.
+        self.user_auth = self.auth_header(self.user)
+        self.admin_auth = self.auth_header(self.admin)
+
+    @staticmethod
+    def auth_header(user):
+        return {"Authorization": f"Bearer {RoleTokenObtainPairSerializer.get_token(user).access_token}"}
+
+    async def test_task_list_matches_sync_view(self):
+        get_sync = sync_to_async(Client(headers=self.user_auth).get)
+        expected = await get_sync("/api/tasks/", {"page_size": 2})
+        response = await self.async_client.get("/api/async/tasks/", {"page_size": 2}, headers=self.user_auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], expected.json()["results"])
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+        next_url = urlsplit(response.json()["next"])
+        self.assertEqual(next_url.path, "/api/async/tasks/")
+        following = await self.async_client.get(next_url.path, parse_qs(next_url.query), headers=self.user_auth)
+        self.assertEqual(len(following.json()["results"]), 2)
+
+        not_modified = await self.async_client.get(
+            "/api/async/tasks/", {"page_size": 2}, headers={**self.user_auth, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_task_update(self):
+        url = f"/api/async/tasks/{self.tasks[0].id}/"
+
+        async def put(data, headers):
+            return await self.async_client.put(url, data, content_type="application/json", headers=headers)
+
+        response = await put({"status": "COMPLETED"}, self.user_auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("completion_report", response.json())
+
+        response = await put({"status": "COMPLETED", "completion_report": "Done", "worked_hours": "1.5"}, self.user_auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["worked_hours"], "1.50")
+        # post_save receivers ran: the stats moved with the task.
+        completed = TaskStat.objects.filter(assignee=self.user, status=Task.Status.COMPLETED)
+        self.assertEqual(await completed.values_list("count", flat=True).aget(), 2)
+
+        response = await put({"status": "PENDING"}, self.admin_auth)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_task_report_permissions(self):
+        url = f"/api/async/tasks/{self.done.id}/report/"
+
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        response = await self.async_client.get(url, headers=self.user_auth)
+        self.assertEqual((response.status_code, response.json()), (403, {"detail": "Not authorized."}))
+        response = await self.async_client.get(url, headers=self.admin_auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assigned_to"], "async-user")
+
+
+@override_settings(
+    VIEW_CACHE_TIMEOUT=0, DATABASE_REPLICAS=[], PANEL_TASKS_PAGE_SIZE=2, PANEL_COUNT_CAP=3,
+)
+class PanelTaskPaginationTests(TestCase):
+    """The panel task list caps its COUNT but keeps every page reachable."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = User.objects.create_user("pager-superadmin")
+        cls.superadmin.profile.role = ROLE_SUPERADMIN
+        cls.superadmin.profile.save()
+        user = User.objects.create_user("pager-user")
+        for n in range(7):
+            Task.objects.create(title=f"Task {n}", assigned_to=user, due_date=date(2030, 1, 1 + n))
+
+    def setUp(self):
+        self.client.force_login(self.superadmin)
+
+    def page(self, number, **params):
+        # A due date filter cannot be counted from TaskStat, so the COUNT is capped.
+        params = {"due_from": "2029-01-01", "sort": "due_date", **params}
+        return self.client.get("/panel/tasks/", {**params, "page": number})
+
+    def titles(self, response):
+        return [t.title for t in response.context["tasks"]]
+
+    def test_capped_count_keeps_later_pages(self):
+        response = self.page(1)
+        self.assertContains(response, "3+ tasks")
+        self.assertTrue(response.context["page_obj"].has_next())
+
+        # Page 2 already ends past the capped count of 3 rows.
+        response = self.page(3)
+        self.assertEqual(self.titles(response), ["Task 4", "Task 5"])
+        self.assertTrue(response.context["page_obj"].has_next())
+
+        response = self.page(4)
+        page_obj = response.context["page_obj"]
+        self.assertEqual(self.titles(response), ["Task 6"])
+        self.assertFalse(page_obj.has_next())
+        self.assertEqual((page_obj.start_index(), page_obj.end_index()), (7, 7))
+
+        # Past the last row: the last page the count knows about.
+        self.assertEqual(self.page(9).context["page_obj"].number, 2)
+
+    def test_exact_count(self):
+        response = self.page(2, due_from="2030-01-05")
+        self.assertContains(response, "3 tasks")
+        self.assertContains(response, "Page 2 of 2")
+        self.assertEqual(self.titles(response), ["Task 6"])
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_paginator(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by("id"), 2, count_cap=10_000)
+        self.assertEqual((paginator.count, paginator.count_is_capped), (7, False))
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
+
+        capped = EstimatedCountPaginator(Task.objects.order_by("id"), 2, count_cap=3)
+        self.assertEqual((capped.count, capped.count_is_capped, capped.num_pages), (3, True, 2))
+        self.assertEqual([t.title for t in capped.page(4)], ["Task 6"])
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class DueTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("due-admin")
+        cls.admin.profile.role = ROLE_ADMIN
+        cls.admin.profile.save()
+        cls.user = User.objects.create_user("due-user")
+        cls.user.profile.assigned_admin = cls.admin
+        cls.user.profile.save()
+        cls.outsider = User.objects.create_user("due-outsider")
+
+        cls.today = timezone.localdate()
+
+        def task(title, days, assignee=cls.user, **kwargs):
+            due_date = None if days is None else cls.today + timedelta(days=days)
+            return Task.objects.create(title=title, assigned_to=assignee, due_date=due_date, **kwargs)
+
+        cls.late = task("Late", -3)
+        cls.later = task("Later", -1)
+        task("Done late", -5, status=Task.Status.COMPLETED, completion_report="x", worked_hours=1)
+        cls.today_task = task("Today", 0)
+        cls.soon = task("Soon", 2)
+        task("Far", 30)
+        task("Undated", None)
+        task("Someone else's", -2, assignee=cls.outsider)
+
+    def reminders(self, kind):
+        return sorted(TaskReminder.objects.filter(kind=kind).values_list("task__title", flat=True))
+
+    def test_overdue_sweep_resumes_from_checkpoint(self):
+        self.assertEqual(due.sweep(TaskReminder.Kind.OVERDUE, today=self.today, chunk_size=1), 3)
+        self.assertEqual(self.reminders(TaskReminder.Kind.OVERDUE), ["Late", "Later", "Someone else's"])
+
+        # Nothing new: the next run reads no tasks at all.
+        self.assertEqual(due.sweep(TaskReminder.Kind.OVERDUE, today=self.today), 0)
+
+        # A day later, today's task is overdue and is the only one read.
+        self.assertEqual(due.sweep(TaskReminder.Kind.OVERDUE, today=self.today + timedelta(days=1)), 1)
+        self.assertIn("Today", self.reminders(TaskReminder.Kind.OVERDUE))
+
+        due.reset_sweep(TaskReminder.Kind.OVERDUE)
+        self.assertEqual(due.sweep(TaskReminder.Kind.OVERDUE, today=self.today + timedelta(days=1)), 4)
+        self.assertEqual(TaskReminder.objects.filter(kind=TaskReminder.Kind.OVERDUE).count(), 4)
+
+    def test_due_soon_sweep_starts_today(self):
+        self.assertEqual(due.sweep(TaskReminder.Kind.DUE_SOON, today=self.today, days=7), 2)
+        self.assertEqual(self.reminders(TaskReminder.Kind.DUE_SOON), ["Soon", "Today"])
+
+    def test_overdue_sweep_sees_tasks_behind_its_checkpoint(self):
+        overdue = TaskReminder.Kind.OVERDUE
+        due.sweep(overdue, today=self.today)
+        self.assertEqual(due.sweep(overdue, today=self.today), 0)
+
+        # Created with a past due date, re-dated into the past, reopened.
+        Task.objects.create(title="Backdated", assigned_to=self.user, due_date=self.today - timedelta(days=4))
+        far = Task.objects.get(title="Far")
+        far.due_date = self.today - timedelta(days=2)
+        far.save()
+        done = Task.objects.get(title="Done late")
+        done.status = Task.Status.PENDING
+        done.save()
+
+        # Back to the earliest of them (5 days ago): the 3 new ones and the 3 flagged.
+        self.assertEqual(due.sweep(overdue, today=self.today), 6)
+        self.assertEqual(
+            self.reminders(overdue), ["Backdated", "Done late", "Far", "Late", "Later", "Someone else's"]
+        )
+        self.assertEqual(due.sweep(overdue, today=self.today), 0)
+
+        # Saves that leave a task's due date and openness alone do not rewind it.
+        late = Task.objects.get(pk=self.late.pk)
+        late.status = Task.Status.IN_PROGRESS
+        late.save()
+        self.assertEqual(due.sweep(overdue, today=self.today), 0)
+
+    def test_batch_reopen_rewinds_overdue_sweep(self):
+        done = Task.objects.get(title="Done late")
+        due.sweep(TaskReminder.Kind.OVERDUE, today=self.today)
+
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        response = self.client.put(
+            "/api/tasks/batch/", [{"id": done.id, "status": "IN_PROGRESS"}],
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        due.sweep(TaskReminder.Kind.OVERDUE, today=self.today)
+        self.assertIn("Done late", self.reminders(TaskReminder.Kind.OVERDUE))
+
+    def test_due_soon_sweep_rereads_its_window(self):
+        due_soon = TaskReminder.Kind.DUE_SOON
+        due.sweep(due_soon, today=self.today, days=7)
+
+        # Due before the last task the previous run flagged.
+        Task.objects.create(title="Tomorrow", assigned_to=self.user, due_date=self.today + timedelta(days=1))
+        self.assertEqual(due.sweep(due_soon, today=self.today, days=7), 3)
+        self.assertEqual(self.reminders(due_soon), ["Soon", "Today", "Tomorrow"])
+
+    def test_due_api_is_scoped_and_paginated(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.admin).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        response = self.client.get("/api/tasks/due/", {"days": 7, "page_size": 3})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([(t["title"], t["overdue"]) for t in body["results"]],
+                         [("Late", True), ("Later", True), ("Today", False)])
+
+        following = self.client.get(body["next"]).json()
+        self.assertEqual([t["title"] for t in following["results"]], ["Soon"])
+        self.assertIsNone(following["next"])
+
+        self.assertEqual(self.client.get("/api/tasks/due/", {"days": -1}).status_code, 400)
+        self.assertEqual(self.client.get("/api/tasks/due/", {"cursor": "junk"}).status_code, 404)
+
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        self.assertEqual(self.client.get("/api/tasks/due/").status_code, 403)
+
+    def test_due_panel_page(self):
+        self.client.force_login(self.admin)
+        response = self.client.get("/panel/tasks/due/", {"days": 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t.title for t in response.context["tasks"]], ["Late", "Later", "Today"])
+
+
+class QueryPlanTests(TestCase):
+    """Every registered hot queryset must be served by an index (tasks.query_plans)."""
+
+    def test_hot_queries_use_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN is SQLite's")
+        for name in query_plans.HOT_QUERIES:
+            with self.subTest(name):
+                plan, problems = query_plans.check(name)
+                self.assertEqual(problems, [], f"plan: {plan}")
+
+    def test_scans_are_reported(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN is SQLite's")
+        plan = query_plans.explain(Task.objects.filter(title="x").order_by("description"))
+        self.assertEqual(len(query_plans.find_problems(plan)), 2)
+
+
+class BenchmarkSmokeTests(TransactionTestCase):
+    """`manage.py benchmark` runs end to end on a tiny dataset."""
+
+    def test_tiny_run(self):
+        caching.reset_counters()
+        out = StringIO()
+        # The command sets up its own test environment, as it does outside the runner.
+        teardown_test_environment()
+        try:
+            with override_settings(VIEW_CACHE_TIMEOUT=300):
+                call_command("benchmark", sizes=[50], iterations=2, token_iterations=1, stdout=out, stderr=StringIO())
+        finally:
+            setup_test_environment()
+
+        results = json.loads(out.getvalue())["results"]
+        self.assertEqual({r["scenario"] for r in results}, set(Benchmark.scenarios))
+        self.assertTrue(all(r["size"] == 50 and r["iterations"] >= 1 for r in results))
+        # The benchmark measures the views, not the view cache.
+        self.assertEqual(caching.counters(), {})
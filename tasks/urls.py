@@ -1,8 +1,31 @@
 from django.urls import path
-from .views import TaskListView, TaskUpdateView, TaskReportView
+from .async_views import AsyncTaskListView, AsyncTaskReportView, AsyncTaskUpdateView
+from .views import (
+    CacheStatsView,
+    TaskBatchUpdateView,
+    TaskDueView,
+    TaskListView,
+    TaskReportExportView,
+    TaskReportListView,
+    TaskReportView,
+    TaskSearchView,
+    TaskStatsView,
+    TaskUpdateView,
+)
 
 urlpatterns = [
     path("tasks/", TaskListView.as_view(), name="tasks_list"),
+    path("tasks/reports/", TaskReportListView.as_view(), name="tasks_reports"),
+    path("tasks/reports/export/", TaskReportExportView.as_view(), name="tasks_reports_export"),
+    path("tasks/search/", TaskSearchView.as_view(), name="tasks_search"),
+    path("tasks/cache/", CacheStatsView.as_view(), name="tasks_cache_stats"),
+    path("tasks/stats/", TaskStatsView.as_view(), name="tasks_stats"),
+    path("tasks/due/", TaskDueView.as_view(), name="tasks_due"),
+    path("tasks/batch/", TaskBatchUpdateView.as_view(), name="tasks_batch_update"),
     path("tasks/<int:id>/", TaskUpdateView.as_view(), name="tasks_update"),
     path("tasks/<int:id>/report/", TaskReportView.as_view(), name="tasks_report"),
+    # Native async versions of the task endpoints, for ASGI deployments.
+    path("async/tasks/", AsyncTaskListView.as_view(), name="async_tasks_list"),
+    path("async/tasks/<int:id>/", AsyncTaskUpdateView.as_view(), name="async_tasks_update"),
+    path("async/tasks/<int:id>/report/", AsyncTaskReportView.as_view(), name="async_tasks_report"),
 ]
@@ -1,5 +1,7 @@
 from accounts.permissions import is_superadmin, is_admin
 
+from .models import Task
+
 
 def can_view_task_report(actor, task) -> bool:
     """
@@ -10,7 +12,21 @@ def can_view_task_report(actor, task) -> bool:
         return True
 
     if is_admin(actor):
-        assignee_profile = getattr(task.assigned_to, "profile", None)
-        return bool(assignee_profile and assignee_profile.assigned_admin_id == actor.id)
+        return task.owner_admin_id == actor.id
 
     return False
+
+
+def tasks_visible_to(actor):
+    """
+    Queryset-level equivalent of can_view_task_report(): resolves the actor's role once
+    and scopes in SQL, so listing N tasks needs no per-row permission lookups.
+    Returns None for actors who cannot view reports at all.
+    """
+    if is_superadmin(actor):
+        return Task.objects.all()
+
+    if is_admin(actor):
+        return Task.objects.filter(owner_admin_id=actor.id)
+
+    return None
@@ -1,24 +1,98 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
 from accounts.permissions import is_admin_or_superadmin
+from config.routers import reads_from_replica
+from . import caching, due, stats
+from .conditional import instance_validators, not_modified_response, queryset_etag, set_validators
+from .exports import EXPORT_FORMATS, iter_export
+from .filters import TaskReportFilter
 from .models import Task
-from .serializers import TaskListSerializer, TaskUpdateSerializer, TaskReportSerializer
-from .utils import can_view_task_report
+from .pagination import KeysetPagination
+from .permissions import IsSuperAdmin
+from .search import search_tasks
+from .serializers import (
+    TaskUpdateSerializer,
+    TaskReportSerializer,
+    task_due_values,
+    task_list_values,
+    task_report_values,
+)
+from .sync import changes_since
+from .utils import can_view_task_report, tasks_visible_to
 
 
 class TaskListView(APIView):
     """
     GET /api/tasks/ -> Fetch tasks assigned to logged-in user only.
+    Paginated by ?cursor=<opaque>&page_size=<n>, newest first.
+    Supports If-None-Match (304 when nothing changed).
+
+    GET /api/tasks/?since=<token> -> Delta sync: tasks changed and ids deleted after
+    <token> (empty for a first sync), plus the token to send next time.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
+    @method_decorator(reads_from_replica)
     def get(self, request):
-        tasks = Task.objects.filter(assigned_to=request.user).order_by("-updated_at")
-        return Response(TaskListSerializer(tasks, many=True).data, status=status.HTTP_200_OK)
+        tasks = Task.objects.filter(assigned_to_id=request.user.id)
+
+        if "since" in request.query_params:
+            etag = queryset_etag(tasks, request.user.id, request.GET.urlencode())
+            not_modified = not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            limit = self.pagination_class().get_page_size(request)
+            return set_validators(self.get_delta(request, limit), etag)
+
+        # Validators and page body are cached together until the user's tasks change.
+        page = caching.get_or_set(
+            "api-task-list",
+            [caching.user_scope(request.user.id)],
+            [request.scheme, request.get_host(), request.GET.urlencode()],
+            lambda: self.get_page(request, tasks),
+        )
+        etag = page["etag"]
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(Response(page["data"], status=status.HTTP_200_OK), etag)
+
+    def get_page(self, request, tasks):
+        etag = queryset_etag(tasks, request.user.id, request.GET.urlencode())
+        paginator = self.pagination_class()
+        rows = paginator.paginate_queryset(task_list_values.values(tasks), request, view=self)
+        data = paginator.get_paginated_response(task_list_values.to_representation(rows)).data
+        return {"etag": etag, "data": data}
+
+    def get_delta(self, request, limit):
+        try:
+            delta = changes_since(request.user.id, request.query_params["since"], limit, task_list_values)
+        except ValueError:
+            raise ValidationError({"since": "Invalid sync token."})
+
+        return Response(
+            {
+                "results": delta["changed"],
+                "deleted": delta["deleted"],
+                "next_token": delta["next_token"],
+                "has_more": delta["has_more"],
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 class TaskUpdateView(APIView):
@@ -29,7 +103,8 @@ class TaskUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def put(self, request, id):
-        task = get_object_or_404(Task, id=id, assigned_to=request.user)
+        tasks = Task.objects.select_related("assigned_to")
+        task = get_object_or_404(tasks, id=id, assigned_to_id=request.user.id)
 
         serializer = TaskUpdateSerializer(task, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -38,17 +113,86 @@ class TaskUpdateView(APIView):
         return Response(TaskReportSerializer(task).data, status=status.HTTP_200_OK)
 
 
+class TaskBatchUpdateView(APIView):
+    """
+    PUT /api/tasks/batch/ -> Update many own tasks in one request.
+    Body: [{"id": 1, "status": ..., "completion_report": ..., "worked_hours": ...}, ...]
+    Each item is validated like PUT /api/tasks/<id>/; valid items are written together
+    in one transaction and every item gets its own result.
+    """
+    permission_classes = [IsAuthenticated]
+    update_fields = ["status", "completion_report", "worked_hours", "updated_at"]
+
+    def put(self, request):
+        items = request.data
+        max_items = getattr(settings, "TASKS_BATCH_MAX_ITEMS", 200)
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Expected a non-empty list of task updates."})
+        if len(items) > max_items:
+            raise ValidationError({"detail": f"At most {max_items} tasks per batch."})
+
+        ids = []
+        for item in items:
+            # bool is an int subclass: {"id": true} must not address task 1.
+            if not isinstance(item, dict) or type(item.get("id")) is not int:
+                raise ValidationError({"detail": "Every item needs an integer 'id'."})
+            ids.append(item["id"])
+
+        now = timezone.now()
+        results = []
+        changed = {}
+        with transaction.atomic():
+            # Locked until the write commits: the stats deltas are taken from these values.
+            tasks = (
+                Task.objects.select_related("assigned_to")
+                .select_for_update(of=("self",))
+                .filter(assigned_to_id=request.user.id)
+                .in_bulk(ids)
+            )
+            for item in items:
+                task = tasks.get(item["id"])
+                if task is None:
+                    results.append({"id": item["id"], "ok": False, "errors": {"detail": "Not found."}})
+                    continue
+
+                serializer = TaskUpdateSerializer(task, data=item, partial=True)
+                if not serializer.is_valid():
+                    results.append({"id": task.id, "ok": False, "errors": serializer.errors})
+                    continue
+
+                for attr, value in serializer.validated_data.items():
+                    setattr(task, attr, value)
+                task.updated_at = now
+                changed[task.id] = task
+                results.append({"id": task.id, "ok": True})
+
+            if changed:
+                Task.objects.bulk_update(changed.values(), self.update_fields)
+                # bulk_update() sends no post_save.
+                caching.tasks_changed(changed.values())
+                due.rewind_overdue_sweep(changed.values())
+                stats.tasks_updated(changed.values())
+
+        for result in results:
+            if result["ok"]:
+                result["task"] = TaskReportSerializer(changed[result["id"]]).data
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 class TaskReportView(APIView):
     """
     GET /api/tasks/<id>/report/ -> Admin/SuperAdmin can view report (completed only).
+    Validated by the task's updated_at (ETag / Last-Modified).
     """
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(reads_from_replica)
     def get(self, request, id):
         if not is_admin_or_superadmin(request.user):
             return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
 
-        task = get_object_or_404(Task, id=id)
+        task = get_object_or_404(Task.objects.select_related("assigned_to"), id=id)
 
         if task.status != Task.Status.COMPLETED:
             return Response(
@@ -59,4 +203,170 @@ class TaskReportView(APIView):
         if not can_view_task_report(request.user, task):
             return Response({"detail": "Not authorized for this task."}, status=status.HTTP_403_FORBIDDEN)
 
-        return Response(TaskReportSerializer(task).data, status=status.HTTP_200_OK)
+        etag, last_modified = instance_validators(task)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = Response(TaskReportSerializer(task).data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
+
+
+class TaskReportListView(APIView):
+    """
+    GET /api/tasks/reports/ -> Admin/SuperAdmin: completed tasks they may view, newest first.
+    Filters: ?user=<id>&status=<STATUS>&updated_from=YYYY-MM-DD&updated_to=YYYY-MM-DD
+    (status defaults to COMPLETED). Cursor-paginated like GET /api/tasks/.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get(self, request):
+        tasks = tasks_visible_to(request.user)
+        if tasks is None:
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+
+        filterset = self.get_filterset(request, tasks)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(task_report_values.values(filterset.qs), request, view=self)
+        return paginator.get_paginated_response(task_report_values.to_representation(page))
+
+    @staticmethod
+    def get_filterset(request, queryset):
+        params = request.query_params.copy()
+        params.setdefault("status", Task.Status.COMPLETED)
+
+        filterset = TaskReportFilter(params, queryset=queryset)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset
+
+
+class TaskSearchView(APIView):
+    """
+    GET /api/tasks/search/?q=<words>&page_size=<n> -> Admin/SuperAdmin: tasks they may
+    view whose title, description or completion report contain every word (prefix
+    match), best match first. Returns the top `page_size` results only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        tasks = tasks_visible_to(request.user)
+        if tasks is None:
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+        limit = KeysetPagination().get_page_size(request)
+
+        rows = task_report_values.values(search_tasks(tasks, query))[:limit]
+        return Response({"results": task_report_values.to_representation(rows)}, status=status.HTTP_200_OK)
+
+
+class TaskReportExportView(APIView):
+    """
+    GET /api/tasks/reports/export/ -> Stream every report visible to the caller.
+    ?output=csv|ndjson (default csv), ?compress=gzip, plus the report list filters.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        tasks = tasks_visible_to(request.user)
+        if tasks is None:
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+
+        fmt = request.query_params.get("output", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Choose one of: {', '.join(EXPORT_FORMATS)}."})
+        gzip = request.query_params.get("compress") == "gzip"
+
+        filterset = TaskReportListView.get_filterset(request, tasks)
+        chunk_size = getattr(settings, "TASKS_EXPORT_CHUNK_SIZE", 2000)
+
+        filename = f"task-reports.{fmt}" + (".gz" if gzip else "")
+        response = StreamingHttpResponse(
+            iter_export(filterset.qs, fmt=fmt, gzip=gzip, chunk_size=chunk_size),
+            content_type="application/gzip" if gzip else EXPORT_FORMATS[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TaskDueView(APIView):
+    """
+    GET /api/tasks/due/?days=<n> -> Admin/SuperAdmin: open tasks they may view that are
+    overdue or due within <n> days (default TASKS_DUE_SOON_DAYS), soonest first.
+    Paginated by ?cursor=<opaque>&page_size=<n>. Reads the partial index on open tasks
+    (tasks.due), never the completed ones.
+    """
+    permission_classes = [IsAuthenticated]
+    max_days = 366
+
+    @method_decorator(reads_from_replica)
+    def get(self, request):
+        tasks = tasks_visible_to(request.user)
+        if tasks is None:
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            days = int(request.query_params.get("days", due.due_soon_days()))
+        except ValueError:
+            raise ValidationError({"days": "A whole number of days is required."})
+        if not 0 <= days <= self.max_days:
+            raise ValidationError({"days": f"Must be between 0 and {self.max_days}."})
+        try:
+            position = due.decode_position(request.query_params.get("cursor"))
+        except ValueError:
+            raise NotFound(KeysetPagination.invalid_cursor_message)
+
+        today = timezone.localdate()
+        page_size = KeysetPagination().get_page_size(request)
+        rows = list(
+            task_due_values.values(due.due_tasks(tasks, today + timedelta(days=days), position))[: page_size + 1]
+        )
+        next_link = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            cursor = due.encode_position(rows[-1]["due_date"], rows[-1]["id"])
+            next_link = replace_query_param(request.build_absolute_uri(), "cursor", cursor)
+
+        results = task_due_values.to_representation(rows)
+        for result, row in zip(results, rows):
+            result["overdue"] = row["due_date"] < today
+        return Response({"today": today, "next": next_link, "results": results}, status=status.HTTP_200_OK)
+
+
+class TaskStatsView(APIView):
+    """
+    GET /api/tasks/stats/ -> Admin/SuperAdmin: task counts per status, overdue counts and
+    worked hours, per admin plus totals (see tasks.stats.dashboard_stats).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        summary = stats.dashboard_stats(request.user)
+        if summary is None:
+            return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(summary, status=status.HTTP_200_OK)
+
+
+class CacheStatsView(APIView):
+    """
+    GET /api/tasks/cache/ -> SuperAdmin: view cache settings and this process's hit/miss
+    counters per cached entry family (see tasks.caching).
+    """
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        cache = caching.get_cache()
+        return Response(
+            {
+                "enabled": caching.enabled(),
+                "timeout": caching.cache_timeout(),
+                "backend": f"{type(cache).__module__}.{type(cache).__qualname__}",
+                "counters": caching.counters(),
+            },
+            status=status.HTTP_200_OK,
+        )